@@ -36,8 +36,8 @@ class PybulletRobot(RobotBase):
                         f"→ PyBullet: ({pos_m[0]:.3f}, {pos_m[1]:.3f}, {pos_m[2]:.3f})m @ speed={speed} "
                         f"({'SYNC' if wait_arrival else 'ASYNC'})")
             
-            # WebSocket으로 명령 전송
-            pybullet_client.set_pos(pos_m)
+            # WebSocket으로 명령 전송 (12바이트 바이너리 프레임)
+            pybullet_client.set_pos_bin(pos_m[0], pos_m[1], pos_m[2])
             
             # 상태 업데이트
             self.current_state["position"] = {"x": x, "y": y, "z": z}
@@ -78,6 +78,19 @@ class PybulletRobot(RobotBase):
             logging.error(traceback.format_exc())
             return False
 
+    def move_robot_batch(self, points) -> bool:
+        """
+        웨이포인트 시퀀스를 순차 실행합니다. (각 점마다 도착 대기 후 dwell_ms 정지)
+        dwell 중에도 긴급 정지(stop_event)에 즉시 반응합니다.
+        """
+        for x, y, z, speed, dwell_ms in points:
+            if not self.move_to_xyz(x, y, z, speed=speed, wait_arrival=True):
+                return False
+            if dwell_ms > 0 and self.stop_event.wait(dwell_ms / 1000.0):
+                logging.warning("[PybulletRobot] 웨이포인트 대기 중 강제 중단됨!")
+                return False
+        return True
+
     def move_gripper(self, open_percent: float) -> bool:
         """
         그리퍼의 개폐 정도를 제어합니다 (0: 닫힘, 100: 열림).
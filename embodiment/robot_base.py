@@ -1,5 +1,6 @@
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
 
 class RobotBase(ABC):
     """
@@ -43,6 +44,23 @@ class RobotBase(ABC):
         """
         pass
 
+    def move_robot_batch(self, points: Sequence[Tuple[float, float, float, int, int]]) -> bool:
+        """
+        여러 웨이포인트를 한 번의 호출로 순차 실행합니다.
+        기본 구현은 move_to_xyz + 대기를 반복하며, 시퀀스 전송을 지원하는 구현체는 재정의합니다.
+        
+        Args:
+            points: (x, y, z, speed, dwell_ms) 튜플 리스트 - 도착 후 dwell_ms 만큼 머무름
+        Returns:
+            bool: 모든 웨이포인트 이동 성공 여부 (실패 시 이후 웨이포인트는 실행하지 않음)
+        """
+        for x, y, z, speed, dwell_ms in points:
+            if not self.move_to_xyz(x, y, z, speed):
+                return False
+            if dwell_ms > 0:
+                time.sleep(dwell_ms / 1000.0)
+        return True
+
     @abstractmethod
     def set_joints(self, angles: List[float], speed: int = 50) -> bool:
         """
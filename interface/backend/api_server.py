@@ -29,6 +29,10 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
+    # 0. 필수 디렉토리 확인 및 생성 (uvicorn으로 직접 실행되는 경우 대비)
+    from shared.config import initialize
+    initialize()
+    
     # 1. 하위 계층 드라이버 및 루프 시작
     perception_manager.start()
     emotion_controller.start()
@@ -66,12 +70,22 @@ def read_root():
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    from state.system_state import system_state
+    last_frame_seq = -1
     try:
         while True:
+            # 프레임은 갱신되었을 때만 바이너리 메시지로 전송 ([채널 1바이트] + JPEG)
+            # 프레임을 스냅샷보다 먼저 보내므로, 클라이언트는 프레임 뒤에 오는 JSON의 탐지 결과를 같은 프레임에 그릴 수 있습니다.
+            frame_seq = system_state.frame_seq
+            if frame_seq != last_frame_seq:
+                last_frame_seq = frame_seq
+                for message in pipeline.get_frame_messages():
+                    await websocket.send_bytes(message)
+            
             # 파이프라인을 통해 정합성이 보장된 7단계 레이어의 상태 획득 (단방향 흐름 반영)
-            packet = pipeline.get_system_snapshot()
+            packet = pipeline.get_system_snapshot_json()
             
-            await websocket.send_text(json.dumps(packet))
+            await websocket.send_text(packet)
             await asyncio.sleep(0.016) # ~60fps
             
     except (WebSocketDisconnect, ConnectionResetError):
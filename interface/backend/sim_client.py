@@ -5,10 +5,14 @@ except ImportError:
     
 import threading
 import time
+import struct
 import requests
 import logging
 from shared.config import GlobalConfig
 
+# 'set_pos_bin' 이벤트 페이로드: 목표 좌표 (x, y, z) m, little-endian float32 3개 (12바이트)
+SET_POS_FRAME = struct.Struct('<fff')
+
 class PyBulletClient:
     _instance = None
     
@@ -33,6 +37,8 @@ class PyBulletClient:
         if self.sio:
             self.sio.on('connect', self.on_connect)
             self.sio.on('disconnect', self.on_disconnect)
+            self.sio.on('state', self.on_state)
+            # 통합 이벤트 이전 서버 호환 (robot_state / object_state 개별 이벤트)
             self.sio.on('robot_state', self.on_robot_state)
             self.sio.on('object_state', self.on_object_state)
         
@@ -77,6 +83,14 @@ class PyBulletClient:
         logging.info("[PyBullet] 연결이 끊어졌습니다.")
         self.connected = False
 
+    def on_state(self, data):
+        # 통합 이벤트를 기존 슬롯 형식(robot: ee/joints/gripper, object: {"object": ...})으로 나눠 저장
+        robot = {"ee": data.get('ee', {}), "joints": data.get('joints'), "gripper": data.get('gripper')}
+        obj = {"object": data.get('object', {})}
+        with self.lock:
+            self.latest_state['robot'] = robot
+            self.latest_state['object'] = obj
+
     def on_robot_state(self, data):
         with self.lock:
             self.latest_state['robot'] = data
@@ -101,6 +115,11 @@ class PyBulletClient:
         if not self.connected: return
         self.sio.emit('set_pos', {'pos': pos})
 
+    def set_pos_bin(self, x: float, y: float, z: float):
+        """ set_pos의 바이너리 버전 - 고빈도 제어 루프용 (dict/JSON 직렬화 생략) """
+        if not self.connected: return
+        self.sio.emit('set_pos_bin', SET_POS_FRAME.pack(x, y, z))
+
     def set_gripper(self, value: float):
         """ value: 0.0 ~ 0.06 (미터 단위 개폐량) """
         if not self.connected: return
@@ -130,7 +149,7 @@ class PyBulletClient:
     def get_synced_packet(self):
         """
         [Layer 1] 서버로부터 동기화된 영상, 뎁스, 포즈 데이터를 가져옵니다.
-        PyBullet 서버의 실제 엔드포인트 사용: /image (JPEG), /depth (JSON), robot_state (WebSocket)
+        PyBullet 서버의 실제 엔드포인트 사용: /image (JPEG), /depth (바이너리), robot_state (WebSocket)
         """
         if not self.connected:
             logging.debug("[PyBulletClient] 서버에 연결되지 않음, WebSocket 연결 시도...")
@@ -156,16 +175,13 @@ class PyBulletClient:
                 logging.error("[PyBulletClient] 이미지 디코딩 실패")
                 return None
             
-            # 2. HTTP로 깊이 데이터 가져오기 (/depth) - JSON 형식
-            # 주의: JSON 형식이라 용량이 큼 (600x480 배열) - 타임아웃 여유있게 설정
+            # 2. HTTP로 깊이 데이터 가져오기 (/depth) - float32 원시 바이너리
             depth_resp = requests.get(f"{self.server_url}/depth", timeout=5.0)
             if depth_resp.status_code != 200:
                 logging.error(f"[PyBulletClient] /depth 요청 실패: {depth_resp.status_code}")
                 return None
             
-            # JSON을 numpy 배열로 변환
-            depth_list = depth_resp.json()
-            depth_frame = np.array(depth_list, dtype=np.float32)
+            depth_frame = self._parse_depth(depth_resp)
             
             # 3. WebSocket으로 수신한 최신 robot_state 가져오기
             with self.lock:
@@ -187,6 +203,18 @@ class PyBulletClient:
             logging.error(traceback.format_exc())
             return None
 
+    @staticmethod
+    def _parse_depth(resp):
+        """/depth, /ee-depth 응답 → float32 배열 (바이너리 응답, 구버전 서버의 JSON 응답 모두 지원)"""
+        import numpy as np
+        
+        if resp.headers.get("Content-Type", "").startswith("application/json"):
+            return np.array(resp.json(), dtype=np.float32)
+        
+        h, w = (int(v) for v in resp.headers["X-Shape"].split(","))
+        dtype = "<f2" if resp.headers.get("X-Dtype") == "float16" else "<f4"
+        return np.frombuffer(resp.content, dtype=dtype).reshape(h, w).astype(np.float32) # 쓰기 가능한 배열로 (frombuffer는 읽기 전용)
+
     def get_ee_synced_packet(self, include_depth=True):
         """
         [Layer 1] 그리퍼 카메라(엔드 이펙터) 시점의 동기화된 패킷을 가져옵니다.
@@ -211,8 +239,7 @@ class PyBulletClient:
             if include_depth:
                 depth_resp = requests.get(f"{self.server_url}/ee-depth", timeout=5.0)
                 if depth_resp.status_code == 200:
-                    depth_list = depth_resp.json()
-                    depth_frame = np.array(depth_list, dtype=np.float32)
+                    depth_frame = self._parse_depth(depth_resp)
             
             with self.lock:
                 robot_state = self.latest_state.get('robot', {})
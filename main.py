@@ -3,7 +3,7 @@ import os
 import sys
 import logging
 
-from shared.config import PathConfig
+from shared.config import PathConfig, initialize
 
 # 로깅 설정 (프로그램 시작 시 가장 먼저)
 logging.basicConfig(
@@ -18,7 +18,7 @@ sys.path.append(str(BASE_DIR))
 from interface.backend.api_server import app
 
 # 초기 실행 시 필수 디렉토리 확인 및 생성
-PathConfig.ensure_dirs()
+initialize()
 
 def main():
     print("==========================================")
@@ -153,6 +153,7 @@ class CameraCalibrator:
             
             logging.info("[Calibration] 변환 행렬 계산 성공")
             logging.info(f"\n{self.transform_matrix}")
+            self._notify_projection()
             return True
             
         except Exception as e:
@@ -176,6 +177,7 @@ class CameraCalibrator:
             with open(self.calibration_file, 'w') as f:
                 json.dump(data, f, indent=4)
             logging.info(f"[Calibration] 저장 완료: {self.calibration_file}")
+            self._notify_projection(file_changed=True)
         except Exception as e:
             logging.error(f"[Calibration] 저장 실패: {e}")
 
@@ -193,6 +195,7 @@ class CameraCalibrator:
             if matrix.shape == (4, 4):
                 self.transform_matrix = matrix
                 logging.info(f"[Calibration] 로드 완료: {self.calibration_file}")
+                self._notify_projection()
                 # 포인트 데이터는 선택적으로 로드
                 if "points" in data:
                     self.points = [CalibrationPoint(**p) for p in data["points"]]
@@ -202,6 +205,14 @@ class CameraCalibrator:
         except Exception as e:
             logging.error(f"[Calibration] 로드 실패: {e}")
 
+    def _notify_projection(self, file_changed: bool = False):
+        """변환 행렬이 바뀌었음을 RealSense 투영 모듈에 알려 캐시된 행렬을 비웁니다."""
+        try:
+            from sensor.projection import realsense_projection
+        except ImportError:
+            return
+        realsense_projection.invalidate_tform_cache(self, file_changed)
+
     def camera_to_robot(self, x: float, y: float, z: float) -> Tuple[float, float, float]:
         """
         카메라 좌표(cm)를 로봇 좌표(cm)로 변환합니다.
@@ -1,7 +1,6 @@
 import threading
 import time
 import logging
-import base64
 import cv2
 from .vision_bridge import VisionBridge
 from state.system_state import system_state
@@ -26,6 +25,7 @@ class PerceptionManager:
         self.interval = interval
         self.running = False
         self.thread = None
+        self._frame_id = 0 # 탐지 결과 갱신마다 증가 (소비자가 같은 결과의 재처리를 건너뛸 수 있도록)
 
     def start(self):
         """
@@ -59,7 +59,9 @@ class PerceptionManager:
                 detections, main_frame, main_depth = self.bridge.get_refined_detections()
                 
                 # 2. 전역 상태(Layer 2: State) 업데이트
+                self._frame_id += 1
                 new_perception = {
+                    "frame_id": self._frame_id,
                     "detected_objects": detections,
                     "detection_count": len(detections),
                     "timestamp": time.time(),
@@ -67,12 +69,15 @@ class PerceptionManager:
                 }
                 system_state.perception_data = new_perception
                 
-                # [Optimization] 탐지에 사용된 동일 프레임을 Base64로 인코딩하여 UI 전달
+                # [Optimization] 탐지에 사용된 동일 프레임을 JPEG로 인코딩하여 UI 전달
+                # (Base64 없이 바이트 그대로 보관 - WebSocket 바이너리 채널로 전송)
+                frame_updated = False
                 if main_frame is not None:
                      # 전송량 최적화를 위해 JPEG 품질을 75%로 조정
                      ret, buffer = cv2.imencode('.jpg', main_frame, [cv2.IMWRITE_JPEG_QUALITY, 75])
                      if ret:
-                         system_state.last_frame_base64 = base64.b64encode(buffer).decode('utf-8')
+                         system_state.last_frame_bytes = buffer.tobytes()
+                         frame_updated = True
 
                 # [New] Main Depth Frame Encoding
                 if main_depth is not None:
@@ -83,7 +88,8 @@ class PerceptionManager:
                     
                     ret, buffer_d = cv2.imencode('.jpg', depth_vis, [cv2.IMWRITE_JPEG_QUALITY, 50]) # 품질 낮춤
                     if ret:
-                        system_state.last_depth_base64 = base64.b64encode(buffer_d).decode('utf-8')
+                        system_state.last_depth_bytes = buffer_d.tobytes()
+                        frame_updated = True
                     
                 # 2-2. [Secondary Stream] 그리퍼 카메라 프레임 획득 (디버깅용)
                 # 메인 뷰와 별개로 그리퍼의 시점을 상시 확보합니다.
@@ -92,7 +98,8 @@ class PerceptionManager:
                 if gripper_frame is not None:
                      ret, buffer_ee = cv2.imencode('.jpg', gripper_frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
                      if ret:
-                         system_state.last_ee_frame_base64 = base64.b64encode(buffer_ee).decode('utf-8')
+                         system_state.last_ee_frame_bytes = buffer_ee.tobytes()
+                         frame_updated = True
                 
                 if gripper_depth is not None:
                     depth_ee_vis = cv2.normalize(gripper_depth, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
@@ -100,7 +107,11 @@ class PerceptionManager:
                     
                     ret, buffer_ee_d = cv2.imencode('.jpg', depth_ee_vis, [cv2.IMWRITE_JPEG_QUALITY, 50])
                     if ret:
-                        system_state.last_ee_depth_base64 = base64.b64encode(buffer_ee_d).decode('utf-8')
+                        system_state.last_ee_depth_bytes = buffer_ee_d.tobytes()
+                        frame_updated = True
+                
+                if frame_updated:
+                    system_state.frame_seq += 1
                 
                 # [Control Tower] 로봇 상태 동기화 및 안전 감시
                 # 시뮬레이션 클라이언트로부터 최신 로봇 상태를 가져와 SystemState에 반영합니다.
@@ -0,0 +1,54 @@
+"""
+그리퍼 카메라(View Space) → 월드 좌표 변환 커널
+
+project_gripper_camera_to_world의 수치 계산 부분(쿼터니언 회전 + 평행이동)입니다.
+numba가 있으면 네이티브 코드로 컴파일하고, 없으면 같은 함수를 순수 Python으로 실행합니다.
+"""
+
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 미설치 시 데코레이터를 무시합니다."""
+        def _decorator(func):
+            return func
+        return _decorator
+
+
+@njit(cache=True, fastmath=True)
+def _project(px, py, pz, qx, qy, qz, qw, tx, ty, tz):
+    """
+    Args:
+        px, py, pz: 그리퍼 카메라 View Space 좌표 (cm)
+        qx, qy, qz, qw: EE 회전 쿼터니언
+        tx, ty, tz: EE 위치 (m)
+
+    Returns:
+        (wx, wy, wz): 월드 좌표 (cm)
+    """
+    # 카메라(View) -> 손끝(EE) 로컬 축 정렬: [-Y_view, -X_view, -Z_view]
+    lx = -py
+    ly = -px
+    lz = -pz
+
+    # 쿼터니언 -> 회전 행렬 (p.getMatrixFromQuaternion과 동일, 정규화 포함)
+    q_norm_sq = qx * qx + qy * qy + qz * qz + qw * qw
+    s = 2.0 / q_norm_sq if q_norm_sq > 0.0 else 0.0 # 영 쿼터니언이면 회전 없음(Identity)
+    r00 = 1.0 - s * (qy * qy + qz * qz); r01 = s * (qx * qy - qz * qw);       r02 = s * (qx * qz + qy * qw)
+    r10 = s * (qx * qy + qz * qw);       r11 = 1.0 - s * (qx * qx + qz * qz); r12 = s * (qy * qz - qx * qw)
+    r20 = s * (qx * qz - qy * qw);       r21 = s * (qy * qz + qx * qw);       r22 = 1.0 - s * (qx * qx + qy * qy)
+
+    # 회전 + 평행이동 (m -> cm)
+    wx = r00 * lx + r01 * ly + r02 * lz + tx * 100.0
+    wy = r10 * lx + r11 * ly + r12 * lz + ty * 100.0
+    wz = r20 * lx + r21 * ly + r22 * lz + tz * 100.0
+
+    return wx, wy, wz
+
+
+# 컴파일 워밍업 (첫 프레임에서 JIT 지연이 발생하지 않도록 import 시점에 수행)
+_project(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0)
@@ -0,0 +1,91 @@
+"""
+RANSAC 평면 추정 Numba 커널
+
+fit_plane_ransac의 반복 루프를 네이티브 코드로 컴파일합니다.
+numba가 설치되지 않은 환경에서는 NUMBA_AVAILABLE=False가 되며,
+호출 측(realsense_projection)은 기존 NumPy 구현을 사용합니다.
+"""
+
+import logging
+
+NUMBA_AVAILABLE = False
+try:
+    import numpy as np
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logging.debug("[RansacNumba] numba 모듈이 없어 NumPy RANSAC을 사용합니다.")
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _ransac(points, threshold, iters, seed):
+        """
+        points: (N, 3) float 배열
+        Returns: (a, b, c, d, inliers_count) - 실패 시 inliers_count = -1
+        """
+        n_points = points.shape[0]
+
+        # 샘플 인덱스는 단일 스레드에서 미리 뽑아 둡니다. (스레드별 RNG 상태 공유 문제 회피)
+        np.random.seed(seed)
+        samples = np.empty((iters, 3), dtype=np.int64)
+        for it in range(iters):
+            i = np.random.randint(n_points)
+            j = np.random.randint(n_points)
+            while j == i:
+                j = np.random.randint(n_points)
+            k = np.random.randint(n_points)
+            while k == i or k == j:
+                k = np.random.randint(n_points)
+            samples[it, 0] = i
+            samples[it, 1] = j
+            samples[it, 2] = k
+
+        # 반복별 결과 (병렬 구간에서 각자 기록 후 리덕션)
+        models = np.zeros((iters, 4), dtype=np.float64)
+        counts = np.full(iters, -1, dtype=np.int64)
+
+        for it in prange(iters):
+            i = samples[it, 0]
+            j = samples[it, 1]
+            k = samples[it, 2]
+
+            x1 = points[i, 0]; y1 = points[i, 1]; z1 = points[i, 2]
+            v1x = points[j, 0] - x1; v1y = points[j, 1] - y1; v1z = points[j, 2] - z1
+            v2x = points[k, 0] - x1; v2y = points[k, 1] - y1; v2z = points[k, 2] - z1
+
+            # 외적 (Cross Product) - 스칼라 전개
+            nx = v1y * v2z - v1z * v2y
+            ny = v1z * v2x - v1x * v2z
+            nz = v1x * v2y - v1y * v2x
+            norm = np.sqrt(nx * nx + ny * ny + nz * nz)
+            if norm == 0.0:
+                continue
+
+            a = nx / norm
+            b = ny / norm
+            c = nz / norm
+            d = -(a * x1 + b * y1 + c * z1)
+
+            # Inlier 개수 세기 (스칼라 루프 - 컴파일러 자동 벡터화)
+            n_inliers = 0
+            for m in range(n_points):
+                dist = abs(a * points[m, 0] + b * points[m, 1] + c * points[m, 2] + d)
+                if dist < threshold:
+                    n_inliers += 1
+
+            models[it, 0] = a
+            models[it, 1] = b
+            models[it, 2] = c
+            models[it, 3] = d
+            counts[it] = n_inliers
+
+        # 리덕션: 가장 많은 Inlier를 가진 모델 (동률이면 먼저 나온 반복)
+        best = 0
+        for it in range(1, iters):
+            if counts[it] > counts[best]:
+                best = it
+
+        return models[best, 0], models[best, 1], models[best, 2], models[best, 3], counts[best]
@@ -0,0 +1,71 @@
+"""
+IMU 틸트 보정 회전 행렬 커널
+
+calculate_tilt_matrix의 로드리게스 회전 공식을 스칼라 식으로 전개한 버전입니다.
+numba가 있으면 네이티브 코드로 컴파일하고, 없으면 같은 함수를 순수 Python으로 실행합니다.
+"""
+
+import math
+
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 미설치 시 데코레이터를 무시합니다."""
+        def _decorator(func):
+            return func
+        return _decorator
+
+
+@njit(cache=True, fastmath=True)
+def _tilt(ax, ay, az):
+    """
+    중력 벡터 (ax, ay, az)를 카메라 Down 축 [0, 1, 0]에 정렬하는 회전 행렬을 계산합니다.
+
+    Returns:
+        row-major 순서의 9개 float (r00, r01, r02, r10, r11, r12, r20, r21, r22)
+    """
+    n = math.sqrt(ax * ax + ay * ay + az * az)
+    if n == 0.0:
+        return 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0
+
+    gx = ax / n
+    gy = ay / n
+    gz = az / n
+
+    # 회전축: cross(g, [0, 1, 0]) = (-gz, 0, gx)
+    kx = -gz
+    ky = 0.0
+    kz = gx
+    axis_n = math.sqrt(kx * kx + kz * kz)
+
+    # 이미 정렬됨
+    if axis_n < 1e-6:
+        return 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0
+
+    kx /= axis_n
+    kz /= axis_n
+
+    # 회전각: dot(g, [0, 1, 0]) = gy
+    dot = min(max(gy, -1.0), 1.0)
+    angle = math.acos(dot)
+    s = math.sin(angle)
+    c = math.cos(angle)
+    t = 1.0 - c
+
+    # R = I + sin*K + (1-cos)*K@K = cos*I + sin*K + (1-cos)*k*k^T (단위 축 k)
+    r00 = c + t * kx * kx
+    r01 = t * kx * ky - s * kz
+    r02 = t * kx * kz + s * ky
+    r10 = t * ky * kx + s * kz
+    r11 = c + t * ky * ky
+    r12 = t * ky * kz - s * kx
+    r20 = t * kz * kx - s * ky
+    r21 = t * kz * ky + s * kx
+    r22 = c + t * kz * kz
+
+    return r00, r01, r02, r10, r11, r12, r20, r21, r22
@@ -23,6 +23,18 @@ CAMERA_CONFIG = {
     "camera_up": [0.0, 0.0, 1.0]       # 상단 벡터
 }
 
+def _rigid_inverse(mat):
+    """
+    강체 변환 [R|t; 0 1]의 역행렬 [R^T | -R^T t; 0 1]을 계산합니다.
+    일반 역행렬(LU 분해)보다 저렴하고 수치 오차가 없습니다.
+    """
+    R = mat[:3, :3]
+    t = mat[:3, 3]
+    inv = np.eye(4)
+    inv[:3, :3] = R.T
+    inv[:3, 3] = -R.T @ t
+    return inv
+
 def _get_camera_parameters():
     """
     PyBullet API를 통해 View/Projection Matrix(뷰/프로젝션 행렬: 3D 공간을 2D 화면으로 투영하기 위한 수학적 변환표)를 계산하고
@@ -49,7 +61,8 @@ def _get_camera_parameters():
     # Camera -> World (Inverse View Matrix: 카메라 좌표를 다시 월드 좌표로 되돌리는 역행렬)
     # CamToWorld = [Right  Up  -Forward  Eye]
     #              [  0    0       0      1 ]
-    cam_to_world = np.linalg.inv(view_matrix)
+    # View Matrix는 강체 변환이므로 해석적 역행렬을 사용합니다.
+    cam_to_world = _rigid_inverse(view_matrix)
     
     # 2. Projection Matrix(투영 행렬: 카메라 좌표를 화면의 2D 좌표로 변환) 계산
     # Camera -> NDC(기기 독립적인 표준 좌표계) 변환 행렬
@@ -79,11 +92,51 @@ def _get_camera_parameters():
     
     return fx, fy, cx, cy, cam_to_world
 
-# 파라미터 초기화
-FX, FY, CX, CY, CAM_TO_WORLD_MAT = _get_camera_parameters()
+# 파라미터 초기화 (Lazy)
+# PyBullet 행렬 계산은 첫 사용 시점에 한 번만 수행합니다. (import 비용 제거)
+# 변환 함수가 쓰는 값은 아래 전역에 채워 두고, 공개 이름(FX, CAM_TO_WORLD_MAT 등)은 __getattr__로 노출합니다.
+_CAM_CACHE = None
+_CX = _CY = _FX_INV = _FY_INV = 0.0
+_CAM_TO_WORLD = _WORLD_TO_CAM = None
+# Cam->World 행렬 상위 3행 (단일 점 변환 시 배열 할당/행렬곱 디스패치 제거)
+_m00 = _m01 = _m02 = _m03 = 0.0
+_m10 = _m11 = _m12 = _m13 = 0.0
+_m20 = _m21 = _m22 = _m23 = 0.0
+
+def _ensure_cam():
+    """카메라 파라미터와 파생 상수를 계산하여 모듈 전역에 등록합니다."""
+    global _CAM_CACHE, _CX, _CY, _FX_INV, _FY_INV, _CAM_TO_WORLD, _WORLD_TO_CAM
+    global _m00, _m01, _m02, _m03, _m10, _m11, _m12, _m13, _m20, _m21, _m22, _m23
+    if _CAM_CACHE is not None:
+        return _CAM_CACHE
+    
+    fx, fy, cx, cy, cam_to_world = _get_camera_parameters()
+    # World -> Camera (View Matrix): 외인자가 고정이므로 한 번만 계산합니다.
+    world_to_cam = _rigid_inverse(cam_to_world).astype(np.float64)
+    
+    _CX, _CY = cx, cy
+    # 픽셀당 나눗셈을 곱셈으로 바꾸기 위한 역수
+    _FX_INV, _FY_INV = 1.0 / fx, 1.0 / fy
+    _CAM_TO_WORLD, _WORLD_TO_CAM = cam_to_world, world_to_cam
+    (_m00, _m01, _m02, _m03), (_m10, _m11, _m12, _m13), (_m20, _m21, _m22, _m23) = cam_to_world[:3].tolist()
+    
+    _CAM_CACHE = {
+        "FX": fx, "FY": fy, "CX": cx, "CY": cy,
+        "CAM_TO_WORLD_MAT": cam_to_world,
+        "WORLD_TO_CAM_MAT": world_to_cam,
+    }
+    
+    logging.info(f"[PyBulletProjection] 재계산된 파라미터: fx={fx:.2f}, fy={fy:.2f}, cx={cx:.2f}, cy={cy:.2f}")
+    logging.info(f"[PyBulletProjection] Cam->World:\n{cam_to_world}")
+    return _CAM_CACHE
+
+_LAZY_CAM_NAMES = frozenset({"FX", "FY", "CX", "CY", "CAM_TO_WORLD_MAT", "WORLD_TO_CAM_MAT"})
 
-logging.info(f"[PyBulletProjection] 재계산된 파라미터: fx={FX:.2f}, fy={FY:.2f}, cx={CX:.2f}, cy={CY:.2f}")
-logging.info(f"[PyBulletProjection] Cam->World:\n{CAM_TO_WORLD_MAT}")
+def __getattr__(name):
+    """[PEP 562] 외부에서 FX, CAM_TO_WORLD_MAT 등에 처음 접근할 때 파라미터를 계산합니다."""
+    if name in _LAZY_CAM_NAMES:
+        return _ensure_cam()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def pixel_to_3d(pixel_x: int, pixel_y: int, depth_m: float) -> tuple:
@@ -95,6 +148,8 @@ def pixel_to_3d(pixel_x: int, pixel_y: int, depth_m: float) -> tuple:
         logging.error("[PyBulletProjection] pybullet 모듈이 없어 좌표 변환을 수행할 수 없습니다.")
         return 0.0, 0.0, 0.0
     
+    if _CAM_CACHE is None: _ensure_cam()
+    
     # 1. 픽셀 → 카메라 좌표계 (View Space)
     # OpenGL 카메라 좌표계: X(Right), Y(Up), Z(Backward, 즉 -Forward)
     # 하지만 PyBullet의 View Matrix는 LookAt 방식이므로
@@ -105,40 +160,73 @@ def pixel_to_3d(pixel_x: int, pixel_y: int, depth_m: float) -> tuple:
     # y_cam = -(v - cy) * depth / fy  (이미지 Y는 아래로 증가, GL Y는 위로 증가 -> 반전)
     # z_cam = -depth (카메라가 보는 방향이 -Z)
     
-    x_view = (pixel_x - CX) * depth_m / FX
-    y_view = -(pixel_y - CY) * depth_m / FY
+    x_view = (pixel_x - _CX) * depth_m * _FX_INV
+    y_view = -(pixel_y - _CY) * depth_m * _FY_INV
     z_view = -depth_m
     
-    # 동차 좌표 (Homogeneous coordinates)
-    view_pos = np.array([x_view, y_view, z_view, 1.0])
-    
-    # 2. 카메라 좌표계 → 월드 좌표계
-    world_pos = CAM_TO_WORLD_MAT @ view_pos
+    # 2. 카메라 좌표계 → 월드 좌표계 (동차 좌표 w=1, 4x4 행렬곱을 스칼라로 전개)
+    wx = _m00 * x_view + _m01 * y_view + _m02 * z_view + _m03
+    wy = _m10 * x_view + _m11 * y_view + _m12 * z_view + _m13
+    wz = _m20 * x_view + _m21 * y_view + _m22 * z_view + _m23
     
     # 3. m → cm 변환
-    x_cm = world_pos[0] * 100.0
-    y_cm = world_pos[1] * 100.0
-    z_cm = world_pos[2] * 100.0
-    
-    logging.info(
-        f"[PyBulletProjection] "
-        f"픽셀=({pixel_x}, {pixel_y}), depth={depth_m:.4f}m → "
-        f"View=({x_view:.3f}, {y_view:.3f}, {z_view:.3f}) → "
-        f"월드=({x_cm:.2f}, {y_cm:.2f}, {z_cm:.2f})cm"
-    )
+    x_cm = wx * 100.0
+    y_cm = wy * 100.0
+    z_cm = wz * 100.0
+    
+    # 픽셀 단위로 호출되는 경로이므로 DEBUG 레벨에서만 지연 포맷팅으로 기록합니다.
+    if logging.root.isEnabledFor(logging.DEBUG):
+        logging.debug(
+            "[PyBulletProjection] 픽셀=(%s, %s), depth=%.4fm → View=(%.3f, %.3f, %.3f) → 월드=(%.2f, %.2f, %.2f)cm",
+            pixel_x, pixel_y, depth_m, x_view, y_view, z_view, x_cm, y_cm, z_cm
+        )
     
     return x_cm, y_cm, z_cm
 
+def pixel_to_3d_batch(px, py, depth_m):
+    """
+    [Batch] 여러 픽셀 좌표를 한 번에 월드 3D 좌표(cm)로 변환합니다.
+    
+    Args:
+        px, py: 픽셀 좌표 1D 배열
+        depth_m: 깊이 1D 배열 (미터)
+    
+    Returns:
+        (N, 3) numpy array: 월드 좌표 cm 단위
+    """
+    px = np.asarray(px, dtype=np.float64)
+    py = np.asarray(py, dtype=np.float64)
+    depth_m = np.asarray(depth_m, dtype=np.float64)
+    
+    if not PYBULLET_AVAILABLE:
+        return np.zeros((px.size, 3))
+    
+    if _CAM_CACHE is None: _ensure_cam()
+    
+    # 픽셀 → View Space 동차 좌표 (4, N)
+    view = np.empty((4, px.size))
+    view[0] = (px - _CX) * depth_m * _FX_INV
+    view[1] = -(py - _CY) * depth_m * _FY_INV
+    view[2] = -depth_m
+    view[3] = 1.0
+    
+    # View → World (단일 행렬 곱)
+    world = _CAM_TO_WORLD @ view
+    
+    # m → cm
+    return (world[:3] * 100.0).T
+
 def pixel_to_view_space(pixel_x: int, pixel_y: int, depth_m: float) -> tuple:
     """
     [Helper] 픽셀 좌표를 카메라 기준 3D 좌표(View Space, cm 단위)로 변환합니다.
     월드 변환 전 단계의 순수 로컬 좌표가 필요할 때 사용합니다 (예: 그리퍼 카메라).
     """
     if not PYBULLET_AVAILABLE: return 0.0, 0.0, 0.0
+    if _CAM_CACHE is None: _ensure_cam()
 
     # Pinhole Back-projection
-    x_view = (pixel_x - CX) * depth_m / FX
-    y_view = -(pixel_y - CY) * depth_m / FY
+    x_view = (pixel_x - _CX) * depth_m * _FX_INV
+    y_view = -(pixel_y - _CY) * depth_m * _FY_INV
     z_view = -depth_m # PyBullet View Space는 -Z 방향
     
     # m -> cm
@@ -150,36 +238,76 @@ def calculate_planar_depth(world_x_cm, world_y_cm, world_z_cm):
     월드 좌표(cm)에 해당하는 점의 카메라 기준 Planar Depth(평면 깊이: 카메라 정면에서 수직으로 잰 거리)를 계산합니다.
     (Oracle Depth: 물리 엔진이 알려주는 오차 없는 완벽한 정답 거리를 가정할 때 사용)
     """
-    # 1. cm -> m 변환
-    world_pos_m = np.array([world_x_cm/100.0, world_y_cm/100.0, world_z_cm/100.0, 1.0])
-    
-    # 2. World -> Camera (View Matrix: 뷰 행렬) 변환
-    # CAM_TO_WORLD_MAT의 역행렬이 View Matrix입니다.
-    view_matrix = np.linalg.inv(CAM_TO_WORLD_MAT)
-    
-    view_pos = view_matrix @ world_pos_m
-    
-    # 3. View Space에서 카메라는 -Z 방향을 바라봅니다.
-    # 따라서 Planar Depth는 -z_view 입니다.
-    return -view_pos[2]
-
+    if _CAM_CACHE is None: _ensure_cam()
     
-    return -view_pos[2]
+    # World -> Camera 변환 후 View Space의 z만 필요하므로 3행만 스칼라로 계산합니다.
+    # View Space에서 카메라는 -Z 방향을 바라보므로 Planar Depth는 -z_view 입니다.
+    return -(_WORLD_TO_CAM[2, 0] * world_x_cm / 100.0
+             + _WORLD_TO_CAM[2, 1] * world_y_cm / 100.0
+             + _WORLD_TO_CAM[2, 2] * world_z_cm / 100.0
+             + _WORLD_TO_CAM[2, 3])
 
 # [Shared Memory Access]
 # User Request: "Can't we just get it from memory?" -> YES.
 # We connect to the existing PyBullet Physics Server via Shared Memory to read the True Orientation.
 _SHARED_CLIENT_ID = None
 
+# 자동 탐색된 로봇/EE 인덱스 캐시 (최초 탐색 성공 후 재사용, 조회 실패 시 무효화)
+_CACHED_ROBOT_ID = None
+_CACHED_EE_INDEX = None
+
+def _find_robot_and_ee(robot_id=0, ee_index=None):
+    """공유 메모리 서버에서 로봇 바디와 EE 링크 인덱스를 검색합니다."""
+    target_robot = robot_id # Default 0
+    
+    # Auto-detect robot (Body with joints)
+    if target_robot == 0:
+        num_bodies = p.getNumBodies(physicsClientId=_SHARED_CLIENT_ID)
+        for i in range(num_bodies):
+            if p.getNumJoints(i, physicsClientId=_SHARED_CLIENT_ID) > 0:
+                target_robot = i
+                break
+    
+    target_ee = ee_index
+    
+    if target_ee is None:
+         # 검색: 'end_effector' or 'ee' or 'tip'
+         num_joints = p.getNumJoints(target_robot, physicsClientId=_SHARED_CLIENT_ID)
+         for i in range(num_joints):
+             info = p.getJointInfo(target_robot, i, physicsClientId=_SHARED_CLIENT_ID)
+             # info[1]: jointName, info[12]: linkName
+             # [Fix] 하이픈/언더바 모두 허용 및 'link5' (DofBot 일반적 말단) 추가
+             link_name = info[12]
+             joint_name = info[1]
+             if b'ee' in joint_name or b'tip' in joint_name or b'end_effector' in link_name or b'end-effector' in link_name:
+                 target_ee = i
+                 break
+         
+         if target_ee is None: 
+             # 만약 못 찾으면 link5 시도 (DofBot)
+             for i in range(num_joints):
+                 info = p.getJointInfo(target_robot, i, physicsClientId=_SHARED_CLIENT_ID)
+                 if b'link5' in info[12]:
+                     target_ee = i
+                     break
+                     
+         if target_ee is None: target_ee = num_joints - 1
+         
+         # 검증 로깅
+         debug_info = p.getJointInfo(target_robot, target_ee, physicsClientId=_SHARED_CLIENT_ID)
+         logging.info(f"[PyBulletProjection] Shared Memory EE Link Selected: ID={target_ee}, Name={debug_info[12].decode()}, Joint={debug_info[1].decode()}")
+    
+    return target_robot, target_ee
+
 def _get_real_ee_state_via_shared_memory(robot_id=0, ee_index=None):
     """
     [Direct Memory Access]
     실행 중인 PyBullet 시뮬레이터의 메모리에 직접 접근하여
     서버가 보내주지 않는 '회전값(Orientation)'을 조회합니다.
     """
-    global _SHARED_CLIENT_ID
+    global _SHARED_CLIENT_ID, _CACHED_ROBOT_ID, _CACHED_EE_INDEX
     
-    if not PYBULLET_AVAILABLE: return None, None
+    if not PYBULLET_AVAILABLE: return None, None, None
     
     try:
         # 1. Connection (Lazy Init)
@@ -192,61 +320,45 @@ def _get_real_ee_state_via_shared_memory(robot_id=0, ee_index=None):
                 try:
                     _SHARED_CLIENT_ID = p.connect(p.SHARED_MEMORY)
                 except:
-                    return None, None
+                    return None, None, None
                     
         if _SHARED_CLIENT_ID is None or _SHARED_CLIENT_ID < 0:
             return None, None, None
-            
-        # 2. Robot ID Finding (Cache needed)
-        target_robot = robot_id # Default 0
-        
-        # Auto-detect robot (Body with joints)
-        # 이미 찾았으면 패스, 아니면 검색
-        if target_robot == 0:
-            num_bodies = p.getNumBodies(physicsClientId=_SHARED_CLIENT_ID)
-            for i in range(num_bodies):
-                if p.getNumJoints(i, physicsClientId=_SHARED_CLIENT_ID) > 0:
-                    target_robot = i
-                    break
         
-        target_ee = ee_index
+        # 자동 탐색 모드(기본 인자)일 때만 캐시를 사용합니다.
+        use_cache = (robot_id == 0 and ee_index is None)
         
-        if target_ee is None:
-             # 검색: 'end_effector' or 'ee' or 'tip'
-             num_joints = p.getNumJoints(target_robot, physicsClientId=_SHARED_CLIENT_ID)
-             for i in range(num_joints):
-                 info = p.getJointInfo(target_robot, i, physicsClientId=_SHARED_CLIENT_ID)
-                 # info[1]: jointName, info[12]: linkName
-                 # [Fix] 하이픈/언더바 모두 허용 및 'link5' (DofBot 일반적 말단) 추가
-                 link_name = info[12]
-                 joint_name = info[1]
-                 if b'ee' in joint_name or b'tip' in joint_name or b'end_effector' in link_name or b'end-effector' in link_name:
-                     target_ee = i
-                     break
-             
-             if target_ee is None: 
-                 # 만약 못 찾으면 link5 시도 (DofBot)
-                 for i in range(num_joints):
-                     info = p.getJointInfo(target_robot, i, physicsClientId=_SHARED_CLIENT_ID)
-                     if b'link5' in info[12]:
-                         target_ee = i
-                         break
-                         
-             if target_ee is None: target_ee = num_joints - 1
-             
-             # 검증 로깅
-             debug_info = p.getJointInfo(target_robot, target_ee, physicsClientId=_SHARED_CLIENT_ID)
-             logging.info(f"[PyBulletProjection] Shared Memory EE Link Selected: ID={target_ee}, Name={debug_info[12].decode()}, Joint={debug_info[1].decode()}")
-
-        # 3. Get State
-        state = p.getLinkState(target_robot, target_ee, computeForwardKinematics=True, physicsClientId=_SHARED_CLIENT_ID)
-        # state[4]=Pos, state[5]=Orn
-        return state[4], state[5], target_ee
+        for attempt in range(2):
+            # 2. Robot ID / EE Index Finding (캐시 적중 시 탐색 생략)
+            if use_cache and _CACHED_ROBOT_ID is not None and _CACHED_EE_INDEX is not None:
+                target_robot, target_ee = _CACHED_ROBOT_ID, _CACHED_EE_INDEX
+                from_cache = True
+            else:
+                target_robot, target_ee = _find_robot_and_ee(robot_id, ee_index)
+                if use_cache:
+                    _CACHED_ROBOT_ID, _CACHED_EE_INDEX = target_robot, target_ee
+                from_cache = False
+            
+            # 3. Get State
+            try:
+                state = p.getLinkState(target_robot, target_ee, computeForwardKinematics=True, physicsClientId=_SHARED_CLIENT_ID)
+            except Exception:
+                # 캐시된 인덱스가 무효해졌을 수 있음 (시뮬레이터 재시작 등) -> 무효화 후 1회 재탐색
+                _CACHED_ROBOT_ID = _CACHED_EE_INDEX = None
+                if from_cache and attempt == 0:
+                    continue
+                raise
+            
+            # state[4]=Pos, state[5]=Orn
+            return state[4], state[5], target_ee
         
     except Exception as e:
         logging.error(f"[PyBulletProjection] Shared Memory Access Fail: {e}")
         return None, None, None
 
+# 서버 위치와 공유 메모리 위치의 허용 오차 (5cm)의 제곱 (m^2)
+_DIFF_THRESH_SQ = 0.05 * 0.05
+
 def project_gripper_camera_to_world(point_view: list, ee_pos: list, ee_orn: list) -> list:
     """
     [Dynamic Kinematics] 
@@ -260,12 +372,11 @@ def project_gripper_camera_to_world(point_view: list, ee_pos: list, ee_orn: list
     # 1. 회전값 누락 확인
     # 서버가 보내준 ee_orn이 Identity([0,0,0,1] = 회전 없음)라면, 
     # 실제로는 회전값이 누락된 것이므로 복구가 필요합니다.
-    need_fix = False
-    
-    if ee_orn == [0,0,0,0]: # 비정상
-        need_fix = True
-    elif abs(ee_orn[0]) < 1e-4 and abs(ee_orn[1]) < 1e-4 and abs(ee_orn[2]) < 1e-4 and abs(ee_orn[3]-1) < 1e-4:
-        need_fix = True
+    # (영 쿼터니언 [0,0,0,0]도 비정상이므로 함께 판정합니다.)
+    qx, qy, qz, qw = ee_orn
+    xyz_sq = qx*qx + qy*qy + qz*qz
+    dw = qw - 1.0
+    need_fix = (xyz_sq + dw*dw) < 1e-8 or (xyz_sq + qw*qw) < 1e-8
         
     if need_fix:
         logging.warning("[PyBulletProjection] EE 회전값 누락(Identity) 감지! 공유 메모리에서 복구를 시도합니다.")
@@ -276,10 +387,13 @@ def project_gripper_camera_to_world(point_view: list, ee_pos: list, ee_orn: list
         if mem_pos and mem_orn:
             # [Validation] 데이터 신뢰성 검증
             # 서버가 보낸 위치(ee_pos)와 메모리 상의 위치(mem_pos)는 거의 같아야 합니다.
-            diff = math.sqrt((ee_pos[0]-mem_pos[0])**2 + (ee_pos[1]-mem_pos[1])**2 + (ee_pos[2]-mem_pos[2])**2)
+            dx = ee_pos[0] - mem_pos[0]
+            dy = ee_pos[1] - mem_pos[1]
+            dz = ee_pos[2] - mem_pos[2]
+            diff_sq = dx*dx + dy*dy + dz*dz
             
-            if diff > 0.05: # 5cm 이상 차이나면 뭔가 이상한 것 (동기화 지연 등)
-                logging.warning(f"[PyBulletProjection] 위치 불일치 경고: {diff*100:.1f}cm 차이남. (데이터 갱신 지연 가능성)")
+            if diff_sq > _DIFF_THRESH_SQ: # 5cm 이상 차이나면 뭔가 이상한 것 (동기화 지연 등)
+                logging.warning(f"[PyBulletProjection] 위치 불일치 경고: {math.sqrt(diff_sq)*100:.1f}cm 차이남. (데이터 갱신 지연 가능성)")
             else:
                 # 위치가 맞으면 회전값도 믿고 씁니다.
                 ee_orn = mem_orn
@@ -290,15 +404,15 @@ def project_gripper_camera_to_world(point_view: list, ee_pos: list, ee_orn: list
     # View Up(Y)        -> Link -X (아래)
     # View Right(X)     -> Link -Y (왼쪽)
     # 결과: [-Y_view, -X_view, -Z_view]
-    p_local = np.array([-point_view[1], -point_view[0], -point_view[2]]) # cm 단위
-    
-    # 3. 좌표 변환: 손끝(EE) -> 로봇 베이스(World)
-    # 회전 행렬(Rotation Matrix) 적용
-    rot_matrix = np.array(p.getMatrixFromQuaternion(ee_orn)).reshape(3, 3)
-    
-    # 평행이동(Translation) 적용 (m -> cm 변환)
-    t_world = np.array(ee_pos) * 100.0
-    
-    p_world = rot_matrix @ p_local + t_world
+    # 3. 좌표 변환: 손끝(EE) -> 로봇 베이스(World), 회전 + 평행이동(m -> cm)
+    # 두 단계 모두 _gripper_njit 커널에서 스칼라 연산으로 수행합니다.
+    # (numba import/컴파일 비용이 모듈 import에 얹히지 않도록 첫 호출 시점에 불러옵니다)
+    from . import _gripper_njit
+    qx, qy, qz, qw = ee_orn
+    wx, wy, wz = _gripper_njit._project(
+        float(point_view[0]), float(point_view[1]), float(point_view[2]),
+        float(qx), float(qy), float(qz), float(qw),
+        float(ee_pos[0]), float(ee_pos[1]), float(ee_pos[2])
+    )
     
-    return p_world.tolist()
+    return [wx, wy, wz]
@@ -5,8 +5,19 @@ RealSense SDK의 정확한 역투영 함수를 사용합니다.
 """
 
 import logging
+import math
 from typing import Tuple
 
+from . import _ransac_numba, _tilt_njit
+
+# Open3D 가용성 체크 (평면 분할 C++ 구현 사용 - 선택 사항)
+OPEN3D_AVAILABLE = False
+try:
+    import open3d as o3d
+    OPEN3D_AVAILABLE = True
+except ImportError:
+    OPEN3D_AVAILABLE = False
+
 
 def pixel_to_3d(pixel_x: int, pixel_y: int, depth_m: float, intrinsics) -> Tuple[float, float, float]:
     """
@@ -32,8 +43,9 @@ def pixel_to_3d(pixel_x: int, pixel_y: int, depth_m: float, intrinsics) -> Tuple
         y_cm = point_m[1] * 100
         z_cm = point_m[2] * 100
         
-        logging.debug(f"[RealSenseProjection] 픽셀({pixel_x}, {pixel_y}), depth={depth_m:.4f}m → "
-                     f"카메라=({x_cm:.2f}, {y_cm:.2f}, {z_cm:.2f})cm")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug("[RealSenseProjection] 픽셀(%s, %s), depth=%.4fm → 카메라=(%.2f, %.2f, %.2f)cm",
+                          pixel_x, pixel_y, depth_m, x_cm, y_cm, z_cm)
         
         return x_cm, y_cm, z_cm
         
@@ -44,7 +56,63 @@ def pixel_to_3d(pixel_x: int, pixel_y: int, depth_m: float, intrinsics) -> Tuple
         logging.error(f"[RealSenseProjection] 변환 오류: {e}")
         return 0.0, 0.0, 0.0
 
-def depth_to_point_cloud(depth_image, intrinsics, stride=10):
+def pixel_to_3d_batch(px, py, depth_m, intrinsics):
+    """
+    [Batch] 여러 RealSense 픽셀 좌표를 한 번에 3D 카메라 좌표(cm)로 변환합니다.
+    렌즈 왜곡을 무시한 Pinhole 역투영이므로 depth_to_point_cloud와 동일한 모델입니다.
+    
+    Args:
+        px, py: 픽셀 좌표 1D 배열
+        depth_m: 깊이 1D 배열 (미터)
+        intrinsics: 카메라 내인자 객체 또는 딕셔너리
+    
+    Returns:
+        (N, 3) numpy array: 카메라 좌표 cm 단위
+    """
+    import numpy as np
+    
+    if isinstance(intrinsics, dict):
+        fx, fy = intrinsics['fx'], intrinsics['fy']
+        cx, cy = intrinsics['cx'], intrinsics['cy']
+    else:
+        fx, fy = intrinsics.fx, intrinsics.fy
+        cx, cy = intrinsics.ppx, intrinsics.ppy
+    
+    fx_inv = 1.0 / fx
+    fy_inv = 1.0 / fy
+    
+    px = np.asarray(px, dtype=np.float64)
+    py = np.asarray(py, dtype=np.float64)
+    depth_m = np.asarray(depth_m, dtype=np.float64)
+    
+    points_cm = np.empty((px.size, 3))
+    points_cm[:, 0] = (px - cx) * fx_inv * depth_m
+    points_cm[:, 1] = (py - cy) * fy_inv * depth_m
+    points_cm[:, 2] = depth_m
+    points_cm *= 100.0
+    
+    return points_cm
+
+# 역투영 룩업 테이블 캐시: (fx, fy, cx, cy, stride, h, w) -> ((u-cx)/fx, (v-cy)/fy)
+_LUT_CACHE = {}
+
+def _get_projection_lut(fx, fy, cx, cy, stride, h, w):
+    """stride 샘플링 그리드에 대한 정규화 좌표 테이블을 반환합니다. (첫 호출 시 생성 후 캐시)"""
+    import numpy as np
+
+    key = (float(fx), float(fy), float(cx), float(cy), stride, h, w)
+    lut = _LUT_CACHE.get(key)
+    if lut is None:
+        u_norm = (np.arange(0, w, stride, dtype=np.float32) - cx) / fx
+        v_norm = (np.arange(0, h, stride, dtype=np.float32) - cy) / fy
+        # 샘플링된 Depth와 같은 (H', W') 배치로 펼쳐 둡니다.
+        u_flat = np.broadcast_to(u_norm[None, :], (v_norm.size, u_norm.size)).astype(np.float32).ravel()
+        v_flat = np.broadcast_to(v_norm[:, None], (v_norm.size, u_norm.size)).astype(np.float32).ravel()
+        lut = (u_flat, v_flat)
+        _LUT_CACHE[key] = lut
+    return lut
+
+def depth_to_point_cloud(depth_image, intrinsics, stride=10, layout="aos"):
     """
     Depth 이미지를 3D 포인트 클라우드로 변환합니다.
     성능을 위해 stride 간격으로 샘플링합니다.
@@ -53,9 +121,10 @@ def depth_to_point_cloud(depth_image, intrinsics, stride=10):
         depth_image: 단위가 미터(m)로 변환된 Depth 이미지 (numpy array)
         intrinsics: 카메라 내인자 객체 또는 딕셔너리
         stride: 픽셀 샘플링 간격 (작을수록 정밀하지만 느림)
+        layout: "aos" → (N, 3), "soa" → (3, N) (x/y/z 축별 연속 메모리)
         
     Returns:
-        points: (N, 3) 형태의 numpy array (cm 단위)
+        points: float32 numpy array (cm 단위)
     """
     try:
         import numpy as np
@@ -69,28 +138,28 @@ def depth_to_point_cloud(depth_image, intrinsics, stride=10):
             cx, cy = intrinsics.ppx, intrinsics.ppy
             
         h, w = depth_image.shape
+        u_lut, v_lut = _get_projection_lut(fx, fy, cx, cy, stride, h, w)
         
-        # 그리드 생성
-        u = np.arange(0, w, stride)
-        v = np.arange(0, h, stride)
-        uu, vv = np.meshgrid(u, v)
+        # 샘플링된 Depth (연속 메모리, float32)
+        z = np.ascontiguousarray(depth_image[::stride, ::stride], dtype=np.float32).ravel()
         
-        # 샘플링된 Depth
         # 유효한 Depth만 추출 (>0)
-        z_m = depth_image[vv, uu]
-        valid = z_m > 0
-        
-        z_m = z_m[valid]
-        u_valid = uu[valid]
-        v_valid = vv[valid]
+        valid = z > 0
+        z_valid = z[valid]
         
-        # 역투영 공식 적용
-        x_m = (u_valid - cx) * z_m / fx
-        y_m = (v_valid - cy) * z_m / fy
+        # 역투영 공식 적용: 미리 할당한 버퍼에 직접 기록 (np.stack 복사 제거)
+        if layout == "soa":
+            points_cm = np.empty((3, z_valid.size), dtype=np.float32)
+            x_out, y_out, z_out = points_cm[0], points_cm[1], points_cm[2]
+        else:
+            points_cm = np.empty((z_valid.size, 3), dtype=np.float32)
+            x_out, y_out, z_out = points_cm[:, 0], points_cm[:, 1], points_cm[:, 2]
+        np.multiply(u_lut[valid], z_valid, out=x_out)
+        np.multiply(v_lut[valid], z_valid, out=y_out)
+        z_out[...] = z_valid
         
-        # (N, 3) 배열 생성 및 cm 변환
-        points_m = np.stack((x_m, y_m, z_m), axis=-1)
-        points_cm = points_m * 100.0
+        # m → cm 변환 (In-place)
+        points_cm *= 100.0
         
         return points_cm
         
@@ -98,15 +167,17 @@ def depth_to_point_cloud(depth_image, intrinsics, stride=10):
         logging.error(f"[RealSenseProjection] 포인트 클라우드 생성 실패: {e}")
         return None
 
-def fit_plane_ransac(points, threshold=1.0, max_iterations=100):
+def fit_plane_ransac(points, threshold=1.0, max_iterations=100, layout="aos", confidence=0.99):
     """
     RANSAC 알고리즘을 사용하여 포인트 클라우드에서 최적의 평면 모델을 추정합니다.
     평면 모델: ax + by + cz + d = 0
     
     Args:
-        points: (N, 3) numpy array
+        points: (N, 3) numpy array (layout="soa"이면 (3, N))
         threshold: Inlier 판정 거리 임계값 (cm)
-        max_iterations: 반복 횟수
+        max_iterations: 최대 반복 횟수
+        layout: "aos" 또는 "soa" (depth_to_point_cloud와 동일)
+        confidence: 조기 종료 목표 신뢰도 (현재 Inlier 비율로 필요한 반복 수를 계산)
         
     Returns:
         (a, b, c, d): 평면 방정식 계수 (또는 실패 시 None)
@@ -117,14 +188,62 @@ def fit_plane_ransac(points, threshold=1.0, max_iterations=100):
     best_plane = None
     best_inliers_count = -1
     
-    n_points = points.shape[0]
+    soa = (layout == "soa")
+    n_points = points.shape[1] if soa else points.shape[0]
     if n_points < 3:
         return None, 0
-        
-    for _ in range(max_iterations):
-        # 3개의 임의 점 선택
-        indices = np.random.choice(n_points, 3, replace=False)
-        p1, p2, p3 = points[indices]
+    
+    # 외부 라이브러리 경로는 (N, 3) 입력을 요구합니다.
+    if (OPEN3D_AVAILABLE or _ransac_numba.NUMBA_AVAILABLE) and max_iterations > 0:
+        points_aos = np.ascontiguousarray(points.T) if soa else points
+    
+    # [Fast Path 1] Open3D segment_plane (C++ RANSAC, 설치된 경우에만)
+    if OPEN3D_AVAILABLE and max_iterations > 0:
+        try:
+            pcd = o3d.geometry.PointCloud()
+            pcd.points = o3d.utility.Vector3dVector(np.asarray(points_aos, dtype=np.float64))
+            plane_model, inliers = pcd.segment_plane(distance_threshold=float(threshold),
+                                                     ransac_n=3,
+                                                     num_iterations=int(max_iterations))
+            return tuple(float(v) for v in plane_model), len(inliers)
+        except Exception as e:
+            logging.debug(f"[RealSenseProjection] Open3D 평면 추정 실패, 기본 구현 사용: {e}")
+    
+    # [Fast Path 2] Numba 컴파일 커널 (설치된 경우에만)
+    if _ransac_numba.NUMBA_AVAILABLE and max_iterations > 0:
+        seed = int(np.random.randint(0, 2**31 - 1))
+        a, b, c, d, count = _ransac_numba._ransac(np.ascontiguousarray(points_aos), float(threshold), int(max_iterations), seed)
+        if count < 0:
+            return None, best_inliers_count
+        return (a, b, c, d), int(count)
+    
+    # 거리 계산용 버퍼를 한 번만 할당하고 반복마다 재사용합니다. (float32 입력이면 float32로 계산)
+    if points.dtype != np.float32:
+        points = np.ascontiguousarray(points, dtype=np.float64)
+    else:
+        points = np.ascontiguousarray(points)
+    dist_buf = np.empty(n_points, dtype=points.dtype)
+    if soa:
+        tmp_buf = np.empty(n_points, dtype=points.dtype)
+    else:
+        normal_buf = np.empty(3, dtype=points.dtype)
+        
+    log_fail = math.log(1.0 - confidence)
+    needed = max_iterations
+        
+    for iteration in range(max_iterations):
+        # 3개의 서로 다른 임의 점 선택 (중복 시 재추첨 - N >> 3이면 거의 발생하지 않음)
+        i = np.random.randint(n_points)
+        while True:
+            j = np.random.randint(n_points)
+            if j != i: break
+        while True:
+            k = np.random.randint(n_points)
+            if k != i and k != j: break
+        if soa:
+            p1, p2, p3 = points[:, i], points[:, j], points[:, k]
+        else:
+            p1, p2, p3 = points[i], points[j], points[k]
         
         # 두 벡터 생성
         v1 = p2 - p1
@@ -141,15 +260,35 @@ def fit_plane_ransac(points, threshold=1.0, max_iterations=100):
         # 전체 점과의 거리 계산 (점과 평면 사이 거리 공식)
         # dist = |ax + by + cz + d| / sqrt(a^2 + b^2 + c^2)
         # 이미 정규화했으므로 분모는 1
-        distances = np.abs(np.dot(points, np.array([a, b, c])) + d)
+        if soa:
+            # 축별 연속 벡터 3개를 순차적으로 읽습니다. (행 단위 stride 접근 없음)
+            np.multiply(points[0], a, out=dist_buf)
+            np.multiply(points[1], b, out=tmp_buf)
+            dist_buf += tmp_buf
+            np.multiply(points[2], c, out=tmp_buf)
+            dist_buf += tmp_buf
+        else:
+            normal_buf[0] = a; normal_buf[1] = b; normal_buf[2] = c
+            np.matmul(points, normal_buf, out=dist_buf)
+        np.add(dist_buf, d, out=dist_buf)
+        np.abs(dist_buf, out=dist_buf)
         
         # Inlier 개수 세기
-        n_inliers = np.sum(distances < threshold)
+        n_inliers = np.count_nonzero(dist_buf < threshold)
         
         if n_inliers > best_inliers_count:
             best_inliers_count = n_inliers
             best_plane = (a, b, c, d)
             
+            # 필요 반복 수 갱신: N = log(1-p) / log(1-w^3)
+            w = best_inliers_count / n_points
+            if w > 0:
+                needed = log_fail / math.log(max(1.0 - w**3, 1e-12))
+        
+        # 조기 종료: 필요한 횟수만큼 시도했으면 충분히 신뢰할 수 있음
+        if iteration + 1 >= needed:
+            break
+            
     return best_plane, best_inliers_count
 
 def calculate_tilt_matrix(accel_x: float, accel_y: float, accel_z: float):
@@ -163,41 +302,9 @@ def calculate_tilt_matrix(accel_x: float, accel_y: float, accel_z: float):
     try:
         import numpy as np
         
-        # 가속도 벡터 정규화 (Gravity Vector)
-        accel = np.array([accel_x, accel_y, accel_z])
-        norm = np.linalg.norm(accel)
-        if norm == 0: return np.eye(3)
-        
-        accel_norm = accel / norm
-        
-        # 목표 수직 벡터 (카메라 좌표계 기준, 보통 Y축이 아래쪽 즉 중력 방향이라고 가정할 때)
-        # RealSense D455: Y축이 아래쪽(Down)이므로 중력 가속도는 [0, 1, 0]에 가까워야 함
-        target_down = np.array([0, 1, 0])
-        
-        # 회전축 (Cross Product)
-        axis = np.cross(accel_norm, target_down)
-        axis_norm = np.linalg.norm(axis)
-        
-        # 이미 정렬됨
-        if axis_norm < 1e-6:
-            return np.eye(3)
-            
-        axis = axis / axis_norm
-        
-        # 회전각 (Dot Product)
-        dot = np.dot(accel_norm, target_down)
-        angle = np.arccos(np.clip(dot, -1.0, 1.0))
-        
-        # 로드리게스 회전 공식 (Rodrigues' Rotation Formula)
-        K = np.array([
-            [0, -axis[2], axis[1]],
-            [axis[2], 0, -axis[0]],
-            [-axis[1], axis[0], 0]
-        ])
-        
-        R = np.eye(3) + np.sin(angle) * K + (1 - np.cos(angle)) * (K @ K)
-        
-        return R
+        # 로드리게스 회전 공식을 스칼라로 전개한 커널 (numba 설치 시 컴파일됨)
+        R = np.array(_tilt_njit._tilt(float(accel_x), float(accel_y), float(accel_z)))
+        return R.reshape(3, 3)
         
     except Exception as e:
         logging.error(f"[RealSenseProjection] 틸트 매트릭스 계산 실패: {e}")
@@ -233,9 +340,36 @@ except ImportError:
 _world_calibrator = None
 _gripper_calibrator = None
 
+# 변환 행렬 캐시 (상위 3행, float 리스트) - 점 단위 호출에서 메서드 호출/행렬곱 디스패치 생략
+_WORLD_TFORM = None
+_GRIPPER_TFORM = None
+
+def invalidate_tform_cache(calibrator=None, file_changed: bool = False):
+    """
+    캘리브레이션 변경 시 캐시된 변환 행렬을 비웁니다. (CameraCalibrator가 계산/로드/저장 후 호출)
+    - calibrator가 None이면 캘리브레이터까지 모두 비워 다음 호출에서 파일을 다시 로드합니다.
+    - 이 모듈이 사용 중인 인스턴스면 변환 행렬만 다시 읽습니다.
+    - 다른 인스턴스가 같은 파일을 저장했으면(file_changed) 해당 캘리브레이터를 다시 로드합니다.
+    """
+    global _world_calibrator, _gripper_calibrator, _WORLD_TFORM, _GRIPPER_TFORM
+    if calibrator is None:
+        _world_calibrator = _gripper_calibrator = None
+        _WORLD_TFORM = _GRIPPER_TFORM = None
+        return
+    
+    if calibrator is _world_calibrator:
+        _WORLD_TFORM = None
+    elif file_changed and _world_calibrator is not None and _world_calibrator.calibration_file == calibrator.calibration_file:
+        _world_calibrator, _WORLD_TFORM = None, None
+    
+    if calibrator is _gripper_calibrator:
+        _GRIPPER_TFORM = None
+    elif file_changed and _gripper_calibrator is not None and _gripper_calibrator.calibration_file == calibrator.calibration_file:
+        _gripper_calibrator, _GRIPPER_TFORM = None, None
+
 def _get_calibrator(cal_type: str):
     """캘리브레이터 인스턴스를 반환하거나 생성합니다."""
-    global _world_calibrator, _gripper_calibrator
+    global _world_calibrator, _gripper_calibrator, _WORLD_TFORM, _GRIPPER_TFORM
     
     if CameraCalibrator is None: return None
     
@@ -246,6 +380,8 @@ def _get_calibrator(cal_type: str):
                 logging.info(f"[RealSenseProjection] 월드 캘리브레이터 로드됨: {GlobalConfig.CALIBRATION_FILE_WORLD}")
             except Exception as e:
                 logging.error(f"[RealSenseProjection] 월드 캘리브레이터 초기화 실패: {e}")
+        if _WORLD_TFORM is None and _world_calibrator is not None and _world_calibrator.transform_matrix is not None:
+            _WORLD_TFORM = _world_calibrator.transform_matrix[:3].tolist()
         return _world_calibrator
         
     elif cal_type == "gripper":
@@ -255,6 +391,8 @@ def _get_calibrator(cal_type: str):
                 logging.info(f"[RealSenseProjection] 그리퍼 캘리브레이터 로드됨: {GlobalConfig.CALIBRATION_FILE_GRIPPER}")
             except Exception as e:
                 logging.error(f"[RealSenseProjection] 그리퍼 캘리브레이터 초기화 실패: {e}")
+        if _GRIPPER_TFORM is None and _gripper_calibrator is not None and _gripper_calibrator.transform_matrix is not None:
+            _GRIPPER_TFORM = _gripper_calibrator.transform_matrix[:3].tolist()
         return _gripper_calibrator
         
     return None
@@ -272,6 +410,14 @@ def camera_to_robot(x: float, y: float, z: float, camera_type: str = "world") ->
     Returns:
         (rx, ry, rz): 로봇 베이스 좌표계에서의 위치 (cm)
     """
+    # 0. 캐시된 변환 행렬이 있으면 스칼라 연산으로 바로 적용
+    T = _WORLD_TFORM if camera_type == "world" else _GRIPPER_TFORM if camera_type == "gripper" else None
+    if T is not None:
+        r0, r1, r2 = T
+        return (r0[0]*x + r0[1]*y + r0[2]*z + r0[3],
+                r1[0]*x + r1[1]*y + r1[2]*z + r1[3],
+                r2[0]*x + r2[1]*y + r2[2]*z + r2[3])
+    
     calibrator = _get_calibrator(camera_type)
     
     # 1. 캘리브레이션 행렬이 있으면 적용
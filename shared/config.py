@@ -90,5 +90,15 @@ class CameraConfig:
     
 # 환경 변수 로드 
 # .env 파일에서 환경 변수를 로드할 수도 있으니까 미리 만들어둠. (.env.example로 만들어둠 내용은 없음)
-load_dotenv(PathConfig.BASE_DIR / ".env")
-PathConfig.ensure_dirs()
\ No newline at end of file
+# .env 파일이 없거나 이미 로드된 환경(컨테이너 등에서 MACH_VII_CONFIG_LOADED 지정)이면 파싱을 건너뜁니다.
+_ENV_PATH = PathConfig.BASE_DIR / ".env"
+if not os.environ.get("MACH_VII_CONFIG_LOADED") and _ENV_PATH.is_file():
+    load_dotenv(_ENV_PATH)
+    os.environ["MACH_VII_CONFIG_LOADED"] = "1"
+
+def initialize():
+    """
+    앱 진입점(main.py, api_server 시작 이벤트)에서 호출하는 초기화 함수입니다.
+    import 시점의 파일시스템 부작용을 없애기 위해 디렉토리 생성을 여기로 옮겼습니다.
+    """
+    PathConfig.ensure_dirs()
@@ -1,5 +1,10 @@
+import math
+
 import numpy as np
 
+# 칼만 이득이 정상 상태 값의 이 비율 이내로 들어오면 수렴한 것으로 봅니다.
+_STEADY_RTOL = 1e-3
+
 class KalmanFilter:
     """
     물체의 위치나 상태의 노이즈를 제거하여 부드럽게 추적하는 칼만 필터입니다.
@@ -10,40 +15,66 @@ class KalmanFilter:
     # 업데이트 (Update): 실제 들어온 측정값(measurement)과 자신의 예측값을 비교합니다.
     # 칼만 이득 (Kalman Gain): 측정값에 노이즈가 많으면 내 예측을 더 믿고, 측정값이 정확해 보이면 측정값을 더 믿도록 비중을 조절합니다.
 
-    def __init__(self, process_variance=1e-5, measurement_variance=1e-1**2):
+    def __init__(self, process_variance=1e-5, measurement_variance=1e-1**2, dim=None):
         """
         필터의 초기 변수들을 설정합니다.
         
         Args:
             process_variance: 시스템 모델의 불확실성 (작을수록 예측을 신뢰)
             measurement_variance: 측정값의 노이즈 (클수록 이전 값을 더 신뢰)
+            dim: 벡터 필터 차원 (예: XYZ 동시 추적 시 3). None이면 스칼라 필터
         """
-        # 예측 오차 공분산 초기화
-        self.post_error_cov = 1.0
-        # 현재 추정 상태 값 (X, Y, Z 등)
-        self.state_estimate = 0.0
+        self.dim = dim
+        
+        if dim is None:
+            # 예측 오차 공분산 초기화
+            self.post_error_cov = 1.0
+            # 현재 추정 상태 값 (X, Y, Z 등)
+            self.state_estimate = 0.0
+        else:
+            # 축별 독립 필터를 하나의 배열로 묶어 한 번의 NumPy 연산으로 갱신합니다.
+            self.post_error_cov = np.ones(dim, dtype=np.float32)
+            self.state_estimate = np.zeros(dim, dtype=np.float32)
         
         self.process_var = process_variance
         self.measure_var = measurement_variance
         
         # 첫 측정값으로 초기화했는지 여부
         self.is_initialized = False
+        
+        # 정상 상태(Steady-State) 칼만 이득
+        # Q, R이 상수이면 이득은 고정값으로 수렴합니다. 1차원 이산 리카티 방정식의 해:
+        #   M∞ = (Q + sqrt(Q² + 4QR)) / 2  (예측 오차 공분산),  K∞ = M∞ / (M∞ + R)
+        q, r = self.process_var, self.measure_var
+        prior_cov_steady = (q + math.sqrt(q * q + 4.0 * q * r)) / 2.0
+        self._k_steady = prior_cov_steady / (prior_cov_steady + r)
+        self._post_cov_steady = (1.0 - self._k_steady) * prior_cov_steady
+        # 이득이 K∞에 수렴하면 True (이후 공분산 계산 생략)
+        self._is_steady = False
 
     def update(self, measurement):
         """
         새로운 측정값을 받아 필터링된 상태를 반환합니다.
         
         Args:
-            measurement: 센서나 알고리즘(YOLO)으로부터 얻은 실제 측정값
+            measurement: 센서나 알고리즘(YOLO)으로부터 얻은 실제 측정값 (스칼라 또는 배열)
         Returns:
             filter_result: 노이즈가 제거된 부드러운 좌표 값
         """
+        if not np.isscalar(measurement):
+            return self._update_vector(measurement)
+        
         # 1. 첫 측정 시 초기화
         if not self.is_initialized:
             self.state_estimate = measurement
             self.is_initialized = True
             return self.state_estimate
 
+        # [Fast Path] 수렴 이후에는 고정 이득으로 한 번의 곱셈-덧셈만 수행합니다.
+        if self._is_steady:
+            self.state_estimate += self._k_steady * (measurement - self.state_estimate)
+            return self.state_estimate
+
         # 2. 예측 단계 (Time Update)
         # 이전 상태가 그대로 유지된다고 가정함
         prior_estimate = self.state_estimate
@@ -58,10 +89,49 @@ class KalmanFilter:
         
         # 오차 공분산 업데이트
         self.post_error_cov = (1 - kalman_gain) * prior_error_cov
+        
+        # 이득이 정상 상태 값에 충분히 가까워지면 이후 공분산 계산을 생략합니다.
+        if abs(kalman_gain - self._k_steady) <= _STEADY_RTOL * self._k_steady:
+            self._is_steady = True
 
         return self.state_estimate
 
+    def _update_vector(self, measurement):
+        """배열 측정값에 대한 갱신 (각 원소는 독립된 1차원 필터)"""
+        measurement = np.asarray(measurement, dtype=np.float32)
+        
+        # 1. 첫 측정 시 초기화
+        if not self.is_initialized:
+            self.state_estimate = measurement.copy()
+            self.post_error_cov = np.ones(measurement.shape, dtype=np.float32)
+            self.is_initialized = True
+            return self.state_estimate.copy()
+        
+        # [Fast Path] 수렴 이후 고정 이득 사용
+        if self._is_steady:
+            self.state_estimate += self._k_steady * (measurement - self.state_estimate)
+            return self.state_estimate.copy()
+        
+        # 2. 예측 + 보정 단계 (원소별 연산)
+        prior_cov = self.post_error_cov + self.process_var
+        kalman_gain = prior_cov / (prior_cov + self.measure_var)
+        self.state_estimate += kalman_gain * (measurement - self.state_estimate)
+        self.post_error_cov = (1 - kalman_gain) * prior_cov
+        
+        if np.all(np.abs(kalman_gain - self._k_steady) <= _STEADY_RTOL * self._k_steady):
+            self._is_steady = True
+        
+        # 내부 버퍼가 외부에서 변경되지 않도록 복사본을 반환합니다.
+        return self.state_estimate.copy()
+
     def reset(self, initial_value=0.0):
         """필터의 상태를 초기화합니다."""
-        self.state_estimate = initial_value
-        self.post_error_cov = 1.0
\ No newline at end of file
+        # 공분산을 다시 1.0에서 시작하므로 수렴 판정도 초기화합니다.
+        self._is_steady = False
+        if self.dim is None and np.isscalar(initial_value):
+            self.state_estimate = initial_value
+            self.post_error_cov = 1.0
+        else:
+            shape = self.dim if np.isscalar(initial_value) else np.shape(initial_value)
+            self.state_estimate = np.broadcast_to(np.asarray(initial_value, dtype=np.float32), shape).copy()
+            self.post_error_cov = np.ones(shape, dtype=np.float32)
\ No newline at end of file
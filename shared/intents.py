@@ -1,3 +1,5 @@
+import re
+from functools import lru_cache
 from enum import Enum
 
 # 현재는 대화를 진행하며 사용자 명령 자연어에 따른 동작 모션을 수행하는 의도로 제작된 열거형으로, Brain 레이어에서 결정되어 Pipeline을 통해 하위 레이어로 전달됩니다.
@@ -32,54 +34,90 @@ class ActionIntent(str, Enum):
 
     @classmethod
     def from_str(cls, text: str):
-        """문자열로부터 ActionIntent를 추출하는 유틸리티 메서드"""
-        if not text:
-            return cls.IDLE
+        """문자열로부터 ActionIntent를 추출하는 유틸리티 메서드 (결과는 _classify에 캐시됨)"""
+        return _classify(text or "")
+
+
+# 한국어 키워드 → 의도 매핑 (위에 있을수록 우선순위가 높음)
+_KEYWORD_INTENTS = {
+    "인사": ActionIntent.GREET,
+    "안녕": ActionIntent.GREET,
+    "반가워": ActionIntent.GREET,
+    "잡아": ActionIntent.PICK_UP,
+    "집어": ActionIntent.PICK_UP,
+    "가져와": ActionIntent.PICK_UP,
+    "잡기": ActionIntent.PICK_UP, # [Fix] 명사형 추가
+    "집기": ActionIntent.PICK_UP,
+    "쥐어": ActionIntent.PICK_UP,
+    "들어": ActionIntent.LIFT,
+    "올려": ActionIntent.LIFT,
+    "놓아": ActionIntent.PLACE,
+    "두어": ActionIntent.PLACE,
+    "멈춰": ActionIntent.STOP,
+    "정지": ActionIntent.STOP,
+    "그만": ActionIntent.STOP,
+    "이동": ActionIntent.MOVE,
+    "움직여": ActionIntent.MOVE,
+    "봐": ActionIntent.LOOK_AT,
+    "쳐다봐": ActionIntent.LOOK_AT,
+    "주시": ActionIntent.LOOK_AT,
+    "대기": ActionIntent.IDLE,
+    "기다려": ActionIntent.IDLE,
+    # [Fix] 완료/과거형 문장은 새로운 행동이 아닌 대기(IDLE)로 처리
+    "잡았": ActionIntent.IDLE,
+    "했어": ActionIntent.IDLE,
+    "했습": ActionIntent.IDLE, # 했습니다
+    "완료": ActionIntent.IDLE,
+    "성공": ActionIntent.IDLE,
+    "전송": ActionIntent.IDLE,
+    "보냈": ActionIntent.IDLE,
+}
+
+# 정규식 한 번의 스캔으로 모든 후보를 찾습니다.
+# 전방 탐색 (?=(...)) 으로 겹치는 위치까지 모두 찾고, 그중 우선순위가 가장 높은 것을 고릅니다.
+# (문장 내 위치가 아니라 목록 순서가 우선이던 기존 선형 스캔과 결과가 같습니다.)
+_VALUE_MAP = {intent.value: intent for intent in ActionIntent}
+_VALUE_PRIORITY = {intent.value: (i, intent) for i, intent in enumerate(ActionIntent)}
+_VALUE_RE = re.compile("(?=(" + "|".join(re.escape(v) for v in _VALUE_PRIORITY) + "))", re.IGNORECASE)
+
+_KEYWORD_PRIORITY = {kw: (i, intent) for i, (kw, intent) in enumerate(_KEYWORD_INTENTS.items())}
+_KEYWORD_RE = re.compile("(?=(" + "|".join(re.escape(k) for k in _KEYWORD_PRIORITY) + "))")
+
+def _best_match(pattern, text: str, priority: dict):
+    """pattern에 걸린 후보 중 우선순위가 가장 높은 의도를 반환합니다. (없으면 None)"""
+    hits = pattern.findall(text)
+    if not hits:
+        return None
+    if pattern.flags & re.IGNORECASE:
+        hits = [h.upper() for h in hits]
+    return min(priority[h] for h in hits)[1]
+
+@lru_cache(maxsize=512)
+def _classify(text: str) -> ActionIntent:
+    """
+    ActionIntent.from_str의 실제 분류 로직입니다.
+    VLM 응답은 같은 문장("대기", "잡아 줘" 등)이 반복되므로 결과를 LRU 캐시에 보관합니다.
+    """
+    if not text:
+        return ActionIntent.IDLE
+    
+    # 0. 열거형 값 그대로인 경우 (예: "PICK_UP") - dict 조회 한 번으로 끝냄
+    exact = _VALUE_MAP.get(text.strip().upper())
+    if exact is not None:
+        return exact
+    
+    # 1. 직접 매칭 확인 (열거형 값, 대소문자 무시)
+    hit = _best_match(_VALUE_RE, text, _VALUE_PRIORITY)
+    if hit is not None:
+        return hit
+    
+    # 2. 한국어 키워드 기반 매칭 (Heuristic)
+    hit = _best_match(_KEYWORD_RE, text, _KEYWORD_PRIORITY)
+    if hit is not None:
+        return hit
             
-        text_upper = text.upper()
-        
-        # 1. 직접 매칭 확인
-        for intent in cls:
-            if intent.value in text_upper:
-                return intent
-                
-        # 2. 한국어 키워드 기반 매칭 (Heuristic)
-        mapping = {
-            "인사": cls.GREET,
-            "안녕": cls.GREET,
-            "반가워": cls.GREET,
-            "잡아": cls.PICK_UP,
-            "집어": cls.PICK_UP,
-            "가져와": cls.PICK_UP,
-            "잡기": cls.PICK_UP, # [Fix] 명사형 추가
-            "집기": cls.PICK_UP,
-            "쥐어": cls.PICK_UP,
-            "들어": cls.LIFT,
-            "올려": cls.LIFT,
-            "놓아": cls.PLACE,
-            "두어": cls.PLACE,
-            "멈춰": cls.STOP,
-            "정지": cls.STOP,
-            "그만": cls.STOP,
-            "이동": cls.MOVE,
-            "움직여": cls.MOVE,
-            "봐": cls.LOOK_AT,
-            "쳐다봐": cls.LOOK_AT,
-            "주시": cls.LOOK_AT,
-            "대기": cls.IDLE,
-            "기다려": cls.IDLE,
-            # [Fix] 완료/과거형 문장은 새로운 행동이 아닌 대기(IDLE)로 처리
-            "잡았": cls.IDLE,
-            "했어": cls.IDLE,
-            "했습": cls.IDLE, # 했습니다
-            "완료": cls.IDLE,
-            "성공": cls.IDLE,
-            "전송": cls.IDLE,
-            "보냈": cls.IDLE,
-        }
-        
-        for keyword, intent in mapping.items():
-            if keyword in text:
-                return intent
-                
-        return cls.UNKNOWN
+    return ActionIntent.UNKNOWN
+
+def clear_intent_cache():
+    """의도 분류 캐시(ActionIntent.from_str)를 비웁니다. (키워드 표 변경, 테스트 등)"""
+    _classify.cache_clear()
@@ -2,14 +2,27 @@
 
 import threading
 import time
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 from shared.state_broadcaster import broadcaster
 from state.system_state import system_state
-from strategy.strategy_manager import strategy_manager
 from shared.intents import ActionIntent
-from memory.falkordb_manager import memory_manager
-from shared.ui_dto import SystemSnapshot
-import uuid
+from shared.ui_dto import SystemSnapshot, FrameChannel, json_dumps
+import itertools
+from types import MappingProxyType
+
+if TYPE_CHECKING:
+    from strategy.strategy_manager import StrategyManager
+    from memory.falkordb_manager import FalkorDBManager
+
+# 에피소드 ID 일련번호 (보안 용도가 아니므로 uuid4 대신 카운터 사용)
+_EPISODE_COUNTER = itertools.count()
+
+# 의도별 감정 패치 테이블 (Layer 5) - 호출마다 dict를 만들지 않도록 읽기 전용으로 공유
+_INTENT_EMOTION_PATCH = {
+    ActionIntent.GREET: MappingProxyType({"confidence": 0.8, "frustration": 0.0}),
+    ActionIntent.PICK_UP: MappingProxyType({"focus": 1.0, "effort": 0.7}),
+    ActionIntent.STOP: MappingProxyType({"frustration": 0.5, "focus": 0.8}),
+}
 
 class SystemPipeline:
     """
@@ -29,9 +42,12 @@ class SystemPipeline:
         return cls._instance
 
     def _init(self):
-        self.running = False
         self.components = {} # 각 레이어의 핸들러 등록 공간
         self.emotion_ctrl = None # 자주 쓰이는 감정 컨트롤러 캐싱용
+        # [Lazy Import] 무거운 하위 모듈(FalkorDB 클라이언트 등)은 처음 사용할 때 import 합니다.
+        self._strategy_manager: Optional["StrategyManager"] = None
+        self._memory_manager: Optional["FalkorDBManager"] = None
+        self._snap_cache = None # (입력 키, 직렬화된 스냅샷 dict) - get_system_snapshot 캐시
 
     def register_component(self, name: str, component: Any):
         """레이어별 컴포넌트를 등록합니다."""
@@ -41,66 +57,78 @@ class SystemPipeline:
         print(f"[Pipeline] 컴포넌트 등록됨: {name}")
         # 각 모듈이 시작될 때 파이프라인을 등록하고 정상 등록 상황을 로그로 확인할 수 있도록 함
 
+    def _get_strategy_manager(self) -> "StrategyManager":
+        if self._strategy_manager is None:
+            from strategy.strategy_manager import strategy_manager
+            self._strategy_manager = strategy_manager
+        return self._strategy_manager
+
+    def _get_memory_manager(self) -> "FalkorDBManager":
+        if self._memory_manager is None:
+            from memory.falkordb_manager import memory_manager
+            self._memory_manager = memory_manager
+        return self._memory_manager
+
     def process_brain_intent(self, intent: Any):
         """
         Brain에서 결정된 의도(Intent)를 파이프라인의 후속 단계로 흘려보냅니다.
         Brain (Layer 3) -> Strategy (Layer 4) -> Expression (Layer 5) -> Embodiment (Layer 6) -> Memory (Layer 7)
         """
         # 0. 의도 표준화 (Standardization)
-        if isinstance(intent, str):
-            intent_enum = ActionIntent.from_str(intent)
-        elif isinstance(intent, ActionIntent):
+        # ActionIntent는 str을 상속하므로 열거형 검사를 먼저 해야 불필요한 재파싱(from_str)을 피합니다.
+        if type(intent) is ActionIntent:
             intent_enum = intent
+        elif isinstance(intent, str):
+            intent_enum = ActionIntent.from_str(intent)
         else:
             intent_enum = ActionIntent.UNKNOWN
 
-        print(f"\n[Pipeline] === 파이프라인 실행 시작 (Intent: {intent_enum.name}) ===")
+        # Enum 디스크립터 조회를 한 번만 하도록 로컬 변수에 보관
+        intent_name = intent_enum.name
+        intent_value = intent_enum.value
+
+        print(f"\n[Pipeline] === 파이프라인 실행 시작 (Intent: {intent_name}) ===")
         
         # 시작 감정 상태 수집 (Layer 5 이전)
-        start_emotion = self.emotion_ctrl.get_current_emotion()["vector"] if self.emotion_ctrl else [0]*6
+        start_emotion = self.emotion_ctrl.get_current_emotion()["vector"] if self.emotion_ctrl else [0]*5
 
         # 1. Strategy Filtering (Layer 4)
         # strategy_manager에게 "이 행동을 해도 안전한가?" 혹은 "지금 상황에 맞는가?" 등을 확인
-        if not strategy_manager.filter_action(intent_enum.value):
-            print(f"[Pipeline] [Layer 4: Strategy] 행동이 차단되었습니다: {intent_enum.name}")
-            broadcaster.publish("agent_thought", f"[Strategy] 현재 전략 모드에서 차단된 행동입니다: {intent_enum.name}")
+        if not self._get_strategy_manager().filter_action(intent_value):
+            print(f"[Pipeline] [Layer 4: Strategy] 행동이 차단되었습니다: {intent_name}")
+            broadcaster.publish("agent_thought", f"[Strategy] 현재 전략 모드에서 차단된 행동입니다: {intent_name}")
             return
 
         # 2. Expression / Emotion Mapping (Layer 5)
         # 표준화된 의도에 따른 감정 상태 변화 유도
         # 표정부 완전 구현 시 수정 예정
-        emotion_patch = {}
-        if intent_enum == ActionIntent.GREET:
-            emotion_patch = {"confidence": 0.8, "frustration": 0.0}
-        elif intent_enum == ActionIntent.PICK_UP:
-            emotion_patch = {"focus": 1.0, "effort": 0.7}
-        elif intent_enum == ActionIntent.STOP:
-            emotion_patch = {"frustration": 0.5, "focus": 0.8}
+        emotion_patch = _INTENT_EMOTION_PATCH.get(intent_enum)
         
         if emotion_patch and self.emotion_ctrl:
             self.emotion_ctrl.update_target(emotion_patch)
         
         # 종료(목표) 감정 상태 수집
-        end_emotion = self.emotion_ctrl.get_current_emotion()["vector"] if self.emotion_ctrl else [0]*6
+        end_emotion = self.emotion_ctrl.get_current_emotion()["vector"] if self.emotion_ctrl else [0]*5
 
         # 3. Embodiment Execution (Layer 6)
         # broadcaster.publish를 통해 제어 루프에 신호 전달
-        system_state.current_intent = intent_enum.value
-        broadcaster.publish("action_intent", intent_enum.value)
+        system_state.current_intent = intent_value
+        broadcaster.publish("action_intent", intent_value)
         
         # 4. Memory Archiving (Layer 7)
         # 최종 판단과 감정 변화를 메모리에 기록
         try:
-            episode_id = f"ep_{int(time.time())}_{uuid.uuid4().hex[:4]}"
+            wall_ts = time.time() # 외부(메모리 DB)에 남는 시각이므로 벽시계 기준, 한 번만 읽어서 재사용
+            episode_id = f"ep_{int(wall_ts)}_{next(_EPISODE_COUNTER) & 0xFFFF:04x}"
             episode_data = {
                 "id": episode_id,
-                "timestamp": time.time(),
+                "timestamp": wall_ts,
                 "result": "executed", # 실행 명령 하달 성공
-                "action": {"type": intent_enum.name, "target": "system"},
+                "action": {"type": intent_name, "target": "system"},
                 "start_emotion": start_emotion,
                 "end_emotion": end_emotion
             }
-            memory_manager.save_episode(episode_data)
+            self._get_memory_manager().save_episode(episode_data)
             print(f"[Pipeline] [Layer 7: Memory] 에피소드 저장 완료: {episode_id}")
         except Exception as e:
             print(f"[Pipeline] [Layer 7: Memory] 저장 중 오류: {e}")
@@ -119,25 +147,65 @@ class SystemPipeline:
              "vector": {}, "muscles": {}, "preset_id": "neutral"
         }
 
+        robot = system_state.robot
+        robot_data = {
+            "is_moving": robot.is_moving,
+            "battery": robot.battery_level,
+            "mode": robot.current_mode
+        }
+        strategy_ctx = self._get_strategy_manager().get_context_view() # 읽기 전용 (변경 시에만 새로 복사)
+
+        # [Cache] 입력이 지난 호출과 같으면 DTO 생성/.dict() 직렬화를 건너뜁니다.
+        # 인식 데이터는 갱신 시 객체가 통째로 교체되므로 튜플 비교의 동일성(is) 검사로 대부분 즉시 판정됩니다.
+        # Brain 상태는 broadcaster의 버전 번호로 변경 여부를 판단합니다.
+        key = (
+            broadcaster._version,
+            emotion_data,
+            system_state.perception_data,
+            robot_data,
+            strategy_ctx,
+            system_state.frame_seq,
+        )
+        cache = self._snap_cache
+        if cache is not None and cache[0] == key:
+            packet = cache[1].copy()
+            packet["timestamp"] = time.time()
+            return packet
+
         # DTO 생성
         snapshot = SystemSnapshot(
             timestamp=time.time(),
             brain=broadcaster.get_snapshot(),
             emotion=emotion_data,
             perception=system_state.perception_data,
-            robot={
-                "is_moving": system_state.robot.is_moving,
-                "battery": system_state.robot.battery_level,
-                "mode": system_state.robot.current_mode
-            },
-            strategy=strategy_manager.get_context().copy(), # 복사본 사용
-            last_frame=system_state.last_frame_base64,
-            last_depth=system_state.last_depth_base64, # [New]
-            last_ee_frame=system_state.last_ee_frame_base64,
-            last_ee_depth=system_state.last_ee_depth_base64 # [New]
+            robot=robot_data,
+            strategy=strategy_ctx,
+            frame_seq=system_state.frame_seq
         )
         
-        return snapshot.dict()
+        packet = snapshot.dict()
+        self._snap_cache = (key, packet)
+        return packet.copy()
+
+    def get_frame_messages(self) -> List[bytes]:
+        """
+        UI로 보낼 프레임 바이너리 메시지 목록을 반환합니다. ([FrameChannel 1바이트] + JPEG)
+        Base64 인코딩 없이 원본 JPEG를 그대로 보내므로 전송량이 약 33% 줄어듭니다.
+        """
+        frames = (
+            (FrameChannel.FRAME, system_state.last_frame_bytes),
+            (FrameChannel.DEPTH, system_state.last_depth_bytes),
+            (FrameChannel.EE_FRAME, system_state.last_ee_frame_bytes),
+            (FrameChannel.EE_DEPTH, system_state.last_ee_depth_bytes),
+        )
+        return [bytes((channel,)) + data for channel, data in frames if data]
+
+    def get_system_snapshot_json(self) -> str:
+        """
+        get_system_snapshot()의 결과를 JSON 문자열로 반환합니다. (WebSocket 전송용)
+        orjson이 설치되어 있으면 표준 json.dumps보다 훨씬 빠르게 직렬화됩니다.
+        """
+        return json_dumps(self.get_system_snapshot())
 
 # 싱글톤 인스턴스
 pipeline = SystemPipeline()
@@ -1,6 +1,22 @@
+import itertools
 import threading
 import time
-from typing import Dict, Any, List, Callable
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Tuple
+
+# 이벤트 ID = 프로세스 태그 + 일련번호
+# 매 이벤트마다 uuid4(os.urandom)를 호출할 필요 없이 카운터로 유일성을 보장합니다.
+# 프로세스 태그는 서버 재시작 후에도 UI의 처리 완료 ID 목록과 겹치지 않도록 시작 시 한 번만 생성합니다.
+_PROCESS_TAG = uuid.uuid4().hex[:8]
+_EVENT_COUNTER = itertools.count()
+
+# 에이전트 사고(Thought) 로그 토픽 - publish 시 채팅 이력에도 기록됩니다.
+TOPIC_AGENT_THOUGHT = "agent_thought"
+
+# 명령 토픽 - 값이 바뀐 스냅샷은 합치지 않고 모두 전달합니다. (사용자 명령 유실 방지)
+_LOSSLESS_KEYS = ("action_intent", "grasp_intent")
 
 # 아직 구현되지 않은 클래스가 있음 추후 UI 구축 된 후 사용 될 부분
 
@@ -9,7 +25,7 @@ class StateBroadcaster:
     LogicBrain이 상태를 발행하고 감정 시스템/UI가 이를 구독할 때 사용하는 싱글톤 브로드캐스터입니다.
     """
     _instance = None
-    _lock = threading.RLock()
+    _lock = threading.RLock() # 인스턴스 생성(__new__) 전용. 상태 보호는 self._state_lock 사용
     
     def __new__(cls):
         if cls._instance is None:
@@ -20,32 +36,90 @@ class StateBroadcaster:
         return cls._instance
     
     def _init(self):
-        self.subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        # 상태 보호용 락 (재진입 불필요 - 소유자 추적이 없는 Lock이 RLock보다 가볍습니다)
+        # 스냅샷 생성까지만 락 안에서 처리하고, 구독자 호출은 락 밖(알림 워커)에서 수행합니다.
+        self._state_lock = threading.Lock()
+        # [COW] 구독자 목록은 불변 튜플로 보관하고 등록 시 통째로 교체합니다. (읽는 쪽은 락 없이 순회 가능)
+        self.subscribers: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
         self.latest_state = {
             "agent_state": "IDLE",     # PLANNING, EXECUTING, RECOVERING, IDLE 등 로봇의 상태
             "object_type": "none",     # 컵, 공 등
             "episode_result": "none",  # 성공(success), 실패(failure)
             "robot_status": "ok",      # 정상(ok), 오류(error)
-            "chat_history": [],        # List of {"role": "bot", "text": "..."} 채팅 대화 이력으로 최대 20개까지만 유지
-            "events": [],              # [Fix] 이벤트 버퍼 (순간적인 신호 유실 방지), 최대 50개 유지
+            "chat_history": deque(maxlen=20), # List of {"role": "bot", "text": "..."} 채팅 대화 이력으로 최대 20개까지만 유지
+            "events": deque(maxlen=50),       # [Fix] 이벤트 버퍼 (순간적인 신호 유실 방지), 최대 50개 유지
             "timestamp": time.time()
         }
+        
+        # [COW Snapshot] 상태가 바뀔 때마다 버전을 올리고, 스냅샷은 실제로 필요할 때만 만듭니다.
+        # 같은 버전이면 마지막 스냅샷을 재사용합니다. (구독자 간 공유 - 읽기 전용으로 취급)
+        self._version = 0
+        self._snapshot = None
+        self._snapshot_version = -1
+        # deque -> list 변환 캐시 (해당 버퍼가 바뀐 경우에만 다시 만듦)
+        self._list_cache: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # [Async Fan-out] 구독자 알림은 전용 워커 스레드에서 수행합니다. (발행자 스레드가 느린 구독자에 막히지 않음)
+        # 워커는 1개: 구독자 호출 순서가 유지되고, 같은 구독자가 동시에 호출되지 않습니다.
+        # 워커가 밀려 있는 동안 들어온 스냅샷은 최신 것 하나로 합쳐집니다. (구독자는 최신 상태만 필요)
+        # 단, 명령 토픽(_LOSSLESS_KEYS) 값이 바뀐 스냅샷은 합치지 않고 대기열에 따로 쌓습니다.
+        self._dispatch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcast")
+        self._pending: deque = deque()
+        self._dispatch_scheduled = False
+    
+    def _snapshot_locked(self) -> Dict[str, Any]:
+        """현재 버전의 스냅샷을 반환합니다. (self._state_lock 보유 상태에서 호출)"""
+        if self._snapshot_version != self._version:
+            snapshot = self.latest_state.copy()
+            for key in ("chat_history", "events"):
+                cached = self._list_cache.get(key)
+                if cached is None:
+                    cached = self._list_cache[key] = list(self.latest_state[key])
+                snapshot[key] = cached
+            self._snapshot = snapshot
+            self._snapshot_version = self._version
+        return self._snapshot
+    
+    def _schedule_locked(self):
+        """현재 스냅샷을 알림 대기열에 올립니다. (self._state_lock 보유 상태에서 호출)"""
+        if not self.subscribers:
+            return
+        snapshot = self._snapshot_locked()
+        pending = self._pending
+        if pending and all(pending[-1].get(k) is snapshot.get(k) for k in _LOSSLESS_KEYS):
+            pending[-1] = snapshot # 명령 변화 없음 -> 최신 스냅샷으로 합침
+        else:
+            pending.append(snapshot)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            self._dispatch_executor.submit(self._drain)
+    
+    def _drain(self):
+        """[Worker] 대기 중인 스냅샷을 순서대로 구독자들에게 전달합니다."""
+        while True:
+            with self._state_lock:
+                if not self._pending:
+                    self._dispatch_scheduled = False
+                    return
+                snapshot = self._pending.popleft()
+            
+            for sub in self.subscribers:
+                try:
+                    sub(snapshot)
+                except Exception as e:
+                    print(f"[Broadcaster] 구독자 오류: {e}")
     
     def log_chat(self, role: str, text: str):
-        with self._lock:
-            # 최근 20개까지만 기록 유지
-            msg = {"role": role, "text": text, "timestamp": time.time()}
-            history = self.latest_state.get("chat_history", [])
-            history.append(msg)
-            if len(history) > 20: history = history[-20:]
-            self.latest_state["chat_history"] = history
+        # 시각/메시지 생성은 락 밖에서 (임계 구역 최소화)
+        msg = {"role": role, "text": text, "timestamp": time.time()}
+        with self._state_lock:
+            # 최근 20개까지만 기록 유지 (deque maxlen)
+            self.latest_state["chat_history"].append(msg)
+            self._list_cache.pop("chat_history", None)
+            self._version += 1
             
-            # 리스너 호출을 위해 스냅샷 복사
-            snapshot = self.latest_state.copy()
-        
-        for sub in self.subscribers:
-            try: sub(snapshot)
-            except: pass
+            # 구독자가 있을 때만 스냅샷 생성 후 알림 예약
+            self._schedule_locked()
 
     def log_thought(self, text: str):
         """에이전트의 사고(Thought)를 기록합니다. UI에서는 챗 로그와 구분하여 표시할 수 있습니다."""
@@ -56,60 +130,57 @@ class StateBroadcaster:
     # 나중에 UI 서버가 시작될 때, UI에 실시간 데이터를 뿌려주는 함수가 여기에 subscribe 될 예정
     def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
         """상태 업데이트를 수신할 콜백 함수를 등록합니다."""
-        with self._lock:
+        with self._state_lock:
             if callback not in self.subscribers:
-                self.subscribers.append(callback)
+                self.subscribers = self.subscribers + (callback,)
             else:
                 # [Fix] 중복 구독 방지 (Reload 시 누적 방지)
                 pass
+    
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """등록된 콜백을 해제합니다."""
+        with self._state_lock:
+            self.subscribers = tuple(sub for sub in self.subscribers if sub != callback)
             
     def publish(self, key: str, value: Any):
         """특정 상태 키를 업데이트하고 구독자들에게 알립니다."""
-        # thought(사고) 로그일 경우 별도로 기록 처리
-        if key == "agent_thought":
-             self.log_thought(str(value))
-
-        with self._lock:
+        now = time.time()
+        # thought(사고) 로그일 경우 채팅 이력에도 기록 (상태 갱신과 같은 임계 구역에서 한 번에 처리)
+        thought = {"role": "thought", "text": str(value), "timestamp": now} if key == TOPIC_AGENT_THOUGHT else None
+        
+        with self._state_lock:
+            if thought is not None:
+                self.latest_state["chat_history"].append(thought)
+                self._list_cache.pop("chat_history", None)
             self.latest_state[key] = value
-            self.latest_state["timestamp"] = time.time()
-            snapshot = self.latest_state.copy()
-            
-        # 구독자들에게 알림 (비동기여야 하지만 우선 단순 루프 사용으로 구현됨)
-        for sub in self.subscribers:
-            try:
-                sub(snapshot)
-            except Exception as e:
-                print(f"[Broadcaster] 구독자 오류: {e}")
+            self.latest_state["timestamp"] = now
+            self._version += 1
+            # 구독자들에게 알림 (워커 스레드에서 비동기로 전달)
+            self._schedule_locked()
 
     def publish_event(self, event_type: str, payload: Dict[str, Any]):
         """
         일시적인 이벤트(Event)를 발행합니다. 
         상태(State)와 달리 덮어쓰지 않고 큐에 쌓이며, UI가 폴링할 때 유실되지 않도록 보존합니다.
         """
-        import uuid
-        with self._lock:
-            event = {
-                "id": str(uuid.uuid4()),
-                "type": event_type,
-                "timestamp": time.time(),
-                "payload": payload
-            }
-            # 이벤트 버퍼에 추가
-            events = self.latest_state.get("events", [])
-            events.append(event)
-            if len(events) > 50: events = events[-50:] # 최대 50개 유지
-            self.latest_state["events"] = events
+        event = {
+            "id": f"{_PROCESS_TAG}-{next(_EVENT_COUNTER):x}",
+            "type": event_type,
+            "timestamp": time.time(),
+            "payload": payload
+        }
+        with self._state_lock:
+            # 이벤트 버퍼에 추가 (최대 50개 유지 - deque maxlen)
+            self.latest_state["events"].append(event)
+            self._list_cache.pop("events", None)
+            self._version += 1
             
-            snapshot = self.latest_state.copy()
-
-        # 구독자 알림
-        for sub in self.subscribers:
-            try: sub(snapshot)
-            except: pass
+            # 구독자 알림 (비동기)
+            self._schedule_locked()
 
     def get_snapshot(self) -> Dict[str, Any]:
-        with self._lock:
-            return self.latest_state.copy()
+        with self._state_lock:
+            return self._snapshot_locked().copy()
 
 # 전역 인스턴스
 broadcaster = StateBroadcaster()
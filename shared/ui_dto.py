@@ -1,7 +1,30 @@
+import json
 from pydantic import BaseModel, Field
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Optional, Dict, Any
 
+# orjson 사용 가능 여부 (없으면 표준 json으로 동작)
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def json_dumps(v, *, default=None) -> str:
+    """DTO/스냅샷 직렬화 함수. orjson이 있으면 표준 json보다 수 배 빠르게 직렬화합니다."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(v, default=default).decode()
+    return json.dumps(v, default=default)
+
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+class _DTOBase(BaseModel):
+    """모든 DTO의 공통 베이스: .json()/parse_raw() 시 orjson을 사용합니다."""
+    class Config:
+        json_dumps = json_dumps
+        json_loads = json_loads
+
 # 1. 요청 성격 구분을 위한 열거형 (Request Dispatching)
 class UserRequestType(str, Enum):
     """사용자가 UI를 통해 전달하는 요청의 종류를 정의합니다."""
@@ -34,7 +57,7 @@ class OperationMode(str, Enum):
     # MEMORY_BASED = "thinking_based" # 추후 추가할 진짜 탐험모드 FalkorDB 참고로 삼아 진짜 사고하는 llm 기반
 
 # 5. 시스템 하부 구조 설정을 위한 DTO
-class SystemConfigurationDTO(BaseModel):
+class SystemConfigurationDTO(_DTOBase):
     """인프라 및 알고리즘 동작 방식을 결정하는 세부 설정 묶음입니다."""
     
     target_robot: RobotTarget = Field(..., description="제어 대상 로봇 장치 선택")
@@ -43,7 +66,7 @@ class SystemConfigurationDTO(BaseModel):
     is_emergency_stop: bool = Field(False, description="긴급 정지 상태 여부 (True 시 모든 Embodiment 동작 정지)")
 
 # 6. 최종 통합 요청 DTO
-class UserRequestDTO(BaseModel):
+class UserRequestDTO(_DTOBase):
     """
     UI에서 서버(Brain/API)로 전달되는 유일한 규격화된 메시지 패킷입니다.
     전송 통일성을 위해 모든 레이어 진입 시 이 형식을 따라야 합니다.
@@ -63,7 +86,7 @@ class UserRequestDTO(BaseModel):
     # 왜 Enum 값을 문자열로 변환해야 하냐면, JSON과 UI는 문자열로 변환된 데이터만을 처리할 수 있고, 내부 로직을 변경해도 데이터 통일성을 유지할 수 있기 때문
 
 # 7. 감정 상태 데이터 (Phase 2 추가)
-class EmotionData(BaseModel):
+class EmotionData(_DTOBase):
     """
     백엔드(Brain)에서 분석된 감정 상태를 프론트엔드로 전달하기 위한 데이터셋입니다.
     벡터 값과 함께, UI가 즉시 렌더링할 수 있는 '프리셋 ID'를 포함합니다.
@@ -73,7 +96,7 @@ class EmotionData(BaseModel):
     muscles: Optional[Dict[str, Any]] = Field({}, description="눈, 입 등의 저수준 미세 제어 파라미터 (선택 사항)")
 
 # 8. 시스템 전체 스냅샷 (Phase 2 추가 - WebSocket 패킷 규격)
-class SystemSnapshot(BaseModel):
+class SystemSnapshot(_DTOBase):
     """
     WebSocket(/ws)을 통해 프론트엔드로 실시간 전송되는 시스템의 전체 상태입니다.
     7-Layer 아키텍처의 각 구성 요소 상태를 모두 포함하여 정합성을 보장합니다.
@@ -92,7 +115,13 @@ class SystemSnapshot(BaseModel):
     strategy: Dict[str, Any] = Field(..., description="[Layer 4] 현재 전략 모드 및 판단 근거")
     
     # 시각화 데이터
-    last_frame: Optional[str] = Field(None, description="[Layer 1] Base64로 인코딩된 실시간 카메라 프레임")
-    last_depth: Optional[str] = Field(None, description="[Layer 1] Base64로 인코딩된 실시간 Depth 맵 (Colorized)")
-    last_ee_frame: Optional[str] = Field(None, description="[Layer 1] Base64로 인코딩된 그리퍼 카메라 프레임")
-    last_ee_depth: Optional[str] = Field(None, description="[Layer 1] Base64로 인코딩된 그리퍼 Depth 맵 (Colorized)")
+    # 프레임 자체는 WebSocket 바이너리 메시지(FrameChannel 참고)로 별도 전송하고, 여기에는 갱신 번호만 담습니다.
+    frame_seq: Optional[int] = Field(None, description="[Layer 1] 최신 카메라/Depth 프레임의 갱신 번호")
+
+# 9. 프레임 바이너리 채널 (WebSocket 바이너리 메시지의 첫 1바이트)
+class FrameChannel(IntEnum):
+    """WebSocket 바이너리 메시지 = [채널 1바이트] + [JPEG 바이트]"""
+    FRAME = 0       # 메인 카메라 컬러 프레임
+    DEPTH = 1       # 메인 카메라 Depth 맵 (Colorized)
+    EE_FRAME = 2    # 그리퍼 카메라 프레임
+    EE_DEPTH = 3    # 그리퍼 카메라 Depth 맵 (Colorized)
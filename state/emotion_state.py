@@ -1,39 +1,80 @@
-from dataclasses import dataclass, field, asdict
 from typing import Dict
 
-@dataclass
-class EmotionVector:
-    """
-    로봇의 감정 상태를 5차원 벡터로 표현합니다. (Modified PAD Model)
-    각 값은 0.0 ~ 1.0 사이의 강도를 가집니다.
-    """
+import numpy as np
+
+# 감정 축 이름 → 내부 배열 인덱스 (순서 고정)
+_FIELD_IDX = {
     # [Focus / Arousal] 주의 집중도 및 각성 수준
     # 1.0: 초집중, 놀람 (High Arousal) | 0.0: 멍함, 지루함 (Low Arousal)
-    focus: float = 0.1
+    "focus": 0,
     
     # [Effort / Energy] 신체적/정신적 에너지 소모량
     # 1.0: 고부하, 피곤, 힘씀 | 0.0: 편안함, 휴식
-    effort: float = 0.0
+    "effort": 1,
     
     # [Confidence / Dominance] 상황 통제력 및 성공 확신
     # 1.0: 위풍당당, 환희, 확신 | 0.0: 위축, 공포, 부끄러움
-    confidence: float = 0.1
+    "confidence": 2,
     
     # [Frustration / Distress] 기대와 결과의 불일치, 장애물
     # 1.0: 격분, 짜증, 좌절 | 0.0: 만족, 흐름이 좋음
-    frustration: float = 0.0
+    "frustration": 3,
     
     # [Curiosity / Interest] 새로운 자극에 대한 탐구욕
     # 1.0: 흥미진진, 장난기 | 0.0: 무관심
-    curiosity: float = 0.1
+    "curiosity": 4,
+}
+
+class EmotionVector:
+    """
+    로봇의 감정 상태를 5차원 벡터로 표현합니다. (Modified PAD Model)
+    각 값은 0.0 ~ 1.0 사이의 강도를 가집니다.
+    
+    내부적으로는 길이 5의 np.ndarray 하나에 저장하여 update()를 벡터 연산 한 번으로 처리합니다.
+    필드 접근(vec.focus 등)과 생성자 키워드 인자는 기존 dataclass와 동일하게 사용할 수 있습니다.
+    """
+    __slots__ = ("_vec",)
+
+    def __init__(self, focus: float = 0.1, effort: float = 0.0, confidence: float = 0.1,
+                 frustration: float = 0.0, curiosity: float = 0.1):
+        # float64 유지: 60Hz 보간(Lerp)의 누적 정밀도를 기존 float와 동일하게 보장
+        self._vec = np.array([focus, effort, confidence, frustration, curiosity], dtype=np.float64)
 
     def update(self, delta: Dict[str, float]):
         """델타 업데이트를 안전하게 적용합니다."""
+        d = np.zeros(5)
         for key, value in delta.items():
-            if hasattr(self, key):
-                current = getattr(self, key)
-                new_val = max(0.0, min(1.0, current + value))
-                setattr(self, key, new_val)
+            idx = _FIELD_IDX.get(key)
+            if idx is not None:
+                d[idx] = value
+        # 분기 없는 클램프: 덧셈과 clip 모두 제자리(out=)로 수행하여 임시 배열도 만들지 않습니다.
+        np.add(self._vec, d, out=self._vec)
+        np.clip(self._vec, 0.0, 1.0, out=self._vec)
     
     def to_dict(self):
-        return asdict(self)
+        vec = self._vec.tolist()
+        return {key: vec[i] for key, i in _FIELD_IDX.items()}
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.to_dict().items())
+        return f"EmotionVector({fields})"
+
+    def __eq__(self, other):
+        if not isinstance(other, EmotionVector):
+            return NotImplemented
+        return bool(np.array_equal(self._vec, other._vec))
+
+    __hash__ = None # dataclass(eq=True)와 동일하게 해시 불가
+
+
+def _make_field(idx: int):
+    """_vec[idx]를 읽고 쓰는 프로퍼티를 만듭니다. (float로 반환)"""
+    def _get(self):
+        return float(self._vec[idx])
+    def _set(self, value):
+        self._vec[idx] = value
+    return property(_get, _set)
+
+for _name, _idx in _FIELD_IDX.items():
+    setattr(EmotionVector, _name, _make_field(_idx))
+del _name, _idx
@@ -1,9 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from .emotion_state import EmotionVector
 
-@dataclass
+@dataclass(slots=True)
 class RobotStatus:
+    # gripper_state 갱신 시 호출되는 콜백 (Copy-on-Write 튜플, 다른 필드보다 먼저 초기화되어야 함)
+    _gripper_listeners: tuple = field(default=(), init=False, repr=False, compare=False)
+    
     is_moving: bool = False
     battery_level: float = 100.0
     current_mode: str = "IDLE"
@@ -13,7 +16,20 @@ class RobotStatus:
     gripper_state: float = 0.0   # 0.0(Close) ~ 0.06(Open) 미터 단위
     is_unsafe: bool = False      # 안전 사고(충돌, 끼임 등) 발생 여부
 
-@dataclass
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == "gripper_state":
+            for listener in self._gripper_listeners:
+                listener(value)
+
+    def add_gripper_listener(self, listener: Callable[[float], None]):
+        """gripper_state가 갱신될 때마다 새 값으로 호출될 콜백을 등록합니다. (갱신 스레드에서 호출되므로 가볍게 유지)"""
+        self._gripper_listeners = self._gripper_listeners + (listener,)
+
+    def remove_gripper_listener(self, listener: Callable[[float], None]):
+        self._gripper_listeners = tuple(l for l in self._gripper_listeners if l != listener)
+
+@dataclass(slots=True)
 class SystemState:
     """
     시스템의 전체 상태를 정의하는 '단일 진실 공급원(Single Source of Truth)'입니다.
@@ -32,11 +48,12 @@ class SystemState:
     camera_mode: str = "DEFAULT"     # "STEADYCAM", "EXPLORATION", "EXPLOITATION"
     focus_score: float = 100.0         # 현재 주 카메라의 이미지 선명도 점수 (임시로 100으로 설정)
     
-    # VLM 분석을 위한 최신 프레임 (Base64 Encoded JPEG)
-    last_frame_base64: Optional[str] = None
-    last_depth_base64: Optional[str] = None    # 메인 카메라 Depth
-    last_ee_frame_base64: Optional[str] = None # 그리퍼 카메라 프레임
-    last_ee_depth_base64: Optional[str] = None # 그리퍼 카메라 Depth
+    # UI 전송용 최신 프레임 (JPEG 바이트 - WebSocket 바이너리 메시지로 그대로 전송)
+    last_frame_bytes: Optional[bytes] = None
+    last_depth_bytes: Optional[bytes] = None    # 메인 카메라 Depth
+    last_ee_frame_bytes: Optional[bytes] = None # 그리퍼 카메라 프레임
+    last_ee_depth_bytes: Optional[bytes] = None # 그리퍼 카메라 Depth
+    frame_seq: int = 0                          # 위 프레임들이 갱신될 때마다 증가 (UI 재전송 판단용)
     
     # 현재 활성화된 Intent (Brain이 결정한 의도)
     current_intent: str = "IDLE"
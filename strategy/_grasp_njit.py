@@ -0,0 +1,77 @@
+"""
+범용 그립 자세 계산 커널
+
+GraspPlanner.compute_grasp_pose의 수치 계산 부분(Pinhole 크기 추정, 그리퍼 개방량, 오프셋)입니다.
+numba가 있으면 네이티브 코드로 컴파일하고, 없으면 같은 함수를 순수 Python으로 실행합니다.
+"""
+
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 미설치 시 데코레이터를 무시합니다."""
+        def _decorator(func):
+            return func
+        return _decorator
+
+
+# 크기 판정 결과 (mode)
+MODE_NO_BBOX = 0   # 바운딩 박스 없음 - 기본값 유지
+MODE_FIT = 1       # 그리퍼 폭 안에 들어옴 - 폭에 맞춰 개방
+MODE_EDGE = 2      # 너무 큼 - 가장자리 잡기
+
+
+@njit(cache=True)
+def _plan_core(bbox_w, bbox_h, focal, max_w, is_kite):
+    """
+    Args:
+        bbox_w, bbox_h: 바운딩 박스 크기 (px)
+        focal: 초점 거리 근사값 (px)
+        max_w: 그리퍼 최대 개방 폭 (cm)
+        is_kite: 얇은 물체(연) 보정 여부
+
+    Returns:
+        (mode, x_offset, approach_offset_z, gripper_percent, grasp_depth_offset, est_w_cm, est_h_cm, min_dim)
+    """
+    approach_offset_z = 10.0
+    gripper_percent = 100.0 # 기본 100% 개방
+    grasp_depth_offset = -3.0
+    x_offset = 0.0
+    mode = MODE_NO_BBOX
+    est_w_cm = 0.0
+    est_h_cm = 0.0
+    min_dim = 0.0
+
+    if bbox_w > 0 and bbox_h > 0:
+        # 간단한 가정: 화면 중앙 물체 거리 약 50cm 가정
+        est_dist_cm = 50.0
+        est_w_cm = (bbox_w / focal) * est_dist_cm
+        est_h_cm = (bbox_h / focal) * est_dist_cm
+        min_dim = min(est_w_cm, est_h_cm)
+
+        if min_dim > max_w:
+            # [전략: 가장자리 잡기 Edge Grasp] Bbox 우측 끝에서 1.5cm 안쪽
+            mode = MODE_EDGE
+            x_offset = (est_w_cm / 2.0) - 1.5
+            gripper_percent = 60.0
+            grasp_depth_offset = -2.0
+        else:
+            # 크기 적절함. 폭에 맞춰 그리퍼 조절
+            mode = MODE_FIT
+            gripper_percent = ((min_dim + 2.0) / max_w) * 100.0
+            gripper_percent = max(min(gripper_percent, 100.0), 40.0)
+
+    # 물체별 휴리스틱 보정: 얇은 물체는 바닥에 붙어있으므로 덜 내려가야 함
+    if is_kite:
+        grasp_depth_offset = -0.5
+        approach_offset_z = 8.0
+
+    return mode, x_offset, approach_offset_z, gripper_percent, grasp_depth_offset, est_w_cm, est_h_cm, min_dim
+
+
+# 컴파일 워밍업 (첫 호출에서 JIT 지연이 발생하지 않도록 import 시점에 수행)
+_plan_core(1.0, 1.0, 520.0, 6.0, False)
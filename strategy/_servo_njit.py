@@ -0,0 +1,67 @@
+"""
+비주얼 서보 1틱 제어 계산 커널
+
+_visual_servo_loop의 수치 계산 부분(오차 → P 제어 명령 → 속도 단계 → 중복 명령 판정)입니다.
+numba가 있으면 네이티브 코드로 컴파일하고, 없으면 같은 함수를 순수 Python으로 실행합니다.
+"""
+
+import math
+
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 미설치 시 데코레이터를 무시합니다."""
+        def _decorator(func):
+            return func
+        return _decorator
+
+
+@njit(cache=True, fastmath=True)
+def _servo_step(ex, ey, ez, gx, gy, gz, gain, lx, ly, lz, ls, has_last):
+    """
+    Args:
+        ex, ey, ez: 현재 EE 위치 (cm)
+        gx, gy, gz: 목표 위치 (cm)
+        gain: 비례 제어 게인
+        lx, ly, lz, ls: 마지막 전송 명령 (위치 cm, 속도) - has_last가 False면 무시
+        has_last: 마지막 전송 명령 존재 여부
+
+    Returns:
+        (cmd_x, cmd_y, cmd_z, speed, total_error, should_send)
+    """
+    # 오차 및 비례 제어 (P-Control)
+    dx = gx - ex
+    dy = gy - ey
+    dz = gz - ez
+    total = math.sqrt(dx * dx + dy * dy + dz * dz)
+    cx = ex + dx * gain
+    cy = ey + dy * gain
+    cz = ez + dz * gain
+
+    # 속도 조절 (정밀 / 중간 / 빠른 접근)
+    if total < 3.0:
+        speed = 15
+    elif total < 10.0:
+        speed = 30
+    else:
+        speed = 60
+
+    # 직전 명령과 0.1cm 미만 차이 + 같은 속도면 전송 생략
+    should_send = True
+    if has_last:
+        mx = cx - lx
+        my = cy - ly
+        mz = cz - lz
+        if mx * mx + my * my + mz * mz < 0.01 and speed == ls:
+            should_send = False
+
+    return cx, cy, cz, speed, total, should_send
+
+
+# 컴파일 워밍업 (첫 서보 틱에서 JIT 지연이 발생하지 않도록 import 시점에 수행)
+_servo_step(0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 0.8, 0.0, 0.0, 0.0, 15, True)
@@ -1,9 +1,111 @@
 import logging
+import queue
 import re
-import time
+import threading
+from collections import OrderedDict, deque
+from typing import NamedTuple, Optional
 from shared.state_broadcaster import broadcaster
 from strategy.visual_servoing import visual_servoing
 from embodiment.robot_controller import robot_controller
+from state.system_state import system_state
+
+# [Keyword Table] 의도 문자열에서 찾는 모든 키워드 → (분류, 인자)
+# 분류 우선순위는 _handle_action_intent의 분기 순서를 따릅니다.
+_KEYWORDS = {
+    # 1. 잡기
+    "잡아": ("GRASP",), "집어": ("GRASP",), "pick": ("GRASP",), "grab": ("GRASP",),
+    # 2. 인사
+    "인사": ("GREET",), "반가워": ("GREET",), "hello": ("GREET",), "greet": ("GREET",), "안녕": ("GREET",),
+    # 3. 들어올리기
+    "들어": ("LIFT",), "lift": ("LIFT",), "올려": ("LIFT",),
+    # 4. 상대 이동 (축 인덱스 0:x 1:y 2:z, 부호, 적용 순서) - 같은 축이면 순서가 뒤인 방향이 우선 (기존 if 나열 순서와 동일)
+    "왼쪽": ("MOVE", 1, 1.0, 0), "left": ("MOVE", 1, 1.0, 0),
+    "오른쪽": ("MOVE", 1, -1.0, 1), "right": ("MOVE", 1, -1.0, 1),
+    "위": ("MOVE", 2, 1.0, 2), "up": ("MOVE", 2, 1.0, 2),
+    "아래": ("MOVE", 2, -1.0, 3), "down": ("MOVE", 2, -1.0, 3),
+    "앞": ("MOVE", 0, 1.0, 4), "front": ("MOVE", 0, 1.0, 4),
+    "뒤": ("MOVE", 0, -1.0, 5), "back": ("MOVE", 0, -1.0, 5),
+    # 5. 그리퍼 (열기가 닫기보다 우선, "잡아"는 1번 잡기에서 먼저 처리됨)
+    "열어": ("GRIPPER", 100), "open": ("GRIPPER", 100),
+    "닫아": ("GRIPPER", 0), "close": ("GRIPPER", 0),
+    # 6. 정지
+    "멈춰": ("STOP",), "정지": ("STOP",), "stop": ("STOP",),
+}
+
+# 모든 키워드와 이동량 숫자를 한 번의 스캔으로 찾는 정규식
+# 전방 탐색으로 겹치는 위치의 키워드까지 모두 수집합니다. (그룹 1: 키워드, 그룹 2: 숫자)
+# 분류별로 any(k in intent ...)를 반복하고 숫자를 따로 re.search 하던 것을 대체합니다.
+_SCAN_RE = re.compile(
+    "(?=(?:(" + "|".join(re.escape(k) for k in sorted(_KEYWORDS, key=len, reverse=True)) + r")|(\d+(?:\.\d+)?)))"
+)
+
+_WS_RE = re.compile(r'\s+')
+_PLAN_CACHE_SIZE = 256
+
+class _IntentPlan(NamedTuple):
+    """의도 문자열 하나에 대한 파싱 결과 (분류 + 실행 인자). 불변이므로 캐시에 그대로 보관합니다."""
+    kind: str                       # GRASP / GREET / LIFT / MOVE / GRIPPER / STOP / NONE
+    dx: float = 0.0                 # MOVE: 상대 이동량 (cm)
+    dy: float = 0.0
+    dz: float = 0.0
+    gripper: Optional[int] = None   # GRIPPER: 개폐 값
+
+_PLAN_NONE = _IntentPlan("NONE")
+
+def _scan(intent_lower: str):
+    """의도 문자열에 포함된 키워드 집합과 첫 번째 숫자(문자열, 없으면 None)를 반환합니다."""
+    hits = set()
+    number = None
+    for keyword, num in _SCAN_RE.findall(intent_lower):
+        if keyword:
+            hits.add(keyword)
+        elif number is None:
+            number = num # 가장 왼쪽 위치의 숫자 = re.search 결과와 동일
+    return hits, number
+
+def _parse_relative_move(hits: set, number):
+    """상대 좌표 이동 파싱 → (dx, dy, dz) 또는 None"""
+    # 방향 키워드를 기존 판정 순서(왼쪽→오른쪽→위→아래→앞→뒤)대로 적용 (같은 축은 나중 것이 덮어씀)
+    moves = sorted((_KEYWORDS[k] for k in hits if _KEYWORDS[k][0] == "MOVE"), key=lambda m: m[3])
+    if not moves:
+        return None
+    
+    # 이동량: 숫자가 있으면 1~20cm로 제한하여 사용, 없으면 5cm
+    step = min(20.0, max(1.0, float(number))) if number is not None else 5.0
+    delta = [0.0, 0.0, 0.0]
+    for _, axis, sign, _ in moves:
+        delta[axis] = step * sign
+    return delta[0], delta[1], delta[2]
+
+def _parse_gripper(hits: set):
+    """그리퍼 제어 파싱 → 개폐 값 또는 None"""
+    if "열어" in hits or "open" in hits: return 100
+    if "잡아" in hits or "닫아" in hits or "close" in hits: return 0
+    return None
+
+def _parse_plan(intent_lower: str) -> _IntentPlan:
+    """
+    의도 문자열을 실행 계획으로 변환합니다. (입력 문자열에 대해 결정적이므로 캐시 가능)
+    키워드 스캔은 한 번만 수행하고, 분기에 필요한 값(이동량/그리퍼 값)까지 모두 여기서 계산합니다.
+    """
+    # 모든 분류의 키워드(+숫자)를 한 번에 스캔
+    hits, number = _scan(intent_lower)
+    categories = {_KEYWORDS[k][0] for k in hits}
+    
+    for kind in ("GRASP", "GREET", "LIFT"):
+        if kind in categories:
+            return _IntentPlan(kind)
+    if "MOVE" in categories:
+        delta = _parse_relative_move(hits, number)
+        if delta is not None:
+            return _IntentPlan("MOVE", *delta)
+    if "GRIPPER" in categories:
+        val = _parse_gripper(hits)
+        if val is not None:
+            return _IntentPlan("GRIPPER", gripper=val)
+    if "STOP" in categories:
+        return _IntentPlan("STOP")
+    return _PLAN_NONE
 
 class ActionDispatcher:
     """
@@ -16,8 +118,20 @@ class ActionDispatcher:
     """
     def __init__(self):
         logging.info("[ActionDispatcher] 초기화 중... Broadcaster 구독 시작")
-        self.last_action_intent = None
-        self.last_grasp_timestamp = 0.0
+        # 중복 억제: 행동 의도는 직전 의도의 해시와 정수 비교, 파지 의도는 최근 (대상, ms 타임스탬프) 집합으로 검사
+        self._last_action_hash = None
+        self._recent_grasps: "deque[tuple]" = deque(maxlen=16)
+        # 정규화된 의도 문자열 → 실행 계획 (LRU, 최대 _PLAN_CACHE_SIZE개)
+        self._intent_plan_cache: "OrderedDict[str, _IntentPlan]" = OrderedDict()
+        # 인사 동작 웨이포인트 타이머 (정지/새 인사 시 취소)
+        self._pending_greet_timers: list = []
+        self._greet_lock = threading.Lock()
+        
+        # [Async] 구독 콜백은 작업을 큐에 넣기만 하고, 실제 실행(서보잉/모션 등 수 초 소요)은 전용 워커가 담당합니다.
+        # Broadcaster 알림 스레드가 파지 동작 내내 묶이지 않도록 분리합니다. (가득 차면 가장 오래된 작업을 버림)
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=8)
+        self._worker = threading.Thread(target=self._drain, name="action-dispatcher", daemon=True)
+        self._worker.start()
         broadcaster.subscribe(self.on_intent_received)
 
     def on_intent_received(self, data: dict):
@@ -26,58 +140,112 @@ class ActionDispatcher:
         """
         # 1. Action Intent (Natural Language -> Pipeline)
         intent = data.get("action_intent")
-        if intent and intent != self.last_action_intent:
-            self.last_action_intent = intent
-            self._handle_action_intent(intent)
+        if intent:
+            h = hash(intent) # str 해시는 객체에 캐시되므로 같은 의도가 반복 전달되면 재계산 없음
+            if h != self._last_action_hash:
+                self._last_action_hash = h
+                self._enqueue(("action", intent))
 
         # 2. Grasp Intent (Tool -> Strategy)
         grasp_data = data.get("grasp_intent")
         if grasp_data:
-            timestamp = grasp_data.get("timestamp", 0)
-            if timestamp > self.last_grasp_timestamp:
-                self.last_grasp_timestamp = timestamp
-                target = grasp_data.get("target_name", "Object")
+            target = grasp_data.get("target_name", "Object")
+            key = (target, round(grasp_data.get("timestamp", 0) * 1000))
+            if key not in self._recent_grasps:
+                self._recent_grasps.append(key)
                 logging.info(f"[ActionDispatcher] Grasp Intent 수신: {target}")
-                self._dispatch_grasp_strategy(target_label=target)
+                self._enqueue(("grasp", target))
+
+    def _enqueue(self, job: tuple):
+        """작업을 워커 큐에 넣습니다. 큐가 가득 차면 가장 오래된 작업을 버립니다."""
+        while True:
+            try:
+                self._queue.put_nowait(job)
+                return
+            except queue.Full:
+                try:
+                    dropped = self._queue.get_nowait()
+                    logging.warning(f"[ActionDispatcher] 작업 큐 포화 - 오래된 작업 폐기: {dropped}")
+                except queue.Empty:
+                    pass
+
+    def _drain(self):
+        """[Worker] 큐에 쌓인 작업을 순서대로 실행합니다."""
+        while True:
+            self._run_job(self._queue.get())
+
+    def _run_job(self, job: tuple):
+        """작업 하나를 실행합니다. (action: 자연어 의도 / grasp: 파지 대상 이름)"""
+        kind, arg = job
+        try:
+            if kind == "action":
+                self._handle_action_intent(arg)
+            else:
+                self._cancel_greet() # 파지 동작 전에 남은 인사 웨이포인트 취소
+                self._dispatch_grasp_strategy(target_label=arg)
+        except Exception as e:
+            logging.error(f"[ActionDispatcher] 작업 실행 오류 ({kind}): {e}")
 
     def _handle_action_intent(self, intent: str):
         logging.info(f"[ActionDispatcher] 의도 수신: {intent}")
         intent_lower = intent.lower()
+        plan = self._get_plan(intent_lower) # 소문자 변환/키워드 스캔은 여기서 한 번만 (반복 의도는 캐시 적중)
+        kind = plan.kind
+
+        # 인사 외의 동작 의도는 남은 인사 웨이포인트를 먼저 취소 (두 동작의 팔 명령이 섞이지 않도록)
+        if kind not in ("GREET", "NONE"):
+            self._cancel_greet()
 
         # 1. [Strategy] 복합 행동: 잡기 (Pick/Grasp)
-        if any(k in intent_lower for k in ["잡아", "집어", "pick", "grab"]):
+        if kind == "GRASP":
             self._dispatch_grasp_strategy(intent_str=intent_lower)
 
         # 2. [Embodiment] 단순 행동: 인사 (Greet)
-        elif any(k in intent_lower for k in ["인사", "반가워", "hello", "greet", "안녕"]):
+        elif kind == "GREET":
             self._dispatch_greet()
 
         # 3. [Embodiment] 단순 행동: 들어올리기 (Lift)
-        elif any(k in intent_lower for k in ["들어", "lift", "올려"]):
+        elif kind == "LIFT":
             self._dispatch_lift()
 
         # 4. [Embodiment] 원시 이동 (Relative Move)
-        elif self._dispatch_relative_move(intent_lower):
-            pass 
+        elif kind == "MOVE":
+            self._dispatch_relative_move(plan.dx, plan.dy, plan.dz)
 
         # 5. [Embodiment] 그리퍼 제어
-        elif self._dispatch_gripper(intent_lower):
-            pass
+        elif kind == "GRIPPER":
+            self._dispatch_gripper(plan.gripper)
 
         # 6. [Embodiment] 정지 (Stop)
-        elif any(k in intent_lower for k in ["멈춰", "정지", "stop"]):
+        elif kind == "STOP":
             robot_controller.stop()
 
         else:
             logging.info(f"[ActionDispatcher] 처리되지 않은 의도: {intent}")
 
+    def _get_plan(self, intent_lower: str) -> _IntentPlan:
+        """
+        의도 문자열 → 실행 계획 (캐시 사용).
+        공백을 정규화한 문자열을 키로 사용하며, 같은 표현이 반복되면 키워드 스캔/숫자 파싱을 생략합니다.
+        """
+        key = _WS_RE.sub(" ", intent_lower).strip()
+        cache = self._intent_plan_cache
+        plan = cache.get(key)
+        if plan is not None:
+            cache.move_to_end(key)
+            return plan
+        
+        plan = _parse_plan(intent_lower)
+        cache[key] = plan
+        if len(cache) > _PLAN_CACHE_SIZE:
+            cache.popitem(last=False)
+        return plan
+
     def _dispatch_grasp_strategy(self, intent_str: str = None, target_label: str = None):
         """
         '잡기' 전략 실행.
         intent_str(자연어) 또는 target_label(직접 지정) 중 하나를 사용.
         """
-        from state.system_state import system_state
-        
         # 1. 타겟 결정
         final_label = target_label
         
@@ -109,44 +277,70 @@ class ActionDispatcher:
         [Strategy] 전신 인사 (Coordinate Control + Joint Control)
         손을 흔드는 동작은 move_to_xyz를 사용하고,
         기본 자세 복귀는 set_joints를 사용하여 명시적으로 수직 일직선 자세를 만듭니다.
+        
+        각 웨이포인트는 타이머로 예약하고 즉시 반환합니다.
+        (인사 도중에도 워커가 다음 의도를 처리할 수 있고, '정지' 의도로 남은 동작을 취소할 수 있음)
         """
         broadcaster.publish("agent_thought", "[Dispatcher] 반갑게 인사를 건넵니다.")
         
-        try:
-            # 기본 자세 정의 (xyz 좌표)
-            BASE_X = 25.0  # cm
-            BASE_Y = 0.0   # cm (중앙)
-            
-            # 수직 일직선 기본 자세 (관절각, degrees)
-            # 실제 로봇에서 수동으로 수직 자세를 만들고 측정한 값
-            # 위치: x=25, y=0, z=25 (cm)
-            BASE_JOINTS = [0, -21, -3, -72, 0]
-            
-            # 1. 안녕 동작 수행 (xyz 좌표 사용)
-            greet_z = 25.0
-            
-            # 2. 손 흔들기 (Y축 좌우)
-            for _ in range(2):
-                # Left
-                robot_controller.robot_driver.move_to_xyz(BASE_X, BASE_Y + 5.0, greet_z)
-                time.sleep(0.8)
-                # Right
-                robot_controller.robot_driver.move_to_xyz(BASE_X, BASE_Y - 5.0, greet_z)
-                time.sleep(0.8)
-            
-            # 3. 중앙 복귀
-            robot_controller.robot_driver.move_to_xyz(BASE_X, BASE_Y, greet_z)
-            time.sleep(1.0)
-            
-            # 4. 기본 자세로 복귀 (관절각 사용 - 수직 일직선)
+        # 기본 자세 정의 (xyz 좌표)
+        BASE_X = 25.0  # cm
+        BASE_Y = 0.0   # cm (중앙)
+        
+        # 수직 일직선 기본 자세 (관절각, degrees)
+        # 실제 로봇에서 수동으로 수직 자세를 만들고 측정한 값
+        # 위치: x=25, y=0, z=25 (cm)
+        BASE_JOINTS = [0, -21, -3, -72, 0]
+        
+        # 1. 안녕 동작 수행 (xyz 좌표 사용)
+        greet_z = 25.0
+        driver = robot_controller.robot_driver
+        
+        # (시작 시각 초, 동작) - 기존 순차 실행의 대기 시간(0.8/0.8/1.0/1.5초)과 같은 간격
+        steps = []
+        t = 0.0
+        # 2. 손 흔들기 (Y축 좌우)
+        for _ in range(2):
+            steps.append((t, lambda: driver.move_to_xyz(BASE_X, BASE_Y + 5.0, greet_z))) # Left
+            t += 0.8
+            steps.append((t, lambda: driver.move_to_xyz(BASE_X, BASE_Y - 5.0, greet_z))) # Right
+            t += 0.8
+        # 3. 중앙 복귀
+        steps.append((t, lambda: driver.move_to_xyz(BASE_X, BASE_Y, greet_z)))
+        t += 1.0
+        # 4. 기본 자세로 복귀 (관절각 사용 - 수직 일직선)
+        def _return_home():
             logging.info(f"[Dispatcher] 기본 자세 복귀: {BASE_JOINTS}")
-            robot_controller.robot_driver.set_joints(BASE_JOINTS)
-            time.sleep(1.5)
-            
-            broadcaster.publish("agent_thought", "[Dispatcher] 인사를 마치고 기본 자세로 돌아왔습니다.")
+            driver.set_joints(BASE_JOINTS)
+        steps.append((t, _return_home))
+        t += 1.5
+        steps.append((t, lambda: broadcaster.publish("agent_thought", "[Dispatcher] 인사를 마치고 기본 자세로 돌아왔습니다.")))
+        
+        with self._greet_lock:
+            self._cancel_greet_locked() # 진행 중인 이전 인사는 취소
+            for delay, action in steps:
+                timer = threading.Timer(delay, self._run_greet_step, args=(action,))
+                timer.daemon = True
+                self._pending_greet_timers.append(timer)
+                timer.start()
 
+    def _run_greet_step(self, action):
+        """[Timer] 인사 웨이포인트 하나를 실행합니다."""
+        try:
+            action()
         except Exception as e:
             logging.error(f"[Dispatcher] 인사 동작 실패: {e}")
+            self._cancel_greet() # 이후 웨이포인트는 실행하지 않음
+
+    def _cancel_greet(self):
+        """예약된 인사 웨이포인트를 모두 취소합니다."""
+        with self._greet_lock:
+            self._cancel_greet_locked()
+
+    def _cancel_greet_locked(self):
+        for timer in self._pending_greet_timers:
+            timer.cancel()
+        self._pending_greet_timers.clear()
 
     def _dispatch_lift(self):
         """들어올리기 동작"""
@@ -155,44 +349,16 @@ class ActionDispatcher:
         target_z = current_pose['z'] + 15.0
         robot_controller.robot_driver.move_to_xyz(current_pose['x'], current_pose['y'], target_z)
 
-    def _dispatch_relative_move(self, intent: str) -> bool:
-        """상대 좌표 이동 파싱 및 디스패치"""
-        dx, dy, dz = 0.0, 0.0, 0.0
-        processed = False
-        
-        if "왼쪽" in intent or "left" in intent: dy = 5.0; processed = True
-        if "오른쪽" in intent or "right" in intent: dy = -5.0; processed = True
-        if "위" in intent or "up" in intent: dz = 5.0; processed = True
-        if "아래" in intent or "down" in intent: dz = -5.0; processed = True
-        if "앞" in intent or "front" in intent: dx = 5.0; processed = True
-        if "뒤" in intent or "back" in intent: dx = -5.0; processed = True
-            
-        match = re.search(r'(\d+(?:\.\d+)?)', intent)
-        if match:
-            val = float(match.group(1))
-            val = min(20.0, max(1.0, val))
-            if dx != 0: dx = val if dx > 0 else -val
-            if dy != 0: dy = val if dy > 0 else -val
-            if dz != 0: dz = val if dz > 0 else -val
-            
-        if processed:
-            broadcaster.publish("agent_thought", f"[Dispatcher] 상대 이동 지시: {dx}, {dy}, {dz}")
-            cur = robot_controller.robot_driver.get_current_pose()
-            robot_controller.robot_driver.move_to_xyz(cur['x']+dx, cur['y']+dy, cur['z']+dz)
-            return True
-        return False
-
-    def _dispatch_gripper(self, intent: str) -> bool:
-        """그리퍼 제어 파싱 및 디스패치"""
-        val = None
-        if any(k in intent for k in ["열어", "open"]): val = 100
-        elif any(k in intent for k in ["잡아", "닫아", "close"]): val = 0
-        
-        if val is not None:
-            broadcaster.publish("agent_thought", f"[Dispatcher] 그리퍼 제어: {val}")
-            robot_controller.robot_driver.move_gripper(val)
-            return True
-        return False
+    def _dispatch_relative_move(self, dx: float, dy: float, dz: float):
+        """상대 좌표 이동 디스패치"""
+        broadcaster.publish("agent_thought", f"[Dispatcher] 상대 이동 지시: {dx}, {dy}, {dz}")
+        cur = robot_controller.robot_driver.get_current_pose()
+        robot_controller.robot_driver.move_to_xyz(cur['x']+dx, cur['y']+dy, cur['z']+dz)
+
+    def _dispatch_gripper(self, val: int):
+        """그리퍼 제어 디스패치"""
+        broadcaster.publish("agent_thought", f"[Dispatcher] 그리퍼 제어: {val}")
+        robot_controller.robot_driver.move_gripper(val)
 
 # 싱글톤 인스턴스
 action_dispatcher = ActionDispatcher()
@@ -1,18 +1,40 @@
-import random
+import numpy as np
 from typing import Dict, Any
 from .base_policy import BasePolicy
 from .safe_policy import SafePolicy
 
+# 노이즈 버퍼 크기 (소진되면 한 번의 호출로 다시 채움)
+_NOISE_BUF_SIZE = 1024
+_APPROACH_ANGLES = (0, 15, -15) # 다양한 손목 각도 시도
+
 class ExplorePolicy(SafePolicy):
     """
     탐험 정책(Exploration Policy): 접근 각도와 속도에 노이즈를 추가하여 데이터를 수집합니다.
     SafePolicy의 안정성을 상속받지만 파라미터를 재정의합니다.
     """
     
+    def __init__(self, robot_interface=None):
+        super().__init__(robot_interface)
+        # 난수는 버퍼 단위로 미리 생성하고 호출마다 하나씩 꺼내 씁니다. (호출당 RNG 호출 제거)
+        self._rng = np.random.default_rng()
+        self._refill_noise()
+        self._refill_angles()
+
+    def _refill_noise(self):
+        # (x, y) 노이즈 쌍, Python float로 변환해 두어 좌표 dict에 그대로 더함
+        self._noise_buf = self._rng.uniform(-0.5, 0.5, (_NOISE_BUF_SIZE, 2)).tolist() # +/- 0.5cm
+        self._noise_idx = 0
+
+    def _refill_angles(self):
+        self._angle_buf = self._rng.choice(_APPROACH_ANGLES, _NOISE_BUF_SIZE).tolist()
+        self._angle_idx = 0
+
     def execute_move(self, target_pos: Dict[str, float], context: Dict[str, Any]) -> bool:
         # 데이터 수집을 위해 목표 위치에 약간의 가우시안 노이즈 추가 (안전한 경우)
-        noise_x = random.uniform(-0.5, 0.5) # +/- 0.5cm
-        noise_y = random.uniform(-0.5, 0.5)
+        if self._noise_idx >= _NOISE_BUF_SIZE:
+            self._refill_noise()
+        noise_x, noise_y = self._noise_buf[self._noise_idx]
+        self._noise_idx += 1
         
         adjusted_target = target_pos.copy()
         adjusted_target['x'] += noise_x
@@ -23,6 +45,9 @@ class ExplorePolicy(SafePolicy):
         return True
 
     def execute_grasp(self, object_info: Dict[str, Any], context: Dict[str, Any]) -> bool:
-        approach_angle = random.choice([0, 15, -15]) # 다양한 손목 각도 시도
+        if self._angle_idx >= _NOISE_BUF_SIZE:
+            self._refill_angles()
+        approach_angle = self._angle_buf[self._angle_idx]
+        self._angle_idx += 1
         print(f"[ExplorePolicy] Grasping with approach_angle={approach_angle} deg")
         return True
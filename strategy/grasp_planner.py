@@ -3,6 +3,7 @@
 import numpy as np
 import logging
 from typing import Dict, List, Optional, Tuple
+from . import _grasp_njit
 
 class GraspPlanner:
     """
@@ -27,6 +28,59 @@ class GraspPlanner:
             "soccerball": {"approach_offset_z": 10.0, "gripper_width": 100.0},
             "default": {"approach_offset_z": 5.0, "gripper_width": 80.0}
         }
+        # 일괄 조회용 SoA 사본 (grasp_memory가 원본, 변경 시 _sync_memory_arrays로 재구성)
+        self._sync_memory_arrays()
+    
+    def _sync_memory_arrays(self):
+        """grasp_memory를 이름 인덱스 + 파라미터별 연속 배열(SoA)로 재구성하고, 물체별 고속 경로를 다시 만듭니다."""
+        self._fast_paths = {name: self._make_fast_path(name, params) for name, params in self.grasp_memory.items()}
+        self._mem_keys = tuple(self.grasp_memory)
+        self._mem_index = {name: i for i, name in enumerate(self._mem_keys)}
+        # float64: 단일 조회(compute_grasp_pose)와 같은 값이 나오도록 정밀도 유지
+        self._mem_offset_z = np.array(
+            [self.grasp_memory[k]["approach_offset_z"] for k in self._mem_keys], dtype=np.float64
+        )
+        self._mem_gripper = np.array(
+            [self.grasp_memory[k]["gripper_width"] for k in self._mem_keys], dtype=np.float64
+        )
+    
+    @staticmethod
+    def _make_fast_path(object_name: str, params: Dict):
+        """
+        메모리에 있는 물체 전용 그립 자세 계산 함수를 만듭니다.
+        파라미터(접근 높이, 그리퍼 개방)를 미리 묶어 두어 호출 시에는 좌표 덧셈만 수행합니다.
+        """
+        approach_offset_z = params["approach_offset_z"]
+        gripper_open_percent = min(params["gripper_width"], 100.0)
+        grasp_depth_offset = -3.0
+        
+        def fast_path(object_position: Dict[str, float]) -> Dict[str, any]:
+            x = object_position["x"]
+            y = object_position["y"]
+            z = object_position["z"]
+            return {
+                "pre_grasp": {"x": x, "y": y, "z": z + approach_offset_z},
+                "grasp": {"x": x, "y": y, "z": z + grasp_depth_offset},
+                "gripper_width": gripper_open_percent,
+                "object_name": object_name
+            }
+        return fast_path
+    
+    def _memory_indices(self, object_names: List[str]) -> np.ndarray:
+        """물체 이름별 메모리 행 인덱스 (메모리에 없으면 -1)"""
+        index = self._mem_index
+        return np.fromiter((index.get(name, -1) for name in object_names), dtype=np.intp, count=len(object_names))
+    
+    def get_batch(self, object_names: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 물체의 메모리 파라미터를 한 번에 조회합니다. (메모리에 없는 물체는 'default' 행 사용)
+        
+        Returns:
+            (approach_offset_z 배열, gripper_width 배열) - 각 (N,)
+        """
+        idx = self._memory_indices(object_names)
+        idx[idx < 0] = self._mem_index["default"]
+        return self._mem_offset_z[idx], self._mem_gripper[idx]
     
     def compute_grasp_pose(self, 
                           object_name: str, 
@@ -59,69 +113,36 @@ class GraspPlanner:
         # 대략적으로 카메라 높이와 물체 거리를 통해 추정하거나, bbox 픽셀만으로 안전마진 설정.
         
         # 여기서는 가장 보수적으로 "최대 개방"을 기본으로 하되, 
-        # 메모리에 값이 있으면 그걸 씁니다.
+        # 메모리에 값이 있으면 그걸 씁니다. (메모리 물체는 미리 만든 전용 경로로 바로 계산)
+        fast_path = self._fast_paths.get(object_name)
+        if fast_path is not None:
+            grasp_pose = fast_path(object_position)
+            pre_grasp_pos = grasp_pose["pre_grasp"]
+            logging.info(f"[GraspPlanner] {object_name} 그립 자세: "
+                        f"접근={pre_grasp_pos['x']:.1f}, {pre_grasp_pos['y']:.1f}, {pre_grasp_pos['z']:.1f} (Offset X 0.0)")
+            return grasp_pose
         
-        approach_offset_z = 10.0
-        gripper_percent = 100.0 # 기본 100% 개방
-        grasp_depth_offset = -3.0
+        # [범용 로직] (메모리에 없는 새로운 물체)
+        logging.info(f"[GraspPlanner] '{object_name}' - 새로운 물체, 범용 GPD 로직 적용")
         
-        # 메모리 조회
-        memory_params = self.grasp_memory.get(object_name)
+        # (1) 물체 크기 추정 및 파지 전략 수립 + (2) 물체별 휴리스틱 보정
+        # 수치 계산은 _grasp_njit._plan_core 커널에서 수행하고, 로그만 여기서 남깁니다.
+        (mode, grasp_pos_x_offset, approach_offset_z, gripper_percent, grasp_depth_offset,
+         est_w_cm, est_h_cm, min_dim) = _grasp_njit._plan_core(
+            float(bbox[0]), float(bbox[1]), self.FOCAL_LENGTH_PX, self.GRIPPER_MAX_WIDTH_CM,
+            "kite" in object_name.lower()
+        )
+        
+        if mode != _grasp_njit.MODE_NO_BBOX:
+            logging.info(f"[GraspPlanner] 물체 크기 추정: W={est_w_cm:.1f}cm, H={est_h_cm:.1f}cm")
+        
+        if mode == _grasp_njit.MODE_EDGE:
+            logging.warning(f"[GraspPlanner] ⚠️ 물체가 너무 큽니다 (Min Dim {min_dim:.1f}cm > {self.GRIPPER_MAX_WIDTH_CM}cm).")
+            logging.info(f"[GraspPlanner] 💡 전략 변경: 가장자리 잡기 (Offset X +{grasp_pos_x_offset:.1f}cm)")
+        elif mode == _grasp_njit.MODE_FIT:
+            if est_h_cm < est_w_cm and est_w_cm > self.GRIPPER_MAX_WIDTH_CM:
+                logging.info("[GraspPlanner] 💡 90도 회전 필요 (세로로 잡아야 함) - *현재 회전 미지원*")
         
-        if memory_params:
-            approach_offset_z = memory_params["approach_offset_z"]
-            gripper_percent = memory_params["gripper_width"]
-        else:
-            # [범용 로직]
-            logging.info(f"[GraspPlanner] '{object_name}' - 새로운 물체, 범용 GPD 로직 적용")
-            
-            # (1) 물체 크기 추정 및 파지 전략 수립
-            grasp_pos_x_offset = 0.0
-            
-            if bbox[0] > 0 and bbox[1] > 0:
-                # 간단한 가정: 화면 중앙 물체 거리 약 50cm 가정
-                est_dist_cm = 50.0 
-                # 너비(w)와 높이(h) 추정
-                est_w_cm = (bbox[0] / self.FOCAL_LENGTH_PX) * est_dist_cm
-                est_h_cm = (bbox[1] / self.FOCAL_LENGTH_PX) * est_dist_cm
-                
-                logging.info(f"[GraspPlanner] 물체 크기 추정: W={est_w_cm:.1f}cm, H={est_h_cm:.1f}cm")
-                
-                min_dim = min(est_w_cm, est_h_cm)
-                
-                if min_dim > self.GRIPPER_MAX_WIDTH_CM:
-                    logging.warning(f"[GraspPlanner] ⚠️ 물체가 너무 큽니다 (Min Dim {min_dim:.1f}cm > {self.GRIPPER_MAX_WIDTH_CM}cm).")
-                    
-                    # [전략: 가장자리 잡기 Edge Grasp]
-                    # 물체가 너무 크면 중심을 잡을 수 없으므로, 오른쪽 가장자리를 공략
-                    # 실제로는 물체 형상을 알아야 하지만, 여기서는 Bbox 우측 끝에서 1.5cm 안쪽을 잡음
-                    # (회전이 가능하다면 짧은 축을 잡겠지만, 현재는 위치 이동만 가능하므로 X축 이동 시도)
-                    
-                    edge_offset = (est_w_cm / 2.0) - 1.5 # 중심에서 우측으로 이동
-                    grasp_pos_x_offset = edge_offset
-                    
-                    logging.info(f"[GraspPlanner] 💡 전략 변경: 가장자리 잡기 (Offset X +{edge_offset:.1f}cm)")
-                    
-                    gripper_percent = 60.0 # 입구/가장자리는 보통 얇으므로 적당히 벌림
-                    grasp_depth_offset = -2.0 # 가장자리는 깊지 않게
-                    
-                else:
-                    # 크기 적절함. 폭에 맞춰 그리퍼 조절
-                    target_width = min_dim + 2.0
-                    gripper_percent = (target_width / self.GRIPPER_MAX_WIDTH_CM) * 100.0
-                    gripper_percent = max(min(gripper_percent, 100.0), 40.0)
-                    
-                    if est_h_cm < est_w_cm and est_w_cm > self.GRIPPER_MAX_WIDTH_CM:
-                        logging.info("[GraspPlanner] 💡 90도 회전 필요 (세로로 잡아야 함) - *현재 회전 미지원*")
-
-            
-            # (2) 물체별 휴리스틱 보정
-            if "kite" in object_name.lower():
-                 # 얇은 물체는 바닥에 붙어있으므로 덜 내려가야 함
-                 grasp_depth_offset = -0.5 
-                 approach_offset_z = 8.0
-            
-            
         # 3. 좌표 계산
         # 접근 위치 (Pre-grasp): 물체 표면 + 접근 오프셋 + X축 오프셋(Edge)
         pre_grasp_pos = {
@@ -152,6 +173,77 @@ class GraspPlanner:
         
         return grasp_pose
     
+    def compute_grasp_poses_batch(self,
+                                  object_names: List[str],
+                                  object_positions: List[Dict[str, float]],
+                                  bboxes: List[Tuple[int, int]]) -> List[Dict[str, any]]:
+        """
+        여러 물체의 그립 자세를 한 번에 계산합니다. (탐험 등 장면 전체 평가용)
+        compute_grasp_pose와 같은 규칙을 NumPy 배열 연산으로 일괄 적용하며, 물체별 로그는 남기지 않습니다.
+        
+        Args:
+            object_names: 물체 이름 리스트 (N)
+            object_positions: 물체 중심 좌표 {x, y, z} 리스트 (N, cm)
+            bboxes: 바운딩 박스 크기 (w, h) 리스트 (N, 픽셀)
+            
+        Returns:
+            compute_grasp_pose와 같은 형식의 grasp_pose 딕셔너리 리스트 (N)
+        """
+        n = len(object_names)
+        if n == 0:
+            return []
+        
+        pos = np.array([(p["x"], p["y"], p["z"]) for p in object_positions], dtype=np.float64).reshape(n, 3)
+        bb = np.asarray(bboxes, dtype=np.float64).reshape(n, 2)
+        max_w = self.GRIPPER_MAX_WIDTH_CM
+        
+        # 1. 물체 크기 추정 (Pinhole, 거리 50cm 가정)
+        est = bb * (50.0 / self.FOCAL_LENGTH_PX)
+        min_dim = est.min(axis=1)
+        has_bbox = (bb[:, 0] > 0) & (bb[:, 1] > 0)
+        too_big = has_bbox & (min_dim > max_w)
+        fits = has_bbox & ~too_big
+        
+        # 2. 범용 로직
+        x_offset = np.where(too_big, est[:, 0] / 2.0 - 1.5, 0.0)
+        gripper = np.full(n, 100.0)
+        gripper = np.where(too_big, 60.0, gripper)
+        gripper = np.where(fits, np.clip((min_dim + 2.0) / max_w * 100.0, 40.0, 100.0), gripper)
+        depth = np.where(too_big, -2.0, -3.0)
+        approach = np.full(n, 10.0)
+        
+        # 얇은 물체(연) 보정
+        is_kite = np.array(["kite" in name.lower() for name in object_names])
+        depth = np.where(is_kite, -0.5, depth)
+        approach = np.where(is_kite, 8.0, approach)
+        
+        # 3. 메모리에 있는 물체는 저장된 파라미터 사용 (범용 로직 결과를 덮어씀)
+        mem_idx = self._memory_indices(object_names)
+        known = mem_idx >= 0
+        if known.any():
+            rows = mem_idx[known]
+            approach[known] = self._mem_offset_z[rows]
+            gripper[known] = self._mem_gripper[rows]
+            depth[known] = -3.0
+            x_offset[known] = 0.0
+        
+        # 4. 좌표 계산 (SoA) 후 마지막에만 딕셔너리로 변환
+        gx = pos[:, 0] + x_offset
+        pre_z = pos[:, 2] + approach
+        grasp_z = pos[:, 2] + depth
+        gripper = np.minimum(gripper, 100.0)
+        
+        gx_l, y_l, pre_z_l, grasp_z_l, gripper_l = gx.tolist(), pos[:, 1].tolist(), pre_z.tolist(), grasp_z.tolist(), gripper.tolist()
+        return [
+            {
+                "pre_grasp": {"x": gx_l[i], "y": y_l[i], "z": pre_z_l[i]},
+                "grasp": {"x": gx_l[i], "y": y_l[i], "z": grasp_z_l[i]},
+                "gripper_width": gripper_l[i],
+                "object_name": object_names[i]
+            }
+            for i in range(n)
+        ]
+    
     def update_grasp_memory(self, object_name: str, success: bool, params: Dict):
         """
         그립 성공/실패에 따라 메모리를 업데이트합니다 (학습)
@@ -164,6 +256,7 @@ class GraspPlanner:
         if success:
             logging.info(f"[GraspPlanner] {object_name} 그립 성공! 파라미터 저장.")
             self.grasp_memory[object_name] = params
+            self._sync_memory_arrays()
         else:
             logging.warning(f"[GraspPlanner] {object_name} 그립 실패. 파라미터 조정 필요.")
             # TODO: 실패 시 파라미터 자동 조정 로직
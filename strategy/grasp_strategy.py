@@ -4,7 +4,99 @@ from sensor.perception import VisionBridge
 from strategy.grasp_planner import grasp_planner
 from state.system_state import system_state
 from shared.state_broadcaster import broadcaster
+from brain.tools.vision_analyze import vision_analyze
 import logging
+import re
+import time
+import traceback
+from functools import lru_cache
+import numpy as np
+
+# 색상 키워드 (하나라도 포함되면 VLM으로 위치 식별)
+COLOR_KEYWORDS = frozenset({
+    "red", "yellow", "blue", "green", "white", "black", "purple", "pink",
+    "orange", "빨간", "빨강", "노란", "노랑", "파란", "파랑", "초록", 
+    "흰", "검은", "검정", "보라", "분홍"
+})
+# 키워드별 부분 문자열 검사를 정규식 한 번의 스캔으로 대체 (대소문자 무시, 패턴 순서 고정을 위해 정렬)
+_COLOR_RE = re.compile("|".join(map(re.escape, sorted(COLOR_KEYWORDS))), re.IGNORECASE)
+
+
+class _VLMQueryFailed(Exception):
+    """VLM 응답이 [SUCCESS]가 아닌 경우 (캐시에 남기지 않기 위해 사용)"""
+    def __init__(self, reply: str):
+        super().__init__(reply)
+        self.reply = reply
+
+
+@lru_cache(maxsize=128)
+def _vlm_query_success(query: str, det_sig: tuple) -> str:
+    """
+    VLM 질의 결과 캐시 (질의문 + 장면 서명 기준).
+    같은 장면에서 같은 물체를 다시 요청하면 VLM 왕복(수백 ms)을 생략합니다.
+    det_sig는 캐시 키로만 사용됩니다. (물체 구성/위치가 바뀌면 새 키가 되어 다시 질의)
+    [SUCCESS] 응답만 캐시합니다. (lru_cache는 예외를 캐시하지 않음)
+    """
+    reply = vision_analyze.invoke({"query": query})
+    if not reply.startswith("[SUCCESS]"):
+        raise _VLMQueryFailed(reply)
+    return reply
+
+
+def _cached_vlm_query(query: str, det_sig: tuple) -> str:
+    """VLM 질의 (성공 응답은 캐시에서, 서버 오류/영상 미획득 등 실패 응답은 캐시 없이 그대로 반환)"""
+    try:
+        return _vlm_query_success(query, det_sig)
+    except _VLMQueryFailed as e:
+        return e.reply
+
+
+def _detection_signature(detections: list) -> tuple:
+    """탐지 결과의 장면 서명: (이름, x, y) 를 cm 단위로 반올림하여 정렬한 튜플"""
+    return tuple(sorted(
+        (d['name'], round(d['position']['x']), round(d['position']['y']))
+        for d in detections
+    ))
+
+
+def _positions_array(detections: list) -> np.ndarray:
+    """탐지 결과의 좌표를 (N, 3) 배열로 모읍니다. (float64 - 동률 판정이 기존 Python 비교와 동일하도록)"""
+    return np.array(
+        [(d['position']['x'], d['position']['y'], d['position']['z']) for d in detections],
+        dtype=np.float64
+    )
+
+
+def _closest_index(pos: np.ndarray) -> int:
+    """원점에서 가장 가까운 물체의 인덱스 (동률이면 앞쪽 물체)"""
+    return int(np.argmin(np.einsum('ij,ij->i', pos, pos)))
+
+
+def clear_vlm_cache():
+    """VLM 질의 캐시를 비웁니다. (장면이 크게 바뀐 경우 등)"""
+    _vlm_query_success.cache_clear()
+
+
+# 마지막으로 본 장면의 물체 구성 (perception 스냅샷 비교용)
+_last_scene = {"perception": None, "labels": None}
+
+
+def _on_scene_update(snapshot: dict):
+    """[Broadcaster 구독] 탐지된 물체 구성이 바뀌면 VLM 캐시를 비웁니다."""
+    perception = snapshot.get("perception")
+    if perception is None or perception is _last_scene["perception"]:
+        return
+    _last_scene["perception"] = perception
+    labels = frozenset(
+        d.get("name") or d.get("label") for d in perception.get("detected_objects") or ()
+    )
+    if labels != _last_scene["labels"]:
+        if _last_scene["labels"] is not None:
+            clear_vlm_cache()
+        _last_scene["labels"] = labels
+
+
+broadcaster.subscribe(_on_scene_update)
 
 def execute_grasp(object_name: str) -> dict:
     """
@@ -53,7 +145,6 @@ def execute_grasp(object_name: str) -> dict:
         
         # 4. Intent를 system_state에 저장 및 broadcast
         # RobotController가 이를 구독하여 visual_servoing 실행
-        import time
         intent_data = {
             "action": "GRASP",
             "target_name": obj_name,
@@ -75,7 +166,6 @@ def execute_grasp(object_name: str) -> dict:
         
     except Exception as e:
         logging.error(f"[GraspStrategy] 오류: {e}")
-        import traceback
         logging.error(traceback.format_exc())
         return {
             "success": False,
@@ -98,80 +188,66 @@ def _identify_target_object(object_name: str, detections: list) -> dict:
         타겟 물체 딕셔너리 또는 None
     """
     # 색상 키워드 감지
-    color_keywords = [
-        "red", "yellow", "blue", "green", "white", "black", "purple", "pink",
-        "orange", "빨간", "빨강", "노란", "노랑", "파란", "파랑", "초록", 
-        "흰", "검은", "검정", "보라", "분홍"
-    ]
-    has_color = any(kw in object_name.lower() for kw in color_keywords)
+    has_color = _COLOR_RE.search(object_name) is not None
     
     target = None
+    # 소문자 이름을 탐지 결과마다 한 번만 계산 (이름 매칭 / VLM 응답 매칭에서 재사용)
+    search_name = object_name.lower()
+    lowered = [(d['name'].lower(), d) for d in detections]
     
     # 색상이 지정된 경우 VLM으로 정확한 위치 식별
     if has_color and len(detections) > 1:
         logging.info(f"[GraspStrategy] 색상/속성 감지 - VLM으로 '{object_name}' 식별 중...")
         
-        from brain.tools.vision_analyze import vision_analyze
-        
         query = f"화면에 보이는 물체들 중에서 '{object_name}'의 위치를 알려주세요. " \
                 f"왼쪽, 중앙, 오른쪽 중 어디에 있나요?"
         
-        vlm_result = vision_analyze.invoke({"query": query})
+        vlm_result = _cached_vlm_query(query, _detection_signature(detections))
         logging.info(f"[GraspStrategy] VLM 분석 결과: {vlm_result}")
         
         vlm_lower = vlm_result.lower()
         
-        # 위치 기반 필터링
+        # 위치 기반 필터링 (좌표를 (N, 3) 배열로 한 번만 모아 argmin/argmax로 선택)
+        pos = _positions_array(detections)
         if "왼쪽" in vlm_lower or "left" in vlm_lower:
-            target = min(detections, key=lambda d: d['position']['x'])
+            target = detections[int(np.argmin(pos[:, 0]))]
         elif "오른쪽" in vlm_lower or "right" in vlm_lower:
-            target = max(detections, key=lambda d: d['position']['x'])
+            target = detections[int(np.argmax(pos[:, 0]))]
         elif "중앙" in vlm_lower or "center" in vlm_lower or "가운데" in vlm_lower:
-            target = min(detections, key=lambda d: abs(d['position']['x']))
+            target = detections[int(np.argmin(np.abs(pos[:, 0])))]
         else:
             # VLM이 명확한 위치를 제공하지 못한 경우, 가장 가까운 물체 선택
-            target = min(detections, key=lambda d: 
-                        (d['position']['x']**2 + 
-                         d['position']['y']**2 + 
-                         d['position']['z']**2)**0.5)
+            target = detections[_closest_index(pos)]
             logging.warning(f"[GraspStrategy] VLM 위치 불명확 - 가장 가까운 물체 선택")
     
     # 일반 객체 선택
     if not target:
         if object_name == "물체":
             # 가장 가까운 물체
-            target = min(detections, key=lambda d: 
-                        (d['position']['x']**2 + 
-                         d['position']['y']**2 + 
-                         d['position']['z']**2)**0.5)
+            target = detections[_closest_index(_positions_array(detections))]
         else:
-            # 이름 매칭 (부분 일치)
-            for det in detections[0]:
-                det_name = det['name'].lower()
-                search_name = object_name.lower()
-                
-                # "yellow kite" → "kite" 추출하여 매칭
-                if search_name in det_name or det_name in search_name:
-                    target = det
-                    break
+            # 이름 매칭 (부분 일치) - "yellow kite" → "kite" 추출하여 매칭
+            target = next(
+                (det for det_name, det in lowered if search_name in det_name or det_name in search_name),
+                None
+            )
     
     # VLM 의미적 매칭 (이름 불일치 시)
     if not target and detections:
         logging.info(f"[GraspStrategy] '{object_name}' 이름 일치 실패. VLM에게 의미적 매칭 요청...")
         
-        from brain.tools.vision_analyze import vision_analyze
-        
-        detected_names = [d['name'] for d in detections[0]]
+        detected_names = [d['name'] for d in detections]
         query = f"나 지금 '{object_name}'을(를) 잡고 싶은데, 내 눈에는 {detected_names}만 보여. " \
                 f"이 목록 중에서 '{object_name}'일 가능성이 가장 높은 것은 뭐야? " \
                 f"목록에 있는 정확한 이름을 반환해줘. 매칭되는게 없으면 'NONE'이라고 답해줘."
         
-        vlm_response = vision_analyze.invoke({"query": query})
+        vlm_response = _cached_vlm_query(query, _detection_signature(detections))
         logging.info(f"[GraspStrategy] VLM Semantic Matching result: {vlm_response}")
         
         # VLM 응답과 일치하는 YOLO 물체 찾기
-        for det in detections:
-            if det['name'].lower() in vlm_response.lower():
+        vlm_response_lower = vlm_response.lower()
+        for det_name, det in lowered:
+            if det_name in vlm_response_lower:
                 target = det
                 logging.info(f"[GraspStrategy] VLM이 '{det['name']}'을(를) '{object_name}'(으)로 식별했습니다.")
                 break
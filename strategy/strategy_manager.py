@@ -1,7 +1,13 @@
 # strategy/strategy_manager.py
 
+import re
 import threading
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+
+# 전략별 차단 키워드 (대소문자 무시, 한 번의 search로 검사)
+_RISK_BLOCK_RE = re.compile("공격|attack|fight", re.IGNORECASE)
+_EXPLORE_BLOCK_RE = re.compile("탐험|explore|search", re.IGNORECASE)
 
 class StrategyManager:
     """
@@ -20,53 +26,79 @@ class StrategyManager:
         return cls._instance
 
     def _init(self):
-        # 기본 전략 설정
-        self.context = {
+        # 기본 전략 설정 (Copy-on-Write: 변경 시 새 dict를 만들어 읽기 전용 뷰로 통째로 교체)
+        # 참조 교체는 원자적이므로 읽는 쪽은 락 없이 self._ctx 한 번만 읽으면 됩니다.
+        self._ctx: Mapping[str, Any] = MappingProxyType({
             "allow_explore": False,     # 탐험 모드 활성화 여부
             "risk_level": "LOW",        # 위험 감수 수준 (LOW, MEDIUM, HIGH)
             "persona": "CAUTIOUS"       # 페르소나 (CAUTIOUS, AGGRESSIVE, FRIENDLY)
-        }
+        })
+
+    @property
+    def context(self) -> Mapping[str, Any]:
+        """현재 전략적 맥락 (읽기 전용 뷰)"""
+        return self._ctx
+
+    def _publish(self, **changes):
+        """변경 사항을 반영한 새 컨텍스트를 발행합니다. (쓰기끼리는 락으로 직렬화)"""
+        with self._lock:
+            new_ctx = dict(self._ctx)
+            new_ctx.update(changes)
+            self._ctx = MappingProxyType(new_ctx)
+            return self._ctx
 
     def set_context(self, allow_explore: bool = None, risk_level: str = None, persona: str = None):
         """본체의 전략적 맥락을 업데이트합니다."""
-        with self._lock:
-            if allow_explore is not None:
-                self.context["allow_explore"] = allow_explore
-            if risk_level is not None:
-                self.context["risk_level"] = risk_level
-            if persona is not None:
-                self.context["persona"] = persona
+        changes = {}
+        if allow_explore is not None:
+            changes["allow_explore"] = allow_explore
+        if risk_level is not None:
+            changes["risk_level"] = risk_level
+        if persona is not None:
+            changes["persona"] = persona
+        ctx = self._publish(**changes)
         
-        print(f"[Strategy] 컨텍스트 업데이트: {self.context}")
+        print(f"[Strategy] 컨텍스트 업데이트: {dict(ctx)}")
 
     def set_mode(self, mode: str):
         """사고 방식(Operation Mode)을 전환합니다."""
         from shared.ui_dto import OperationMode
-        self.context["op_mode"] = mode
+        self._publish(op_mode=mode)
         print(f"[Strategy] 사고 모드 전환 완료: {mode}")
 
     def get_context(self) -> Dict[str, Any]:
-        """현재 적용 중인 전략적 맥락을 반환합니다."""
-        with self._lock:
-            return self.context.copy()
+        """현재 적용 중인 전략적 맥락의 복사본을 반환합니다. (수정 가능한 dict가 필요할 때)"""
+        return dict(self._ctx)
+
+    def get_context_view(self) -> Mapping[str, Any]:
+        """
+        현재 전략적 맥락의 읽기 전용 스냅샷을 반환합니다. (UI 스냅샷 등 매 프레임 조회용)
+        발행된 뷰 자체가 불변이므로 락과 복사 없이 그대로 돌려줍니다.
+        """
+        return self._ctx
 
     def filter_action(self, intent: str) -> bool:
         """
         [핵심] 브레인의 의도(Intent)가 현재 전략에 부합하는지 필터링합니다.
         위험 수위나 탐험 설정에 따라 특정 행동을 차단하거나 승인합니다.
         """
-        context = self.get_context()
-        intent_low = intent.lower()
+        context = self._ctx # 락 없이 현재 발행된 스냅샷을 한 번만 읽음
+        risk_low = context["risk_level"] == "LOW"
+        allow_explore = context["allow_explore"]
+
+        # 차단 조건이 하나도 없으면 문자열 검사 없이 승인
+        if not risk_low and allow_explore:
+            return True
 
         # 예: 위험 수위가 LOW인데 위험한 행동(전투 등)을 하려 할 경우 필터링
-        if context["risk_level"] == "LOW":
-            if any(word in intent_low for word in ["공격", "attack", "fight"]):
+        if risk_low:
+            if _RISK_BLOCK_RE.search(intent):
                 print(f"[Strategy] 차단됨: 위험 수위(LOW)에서 위험 행동 감지 -> {intent}")
                 return False
 
         # 예: 탐험이 금지되었는데 새로운 지역으로 가려 할 경우
-        if not context["allow_explore"]:
-            if any(word in intent_low for word in ["탐험", "explore", "search"]):
+        if not allow_explore:
+            if _EXPLORE_BLOCK_RE.search(intent):
                 print(f"[Strategy] 차단됨: 탐험 비활성화 상태에서 탐험 시도 -> {intent}")
                 return False
 
@@ -4,12 +4,124 @@ import logging
 import time
 import threading
 import math
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Callable, Optional
 from enum import Enum, auto
+from dataclasses import dataclass
 
 from state.system_state import system_state
-from shared.state_broadcaster import broadcaster
+from shared.state_broadcaster import broadcaster, TOPIC_AGENT_THOUGHT
 from expression.emotion_controller import emotion_controller
+from . import _servo_njit
+
+# 주기 대기 시 마지막 구간은 sleep 대신 perf_counter 스핀으로 채웁니다. (OS sleep 해상도/지연 보정)
+_SPIN_MARGIN = 0.002
+
+def _sleep_until(deadline: float):
+    """perf_counter 기준 절대 시각까지 대기 (sleep 후 마지막 ~2ms는 busy-spin)"""
+    remaining = deadline - time.perf_counter()
+    if remaining > _SPIN_MARGIN + 0.001:
+        time.sleep(remaining - _SPIN_MARGIN)
+    while time.perf_counter() < deadline:
+        pass
+
+# [Real-Time] 서보 제어 스레드 우선순위 (Linux 전용, 권한이 없으면 nice 값으로 대체)
+_RT_PRIORITY = 20
+_RT_NICE = -10
+
+def _promote_rt():
+    """
+    현재 스레드를 실시간 스케줄링(SCHED_FIFO)으로 승격하고, 가능하면 CPU 0이 아닌 코어에 고정합니다.
+    Returns: 복원용 이전 설정 (affinity, policy, param, nice 조정량)
+    """
+    if not hasattr(os, "sched_setscheduler"):
+        return None # Linux 외 플랫폼
+    
+    prev_affinity = os.sched_getaffinity(0)
+    prev_policy = os.sched_getscheduler(0)
+    prev_param = os.sched_getparam(0)
+    nice_delta = 0
+    
+    # 1. 코어 고정 (허용된 코어가 여러 개면 마지막 코어 사용 - 보통 인터럽트/메인 스레드와 분리됨)
+    if len(prev_affinity) > 1:
+        try:
+            os.sched_setaffinity(0, {max(prev_affinity)})
+        except OSError as e:
+            logging.debug(f"[VisualServo] 코어 고정 실패: {e}")
+    
+    # 2. 실시간 우선순위 (CAP_SYS_NICE 필요) → 실패 시 nice 값 상향
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(_RT_PRIORITY))
+        logging.info(f"[VisualServo] 제어 스레드 SCHED_FIFO({_RT_PRIORITY}) 승격")
+    except (PermissionError, OSError):
+        try:
+            os.nice(_RT_NICE)
+            nice_delta = _RT_NICE
+        except OSError:
+            logging.debug("[VisualServo] 우선순위 승격 권한 없음 - 기본 스케줄링으로 실행")
+    
+    return prev_affinity, prev_policy, prev_param, nice_delta
+
+def _demote_rt(prev):
+    """_promote_rt 이전 설정으로 복원합니다."""
+    if prev is None:
+        return
+    prev_affinity, prev_policy, prev_param, nice_delta = prev
+    try:
+        os.sched_setscheduler(0, prev_policy, prev_param)
+        if nice_delta:
+            os.nice(-nice_delta) # 우선순위를 낮추는 방향이므로 권한 불필요
+        os.sched_setaffinity(0, prev_affinity)
+    except OSError as e:
+        logging.debug(f"[VisualServo] 스케줄링 복원 실패: {e}")
+
+class _LatestCommandMailbox:
+    """
+    제어 루프 → I/O 워커 단일 슬롯 명령함 (Latest-Wins)
+    워커가 이전 명령을 처리하는 동안 쌓인 명령은 가장 최신 것 하나만 남깁니다.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = None
+        self._closed = False
+
+    def post(self, cmd: tuple):
+        with self._cond:
+            self._pending = cmd # 아직 전송되지 않은 이전 명령은 덮어씀
+            self._cond.notify()
+
+    def close(self):
+        """워커 종료 신호 (미전송 명령은 폐기)"""
+        with self._cond:
+            self._closed = True
+            self._pending = None
+            self._cond.notify()
+
+    def take(self) -> Optional[tuple]:
+        """다음 명령을 기다려 꺼냅니다. 닫혔으면 None."""
+        with self._cond:
+            while self._pending is None and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            cmd, self._pending = self._pending, None
+            return cmd
+
+# 상태 핸들러가 상태 머신 루프 종료를 요청할 때 반환하는 표식
+_BREAK = object()
+
+@dataclass
+class _ServoRun:
+    """execute_approach_and_grasp 1회 실행 동안 상태 핸들러들이 공유하는 컨텍스트"""
+    target_label: str
+    label_lc: str
+    get_ee_position: Callable
+    move_robot: Callable
+    move_robot_batch: Callable
+    move_gripper: Callable
+    success: bool = False
 
 class ServoState(Enum):
     """비주얼 서보잉 상태"""
@@ -42,6 +154,20 @@ class VisualServoing:
         self.current_state = ServoState.IDLE
         self.cancel_token = threading.Event()
         self.is_running = False
+        self._state_event = threading.Event() # 상태 전이 시 set - 상태 머신 루프가 대기 없이 다음 상태로 진행
+        
+        # 상태별 핸들러 테이블 (if/elif 연쇄 대신 dict 조회 한 번으로 분기)
+        self._handlers = {
+            ServoState.IDLE: self._h_idle,
+            ServoState.DETECT: self._h_detect,
+            ServoState.VISUAL_SERVO: self._h_visual_servo,
+            ServoState.AUTO_FOCUS: self._h_auto_focus,
+            ServoState.VLM_CHECK: self._h_vlm_check,
+            ServoState.SCANNING: self._h_scanning,
+            ServoState.GRASP: self._h_grasp,
+            ServoState.SUCCESS: self._h_success,
+            ServoState.FAIL: self._h_fail,
+        }
         
         # 제어 파라미터 (정밀도 우선)
         self.LOOP_HZ = 10           # 루프 주파수 (Hz) - 안정성 우선
@@ -50,18 +176,130 @@ class VisualServoing:
         self.Z_THRESHOLD = 0.5      # Z 도달 판정 (cm) - 정밀 제어
         self.APPROACH_HEIGHT = 20.0  # 접근 높이 오프셋 (cm) - 시야 확보 위해 상향 조정 (8.0 -> 20.0)
         self.GRASP_DEPTH = 0.0      # 파지 깊이 오프셋 (cm) - Vision이 정확한 중심을 주므로 오프셋 0
+        
+        # [I/O Worker] 서보 루프의 이동 명령 전송(도착 대기 포함)을 전담하는 단일 스레드
+        # 제어 루프는 명령을 명령함에 넣고 바로 다음 틱의 인지/계산을 진행합니다.
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="servo-io")
+        
+        # 실행 중 상태 (매 작업 종료 시 초기화, _scan_step은 작업 간 유지)
+        self._detect_retry = 0          # DETECT 재시도 횟수
+        self._loop_retry_start = None   # 서보 루프 물체 소실 시작 시각 (perf_counter)
+        self._last_sent_cmd = None      # 마지막 전송 명령 (x, y, z, speed)
+        self._scan_step = 0             # 능동 탐색 방향 (0:+X, 1:-X, 2:+Y, 3:-Y)
+        
+        # [Latency Compensation] EE 위치 읽기 → 명령 실제 전송까지의 지연 (EWMA, 작업 간 유지)
+        # 서보 루프는 이 시간만큼 EE/목표를 외삽한 위치로 제어 명령을 계산합니다.
+        self.MAX_LEAD = 0.3             # 외삽 최대 시간 (s)
+        self.TARGET_MOTION_MIN = 1.0    # 목표 속도가 이 값(cm/s) 이상일 때만 이동 물체로 보고 외삽
+        self._latency_ema = 1.0 / self.LOOP_HZ
+        
+        # 목표 탐색 캐시: (perception frame_id, 소문자 라벨, 결과) - 같은 탐지 결과면 재탐색 생략
+        self._target_cache = (None, None, None)
+        
+        # [Gripper Watch] 그리퍼 상태는 폴링 대신 갱신 콜백으로 감시합니다.
+        # 값이 GRIPPER_STABLE_EPS 이상 바뀐 마지막 시각을 기록하고, 대기 중인 GRASP 단계를 깨웁니다.
+        self.GRIPPER_STABLE_EPS = 0.0005
+        self._gripper_cv = threading.Condition()
+        self._gripper_ref = 0.0
+        self._gripper_changed_at = time.perf_counter()
+        system_state.robot.add_gripper_listener(self._on_gripper_update)
+        
+        # [EE Settle] 이동 후 고정 sleep 대신 EE 속도가 임계값 아래로 연속 N회 떨어지면 안정으로 판단
+        self.EE_SETTLE_SPEED = 0.2      # cm/s
+        self.EE_SETTLE_SAMPLES = 3      # 연속 샘플 수
+        # 시뮬레이터는 state 이벤트를 값이 바뀔 때만, 최대 EE_STATE_PERIOD마다 한 번 보냅니다.
+        # 샘플 간격이 이보다 짧으면 같은 패킷을 연속으로 읽어 움직이는 중에도 '정지'로 오판하므로 더 길게 잡습니다.
+        self.EE_STATE_PERIOD = 0.05     # state 최소 발행 주기 (s)
+        self.EE_SETTLE_INTERVAL = 0.06  # 샘플 간격 (s, EE_STATE_PERIOD 이상)
     
     def stop(self):
         """외부에서 호출 가능한 긴급 정지"""
         logging.warning("[VisualServoing] 🛑 긴급 정지 요청!")
         self.cancel_token.set()
+        self._state_event.set()
+        with self._gripper_cv:
+            self._gripper_cv.notify_all() # 그리퍼 대기 중이면 즉시 깨움
+    
+    def _on_gripper_update(self, value: float):
+        """[Callback] system_state.robot.gripper_state 갱신 시 호출 (Perception 스레드)"""
+        if abs(value - self._gripper_ref) >= self.GRIPPER_STABLE_EPS:
+            with self._gripper_cv:
+                self._gripper_ref = value
+                self._gripper_changed_at = time.perf_counter()
+                self._gripper_cv.notify_all()
+    
+    def _wait_gripper_stable(self, quiet: float, timeout: float) -> bool:
+        """
+        그리퍼 값이 quiet초 동안 변하지 않을 때까지 대기합니다. (변화 시에만 깨어남)
+        Returns: 안정 감지 여부 (타임아웃/취소 시 False)
+        """
+        deadline = time.perf_counter() + timeout
+        with self._gripper_cv:
+            self._gripper_changed_at = time.perf_counter() # 대기 시작 시점부터 측정
+            while not self.cancel_token.is_set():
+                now = time.perf_counter()
+                still_for = now - self._gripper_changed_at
+                if still_for >= quiet:
+                    return True
+                if now >= deadline:
+                    return False
+                self._gripper_cv.wait(min(quiet - still_for, deadline - now))
+        return False
+    
+    def _wait_ee_settled(self, get_ee_position: Callable, timeout: float) -> bool:
+        """
+        EE 속도(|Δpos|/Δt)가 EE_SETTLE_SPEED 미만인 샘플이 EE_SETTLE_SAMPLES회 연속될 때까지 대기합니다.
+        (샘플 간격이 state 발행 주기보다 길므로 위치가 그대로면 실제로 멈춘 것입니다)
+        Returns: 안정 감지 여부 (타임아웃/취소 시 False)
+        """
+        deadline = time.perf_counter() + timeout
+        prev = get_ee_position()
+        prev_t = time.perf_counter()
+        calm = 0
+        while not self.cancel_token.wait(self.EE_SETTLE_INTERVAL):
+            cur = get_ee_position()
+            now = time.perf_counter()
+            dist = math.hypot(cur['x'] - prev['x'], cur['y'] - prev['y'], cur['z'] - prev['z'])
+            calm = calm + 1 if dist < self.EE_SETTLE_SPEED * (now - prev_t) else 0
+            if calm >= self.EE_SETTLE_SAMPLES:
+                return True
+            if now >= deadline:
+                return False
+            prev, prev_t = cur, now
+        return False
     
-    def find_target_object(self, target_label: str) -> Optional[Dict]:
-        """시스템 상태에서 목표 물체 탐지"""
-        objects = system_state.perception_data.get("detected_objects", [])
-        candidates = [obj for obj in objects 
-                     if target_label.lower() in obj["name"].lower()]
-        return candidates[0] if candidates else None
+    def _drain_commands(self, mailbox: _LatestCommandMailbox, move_robot: Callable):
+        """[I/O Worker] 명령함이 닫힐 때까지 최신 이동 명령을 순서대로 실행합니다."""
+        while True:
+            cmd = mailbox.take()
+            if cmd is None or self.cancel_token.is_set():
+                return
+            x, y, z, speed, t_read = cmd
+            self._latency_ema += 0.2 * ((time.perf_counter() - t_read) - self._latency_ema)
+            try:
+                move_robot(x, y, z, speed)
+            except Exception as e:
+                logging.error(f"[VisualServo] 이동 명령 전송 실패: {e}")
+    
+    def find_target_object(self, target_label: str, label_lc: Optional[str] = None) -> Optional[Dict]:
+        """
+        시스템 상태에서 목표 물체 탐지
+        label_lc: 미리 소문자로 바꾼 라벨 (루프에서 반복 호출 시 전달)
+        """
+        perception = system_state.perception_data
+        frame_id = perception.get("frame_id")
+        if label_lc is None:
+            label_lc = target_label.lower()
+        
+        # 탐지 결과가 갱신되지 않았으면 직전 결과 재사용
+        cached_frame, cached_label, cached_target = self._target_cache
+        if frame_id is not None and frame_id == cached_frame and label_lc == cached_label:
+            return cached_target
+        
+        objects = perception.get("detected_objects", [])
+        target = next((obj for obj in objects if label_lc in obj["name"].lower()), None)
+        self._target_cache = (frame_id, label_lc, target)
+        return target
     
     def execute_approach_and_grasp(self,
                              target_label: str,
@@ -85,6 +323,7 @@ class VisualServoing:
         get_ee_position = robot_controller.robot_driver.get_current_pose
         move_robot_raw = robot_controller.robot_driver.move_to_xyz
         move_gripper = robot_controller.robot_driver.move_gripper
+        move_robot_batch = robot_controller.robot_driver.move_robot_batch # (x, y, z, speed, dwell_ms) 시퀀스
         
         # move_robot 래퍼 (기존 시그니처 호환용)
         # RobotController의 move_to_xyz는 (x,y,z, speed, wait) 등을 받음
@@ -105,7 +344,7 @@ class VisualServoing:
             self.current_state = ServoState.IDLE
         
         logging.info(f"[VisualServoing] '{target_label}' 접근 및 파지 시작 (Lift 제외)")
-        broadcaster.publish("agent_thought", 
+        broadcaster.publish(TOPIC_AGENT_THOUGHT, 
                           f"[VisualServoing] '{target_label}' 접근 및 파지 시작")
         
         # [Emotion] 시작 시 집중 모드
@@ -118,182 +357,23 @@ class VisualServoing:
         
         success = False
         self.GRASP_DEPTH = grasp_offset_z
+        label_lc = target_label.lower()
+        run = _ServoRun(target_label, label_lc, get_ee_position, move_robot, move_robot_batch, move_gripper)
+        
+        # 상태 머신(서보 루프 포함)이 도는 동안 이 스레드만 실시간 우선순위로 승격 (종료 시 복원)
+        rt_prev = _promote_rt()
         
         try:
-            # State Machine Loop
+            # State Machine Loop (상태별 핸들러 테이블로 분기, _BREAK 반환 시 종료)
+            handlers = self._handlers
             while not self.cancel_token.is_set():
-                
-                if self.current_state == ServoState.IDLE:
-                    self._transition(ServoState.DETECT)
-                
-                elif self.current_state == ServoState.DETECT:
-                    target = self.find_target_object(target_label)
-                    if target:
-                        logging.info(f"[DETECT] 물체 발견: {target['name']} at {target['position']}")
-                        broadcaster.publish("agent_thought", 
-                                          f"[VisualServoing] '{target['name']}' 발견")
-                        
-                        # [Emotion] 발견의 기쁨
-                        emotion_controller.broadcast_emotion_event("happy", weight=0.6, duration=2.0)
-                        
-                        self._transition(ServoState.VISUAL_SERVO)
-                    else:
-                        logging.warning(f"[DETECT] '{target_label}' 미발견, 재시도...")
-                        if self.cancel_token.wait(1.0): break
-                        # 3초 동안 3회 재시도
-                        retry_count = getattr(self, '_detect_retry', 0)
-                        if retry_count >= 3:
-                            logging.error(f"[DETECT] '{target_label}' 탐지 실패 (3회)")
-                            # [Emotion] 못 찾아서 혼란/실망
-                            emotion_controller.broadcast_emotion_event("confused", weight=0.6, duration=3.0)
-                            self._transition(ServoState.FAIL)
-                        else:
-                            self._detect_retry = retry_count + 1
-                
-                elif self.current_state == ServoState.VISUAL_SERVO:
-                    # 연속 제어 피드백 루프 (접근 단계)
-                    if self._visual_servo_loop(target_label, get_ee_position, move_robot):
-                        logging.info("[VisualServo] 1차 접근 완료. 정밀 인지 단계로 진입합니다.")
-                        # [Emotion] 접근 완료, 정밀 작업 집중
-                        emotion_controller.broadcast_emotion_event("focused", weight=0.8, duration=3.0)
-                        
-                        # 바로 GRASP하지 않고, Auto-Focus -> VLM Check 로 진입
-                        self._transition(ServoState.AUTO_FOCUS)
-                    else:
-                        self._transition(ServoState.FAIL)
-                        
-                elif self.current_state == ServoState.AUTO_FOCUS:
-                    # [Step 1] 광학적 초점 최적화 (Hill Climbing)
-                    if self._execute_auto_focus(get_ee_position, move_robot):
-                        self._transition(ServoState.VLM_CHECK)
-                    else:
-                        logging.warning("[AUTO_FOCUS] 초점 확보 실패 (또는 범위 초과). 그대로 진행합니다.")
-                        self._transition(ServoState.VLM_CHECK)
-                        
-                elif self.current_state == ServoState.VLM_CHECK:
-                    # [Step 2] VLM 검증 ("확실한가?")
-                    # 로봇 정지 후 이미지 분석 요청
-                    check_result = self._execute_vlm_check()
-                    
-                    if check_result == "CONFIDENT":
-                        logging.info("[VLM] 인지 확신! 파지 단계로 이동.")
-                        self._transition(ServoState.GRASP)
-                    elif check_result == "UNCERTAIN":
-                        logging.warning("[VLM] 인지 불확실. 능동 탐색(Scanning) 시작.")
-                        # [Emotion] 궁금함/고민
-                        emotion_controller.broadcast_emotion_event("thinking", weight=0.5, duration=2.0)
-                        self._transition(ServoState.SCANNING)
-                    else:
-                        logging.error("[VLM] 판단 불가. 실패 처리.")
-                        self._transition(ServoState.FAIL)
-                        
-                elif self.current_state == ServoState.SCANNING:
-                    # [Step 3] 능동 탐색 (그리퍼 회전)
-                    # 현재 각도에서 +/- 30도 회전하며 후보지 탐색
-                    if self._execute_active_scanning(get_ee_position, move_robot):
-                        # 자세 변경 후 다시 초점 -> VLM 체크
-                        self._transition(ServoState.AUTO_FOCUS)
-                    else:
-                        logging.error("[SCANNING] 모든 탐색 시도 실패.")
-                        self._transition(ServoState.FAIL)
-                        
-                elif self.current_state == ServoState.GRASP:
-                    logging.info("[GRASP] 그리퍼 닫기")
-                    broadcaster.publish("agent_thought", 
-                                      "[VisualServoing] 그리퍼로 파지 중...")
-                    
-                    # 그리퍼 닫기 명령 전송
-                    move_gripper(0)
-                    logging.info("[GRASP] 그리퍼 닫는 중... (3.5초 대기)")
-                    
-                    # [Improvement] 동적 그리퍼 상태 모니터링
-                    # 1. 움직임 시작 대기 (Latency 고려)
-                    start_wait_move = time.time()
-                    move_started = False
-                    while time.time() - start_wait_move < 1.0:
-                        if system_state.robot.gripper_state < 0.055: # 0.06(Open)에서 조금이라도 줄어들면 시작으로 간주
-                            move_started = True
-                            break
-                        time.sleep(0.05)
-                        
-                    if not move_started:
-                        logging.warning("[GRASP] 그리퍼가 움직이지 않습니다. (명령 유실 또는 고장)")
-
-                    # 2. 완료(Stability) 감지
-                    last_gripper_val = system_state.robot.gripper_state
-                    stable_count = 0
-                    
-                    start_grasp_time = time.time()
-                    
-                    logging.info("[GRASP] 그리퍼 상태 모니터링 시작...")
-                    
-                    while time.time() - start_grasp_time < 3.0:
-                        if self.cancel_token.is_set():
-                            break
-                            
-                        current_val = system_state.robot.gripper_state
-                        
-                        # 변화량이 미미하면 stable 카운트 증가
-                        if abs(current_val - last_gripper_val) < 0.0005:
-                            stable_count += 1
-                        else:
-                            stable_count = 0 # 다시 움직이면 리셋
-                            
-                        last_gripper_val = current_val
-                        
-                        # 0.5초(10틱) 이상 변화 없으면 동작 완료로 판단
-                        if stable_count >= 10:
-                            logging.info(f"[GRASP] 그리퍼 동작 완료 감지 (Stable at {current_val:.4f})")
-                            break
-                            
-                        time.sleep(0.05)
-                        
-                    if self.cancel_token.is_set():
-                        logging.warning("[GRASP] 취소됨")
-                        break
-                    
-                    # [Grasp Verification] 그리퍼 상태 확인
-                    # system_state.robot.gripper_state는 두 핑거 각도의 합(또는 너비)입니다.
-                    # 0.0에 가까우면(완전히 닫힘) 공기를 잡은 것이고, 
-                    # 0.0보다 크면(중간에 멈춤) 물체를 잡은 것입니다.
-                    current_gripper = system_state.robot.gripper_state
-                    logging.info(f"[GRASP] 그리퍼 최종 상태: {current_gripper:.4f}")
-                    
-                    if current_gripper > 0.005 and current_gripper < 0.058: # 완전히 닫히지도, 완전히 열리지도 않음 (=물체 파지)
-                        logging.info("[GRASP] ✅ 물체 파지 확인 (Grasp Success)")
-                        broadcaster.publish("agent_thought", f"[VisualServoing] 물체 파지 성공 (Width: {current_gripper:.3f})")
-                        
-                        success = True
-                    elif current_gripper >= 0.058:
-                         logging.warning("[GRASP] ❌ 그리퍼가 닫히지 않았습니다 (Still Open)")
-                         broadcaster.publish("agent_thought", "[VisualServoing] 파지 실패 (그리퍼 동작 안함)")
-                         success = False
-                         self._transition(ServoState.FAIL)
-                         break
-                    else:
-                        logging.warning("[GRASP] ❌ 빈손 감지 (Grasp Failed - Fully Closed)")
-                        broadcaster.publish("agent_thought", "[VisualServoing] 파지 실패 (빈손)")
-                        
-                        success = False
-                        self._transition(ServoState.FAIL)
-                        break
-
-                    logging.info("[GRASP] 제어권을 반환합니다.")
+                if handlers[self.current_state](run) is _BREAK:
                     break
                 
-                # LIFT, VERIFY 단계 제거됨
-                
-                elif self.current_state == ServoState.SUCCESS:
-                    broadcaster.publish("agent_thought", 
-                                      f"[VisualServoing] '{target_label}' 파지 성공! ✅")
-                    break
-                
-                elif self.current_state == ServoState.FAIL:
-                    broadcaster.publish("agent_thought", 
-                                      "[VisualServoing] 파지 실패 ❌")
-                    break
-                
-                time.sleep(0.01)  # State Machine 루프 주기
+                # State Machine 루프 주기 (방금 상태가 바뀌었으면 대기 없이 바로 진행)
+                self._state_event.wait(0.01)
+                self._state_event.clear()
+            success = run.success
         
         except Exception as e:
             logging.error(f"[VisualServoing] 예외 발생: {e}")
@@ -302,16 +382,170 @@ class VisualServoing:
             success = False
         
         finally:
+            _demote_rt(rt_prev)
             self.is_running = False
+            self._detect_retry = 0
+            self._loop_retry_start = None
+            self._last_sent_cmd = None
             # [Fix] 성공적인 종료 후에는 취소 토큰이 설정되어도 취소로 간주하지 않음
             if self.cancel_token.is_set() and not success:
                 logging.warning("[VisualServoing] 작업이 취소되었습니다")
-                broadcaster.publish("agent_thought", 
+                broadcaster.publish(TOPIC_AGENT_THOUGHT, 
                                   "[VisualServoing] 작업 취소됨")
                 success = False
         
         return success
     
+    def _h_idle(self, run: "_ServoRun"):
+        """시작 → 탐지"""
+        self._transition(ServoState.DETECT)
+
+    def _h_detect(self, run: "_ServoRun"):
+        """목표 물체 탐지 (1초 간격 최대 3회 재시도)"""
+        target = self.find_target_object(run.target_label, run.label_lc)
+        if target:
+            logging.info(f"[DETECT] 물체 발견: {target['name']} at {target['position']}")
+            broadcaster.publish(TOPIC_AGENT_THOUGHT, 
+                              f"[VisualServoing] '{target['name']}' 발견")
+            
+            # [Emotion] 발견의 기쁨
+            emotion_controller.broadcast_emotion_event("happy", weight=0.6, duration=2.0)
+            
+            self._transition(ServoState.VISUAL_SERVO)
+        else:
+            logging.warning(f"[DETECT] '{run.target_label}' 미발견, 재시도...")
+            if self.cancel_token.wait(1.0): return _BREAK
+            # 3초 동안 3회 재시도
+            retry_count = self._detect_retry
+            if retry_count >= 3:
+                logging.error(f"[DETECT] '{run.target_label}' 탐지 실패 (3회)")
+                # [Emotion] 못 찾아서 혼란/실망
+                emotion_controller.broadcast_emotion_event("confused", weight=0.6, duration=3.0)
+                self._transition(ServoState.FAIL)
+            else:
+                self._detect_retry = retry_count + 1
+
+    def _h_visual_servo(self, run: "_ServoRun"):
+        """연속 제어 피드백 루프 (접근 단계)"""
+        if self._visual_servo_loop(run.target_label, run.get_ee_position, run.move_robot):
+            logging.info("[VisualServo] 1차 접근 완료. 정밀 인지 단계로 진입합니다.")
+            # [Emotion] 접근 완료, 정밀 작업 집중
+            emotion_controller.broadcast_emotion_event("focused", weight=0.8, duration=3.0)
+            
+            # 바로 GRASP하지 않고, Auto-Focus -> VLM Check 로 진입
+            self._transition(ServoState.AUTO_FOCUS)
+        else:
+            self._transition(ServoState.FAIL)
+
+    def _h_auto_focus(self, run: "_ServoRun"):
+        """[Step 1] 광학적 초점 최적화 (3점 포물선 피팅)"""
+        if self._execute_auto_focus(run.get_ee_position, run.move_robot, run.move_robot_batch):
+            self._transition(ServoState.VLM_CHECK)
+        else:
+            logging.warning("[AUTO_FOCUS] 초점 확보 실패 (또는 범위 초과). 그대로 진행합니다.")
+            self._transition(ServoState.VLM_CHECK)
+
+    def _h_vlm_check(self, run: "_ServoRun"):
+        """[Step 2] VLM 검증 ("확실한가?")"""
+        # 로봇 정지 후 이미지 분석 요청
+        check_result = self._execute_vlm_check()
+        
+        if check_result == "CONFIDENT":
+            logging.info("[VLM] 인지 확신! 파지 단계로 이동.")
+            self._transition(ServoState.GRASP)
+        elif check_result == "UNCERTAIN":
+            logging.warning("[VLM] 인지 불확실. 능동 탐색(Scanning) 시작.")
+            # [Emotion] 궁금함/고민
+            emotion_controller.broadcast_emotion_event("thinking", weight=0.5, duration=2.0)
+            self._transition(ServoState.SCANNING)
+        else:
+            logging.error("[VLM] 판단 불가. 실패 처리.")
+            self._transition(ServoState.FAIL)
+
+    def _h_scanning(self, run: "_ServoRun"):
+        """[Step 3] 능동 탐색 (그리퍼 회전/이동)"""
+        # 현재 각도에서 +/- 30도 회전하며 후보지 탐색
+        if self._execute_active_scanning(run.get_ee_position, run.move_robot):
+            # 자세 변경 후 다시 초점 -> VLM 체크
+            self._transition(ServoState.AUTO_FOCUS)
+        else:
+            logging.error("[SCANNING] 모든 탐색 시도 실패.")
+            self._transition(ServoState.FAIL)
+
+    def _h_grasp(self, run: "_ServoRun"):
+        """그리퍼 닫기 및 파지 확인 (처리 후 항상 루프 종료)"""
+        logging.info("[GRASP] 그리퍼 닫기")
+        broadcaster.publish(TOPIC_AGENT_THOUGHT, 
+                          "[VisualServoing] 그리퍼로 파지 중...")
+        
+        # 그리퍼 닫기 명령 전송
+        run.move_gripper(0)
+        logging.info("[GRASP] 그리퍼 닫는 중... (3.5초 대기)")
+        
+        # [Improvement] 동적 그리퍼 상태 모니터링 (갱신 콜백으로 깨어나는 이벤트 대기)
+        # 1. 움직임 시작 대기 (Latency 고려)
+        # 0.06(Open)에서 조금이라도 줄어들면 시작으로 간주
+        with self._gripper_cv:
+            self._gripper_cv.wait_for(
+                lambda: system_state.robot.gripper_state < 0.055 or self.cancel_token.is_set(),
+                timeout=1.0
+            )
+        move_started = system_state.robot.gripper_state < 0.055
+            
+        if not move_started:
+            logging.warning("[GRASP] 그리퍼가 움직이지 않습니다. (명령 유실 또는 고장)")
+
+        # 2. 완료(Stability) 감지 - 0.5초 이상 변화 없으면 동작 완료로 판단 (최대 3초)
+        logging.info("[GRASP] 그리퍼 상태 모니터링 시작...")
+        
+        if self._wait_gripper_stable(quiet=0.5, timeout=3.0):
+            logging.info(f"[GRASP] 그리퍼 동작 완료 감지 (Stable at {system_state.robot.gripper_state:.4f})")
+            
+        if self.cancel_token.is_set():
+            logging.warning("[GRASP] 취소됨")
+            return _BREAK
+        
+        # [Grasp Verification] 그리퍼 상태 확인
+        # system_state.robot.gripper_state는 두 핑거 각도의 합(또는 너비)입니다.
+        # 0.0에 가까우면(완전히 닫힘) 공기를 잡은 것이고, 
+        # 0.0보다 크면(중간에 멈춤) 물체를 잡은 것입니다.
+        current_gripper = system_state.robot.gripper_state
+        logging.info(f"[GRASP] 그리퍼 최종 상태: {current_gripper:.4f}")
+        
+        if current_gripper > 0.005 and current_gripper < 0.058: # 완전히 닫히지도, 완전히 열리지도 않음 (=물체 파지)
+            logging.info("[GRASP] ✅ 물체 파지 확인 (Grasp Success)")
+            broadcaster.publish(TOPIC_AGENT_THOUGHT, f"[VisualServoing] 물체 파지 성공 (Width: {current_gripper:.3f})")
+            
+            run.success = True
+        elif current_gripper >= 0.058:
+             logging.warning("[GRASP] ❌ 그리퍼가 닫히지 않았습니다 (Still Open)")
+             broadcaster.publish(TOPIC_AGENT_THOUGHT, "[VisualServoing] 파지 실패 (그리퍼 동작 안함)")
+             run.success = False
+             self._transition(ServoState.FAIL)
+             return _BREAK
+        else:
+            logging.warning("[GRASP] ❌ 빈손 감지 (Grasp Failed - Fully Closed)")
+            broadcaster.publish(TOPIC_AGENT_THOUGHT, "[VisualServoing] 파지 실패 (빈손)")
+            
+            run.success = False
+            self._transition(ServoState.FAIL)
+            return _BREAK
+
+        logging.info("[GRASP] 제어권을 반환합니다.")
+        return _BREAK
+
+    def _h_success(self, run: "_ServoRun"):
+        """성공 보고 후 종료"""
+        broadcaster.publish(TOPIC_AGENT_THOUGHT, 
+                          f"[VisualServoing] '{run.target_label}' 파지 성공! ✅")
+        return _BREAK
+
+    def _h_fail(self, run: "_ServoRun"):
+        """실패 보고 후 종료"""
+        broadcaster.publish(TOPIC_AGENT_THOUGHT, 
+                          "[VisualServoing] 파지 실패 ❌")
+        return _BREAK
+
     def _visual_servo_loop(self,
                           target_label: str,
                           get_ee_position: Callable[[], Dict[str, float]],
@@ -327,38 +561,80 @@ class VisualServoing:
         """
         from sensor.perception.perception_manager import perception_manager
         
+        # 매 틱 쓰는 모듈 함수는 지역 변수로 바인딩 (전역/속성 조회 생략)
+        _hypot = math.hypot
+        _perf = time.perf_counter
+        _servo_step = _servo_njit._servo_step
+        
+        # 루프 중 바뀌지 않는 제어 파라미터도 지역 변수로 고정 (GRASP_DEPTH는 실행 시작 시 이미 설정됨)
+        gain = self.GAIN
+        xy_th = self.XY_THRESHOLD
+        z_th = self.Z_THRESHOLD
+        approach_h = self.APPROACH_HEIGHT
+        grasp_d = self.GRASP_DEPTH
+        max_lead = self.MAX_LEAD
+        tgt_motion_min = self.TARGET_MOTION_MIN
+        cancel = self.cancel_token.is_set
+        
         phase = "APPROACH"
+        label_lc = target_label.lower()
         timeout = 60.0  # 타임아웃 60초
-        start_time = time.time()
+        start_time = _perf()
+        
+        # 절대 데드라인 기반 주기 유지 (매 틱 상대 sleep으로 인한 누적 드리프트 방지)
+        period = 1.0 / self.LOOP_HZ
+        next_tick = start_time + period
         
         # [Hybrid Servoing] 시작은 메인 카메라로
         perception_manager.bridge.switch_source('main')
         logging.info("[VisualServo] 연속 제어 루프 시작 (Main Camera Mode)")
         
+        # 이동 명령은 I/O 워커가 전송 (로봇 이동/도착 대기 중에도 다음 틱 인지 진행)
+        mailbox = _LatestCommandMailbox()
+        io_future = self._io_pool.submit(self._drain_commands, mailbox, move_robot)
+        
+        # 위치/목표는 (3,) 배열로 유지 (매 틱 dict 생성 없이 제자리 갱신)
+        ee = np.empty(3)
+        goal = np.empty(3)
+        
+        # 외삽용 속도 추정 (직전 샘플과의 차분, cm/s)
+        ee_prev = np.empty(3)
+        ee_prev_t = None
+        ee_vel = np.zeros(3)
+        tgt_prev_x = tgt_prev_y = 0.0
+        tgt_prev_t = None
+        tgt_vx = tgt_vy = 0.0
+        
         try:
-            while not self.cancel_token.is_set():
-                loop_start = time.time()
-                
+            while not cancel():
                 # 타임아웃 체크
-                if time.time() - start_time > timeout:
+                if _perf() - start_time > timeout:
                     logging.warning(f"[VisualServo] 타임아웃 (30초 경과)")
                     return False
                 
                 # 1. 현재 상태 획득
                 current_ee = get_ee_position()
-                target_obj = self.find_target_object(target_label)
+                t_read = _perf()
+                ee[0] = current_ee['x']; ee[1] = current_ee['y']; ee[2] = current_ee['z']
+                if ee_prev_t is not None and t_read > ee_prev_t:
+                    np.subtract(ee, ee_prev, out=ee_vel)
+                    ee_vel /= t_read - ee_prev_t
+                ee_prev[:] = ee
+                ee_prev_t = t_read
+                target_obj = self.find_target_object(target_label, label_lc)
                 
                 if not target_obj:
                     # [Emotion] 물체 소실 시 'LOST' 상태 전파 (EmotionBrain -> Confused)
                     system_state.robot.arm_status = "LOST"
+                    tgt_prev_t = None # 재발견 시 목표 속도 재추정
+                    tgt_vx = tgt_vy = 0.0
                     
                     # [개선] 무한 대기 방지
-                    retry_tracker = getattr(self, '_loop_retry_start', None)
+                    retry_tracker = self._loop_retry_start
                     if retry_tracker is None:
-                        self._loop_retry_start = time.time()
-                        retry_tracker = time.time()
+                        retry_tracker = self._loop_retry_start = _perf()
                     
-                    elapsed_retry = time.time() - retry_tracker
+                    elapsed_retry = _perf() - retry_tracker
                     if elapsed_retry > 2.0:  # 2초간 못 찾으면 실패
                         logging.error("[VisualServo] 물체 소실 타임아웃 (2초)")
                         # EmotionBrain이 FAIL을 처리하므로 여기선 이벤트 호출 제거 가능하나, 
@@ -366,7 +642,7 @@ class VisualServoing:
                         emotion_controller.broadcast_emotion_event("confused", weight=0.5, duration=2.0)
                         return False
                     
-                    logging.warning(f"[VisualServo] 물체 소실, 재탐지 대기... ({elapsed_retry:.1f}s)")
+                    logging.warning("[VisualServo] 물체 소실, 재탐지 대기... (%.1fs)", elapsed_retry)
                     time.sleep(0.1)
                     continue
                 else:
@@ -377,32 +653,37 @@ class VisualServoing:
                     self._loop_retry_start = None  # 찾으면 리셋
                 
                 target_pos = target_obj['position']
+                goal[0] = target_pos['x']; goal[1] = target_pos['y']
+                
+                # 목표 XY 속도 추정 (새 측정값이 들어왔을 때만 갱신)
+                if tgt_prev_t is None:
+                    tgt_prev_x, tgt_prev_y, tgt_prev_t = goal[0], goal[1], t_read
+                elif (goal[0] != tgt_prev_x or goal[1] != tgt_prev_y) and t_read > tgt_prev_t:
+                    dt = t_read - tgt_prev_t
+                    tgt_vx = (goal[0] - tgt_prev_x) / dt
+                    tgt_vy = (goal[1] - tgt_prev_y) / dt
+                    tgt_prev_x, tgt_prev_y, tgt_prev_t = goal[0], goal[1], t_read
                 
                 # 2. Phase별 목표 위치 설정 및 카메라 전환 로직
                 if phase == "APPROACH":
                     # Phase 1: XY 정렬 (물체 바로 위) - 메인 카메라
-                    goal = {
-                        'x': target_pos['x'],
-                        'y': target_pos['y'],
-                        'z': target_pos['z'] + self.APPROACH_HEIGHT
-                    }
+                    goal[2] = target_pos['z'] + approach_h
                     
                     # XY 오차 계산
-                    xy_error = math.sqrt(
-                        (current_ee['x'] - goal['x'])**2 +
-                        (current_ee['y'] - goal['y'])**2
-                    )
+                    xy_error = _hypot(ee[0] - goal[0], ee[1] - goal[1])
                     
                     # XY 정렬 완료 판정
-                    if xy_error < self.XY_THRESHOLD:
+                    if xy_error < xy_th:
                         logging.info(f"[VisualServo] ✅ XY 정렬 완료 (오차: {xy_error:.2f}cm)")
                         
                         # [Camera Handover] 메인 카메라 -> 그리퍼 카메라 전환
                         logging.info("[VisualServo] 📷 Phase 전환: APPROACH(Main) → DESCEND(Gripper)")
-                        broadcaster.publish("agent_thought", "[Eyes] '손바닥 눈(Gripper Cam)'으로 시점을 전환합니다.")
+                        broadcaster.publish(TOPIC_AGENT_THOUGHT, "[Eyes] '손바닥 눈(Gripper Cam)'으로 시점을 전환합니다.")
                         
                         perception_manager.bridge.switch_source('gripper')
                         phase = "DESCEND"
+                        tgt_prev_t = None # 카메라가 바뀌면 좌표가 튀므로 목표 속도 재추정
+                        tgt_vx = tgt_vy = 0.0
                         
                         # 전환 및 Frame 안정화 대기 (Perception Loop가 업데이트될 시간 확보)
                         time.sleep(1.0) 
@@ -410,72 +691,66 @@ class VisualServoing:
                 
                 elif phase == "DESCEND":
                     # Phase 2: Z축 하강 (XY 고정) - 그리퍼 카메라
-                    goal = {
-                        'x': target_pos['x'],
-                        'y': target_pos['y'],
-                        'z': target_pos['z'] + self.GRASP_DEPTH
-                    }
+                    goal[2] = target_pos['z'] + grasp_d
                     
                     # Z 오차 계산
-                    z_error = abs(current_ee['z'] - goal['z'])
+                    z_error = abs(float(ee[2] - goal[2]))
                     
                     # Z 도달 판정 (매우 엄격: 1.0cm 이내)
-                    if z_error < self.Z_THRESHOLD:
+                    if z_error < z_th:
                         logging.info(f"[VisualServo] ✅ 목표 정밀 도달! (Z 오차: {z_error:.2f}cm)")
                         time.sleep(0.3)
                         return True  # 성공
                     elif z_error > 3.0:
-                        logging.warning(f"[VisualServo] ⚠️ Z 오차 과다: {z_error:.2f}cm (계속 접근 중...)")
-                
-                # 3. 오차 계산
-                error_x = goal['x'] - current_ee['x']
-                error_y = goal['y'] - current_ee['y']
-                error_z = goal['z'] - current_ee['z']
-                
-                total_error = math.sqrt(error_x**2 + error_y**2 + error_z**2)
+                        logging.warning("[VisualServo] ⚠️ Z 오차 과다: %.2fcm (계속 접근 중...)", z_error)
                 
-                # 4. 비례 제어 (P-Control)
-                cmd_x = current_ee['x'] + error_x * self.GAIN
-                cmd_y = current_ee['y'] + error_y * self.GAIN
-                cmd_z = current_ee['z'] + error_z * self.GAIN
+                # 3. 지연 보정: 명령이 전송될 시점의 EE/목표 위치로 외삽 (판정은 측정값 기준 유지)
+                lead = min(self._latency_ema, max_lead)
+                px = ee[0] + ee_vel[0] * lead
+                py = ee[1] + ee_vel[1] * lead
+                pz = ee[2] + ee_vel[2] * lead
+                gx, gy = goal[0], goal[1]
+                if _hypot(tgt_vx, tgt_vy) >= tgt_motion_min:
+                    gx += tgt_vx * lead
+                    gy += tgt_vy * lead
                 
-                # 5. 속도 조절
-                if total_error < 3.0:
-                    speed = 15  # 정밀 모드
-                elif total_error < 10.0:
-                    speed = 30  # 중간 속도
+                # 4~6. 오차 / 비례 제어 / 속도 단계 / 중복 명령 판정 (numba 커널)
+                last = self._last_sent_cmd
+                if last is None:
+                    cmd_x, cmd_y, cmd_z, speed, total_error, should_send = _servo_step(
+                        px, py, pz, gx, gy, goal[2], gain, 0.0, 0.0, 0.0, 0, False)
                 else:
-                    speed = 60  # 빠른 접근
-                
-                # 6. 명령 전송
-                should_send = True
-                if hasattr(self, '_last_sent_cmd'):
-                    lx, ly, lz, ls = self._last_sent_cmd
-                    dist = math.sqrt((cmd_x - lx)**2 + (cmd_y - ly)**2 + (cmd_z - lz)**2)
-                    if dist < 0.1 and speed == ls:
-                        should_send = False
+                    cmd_x, cmd_y, cmd_z, speed, total_error, should_send = _servo_step(
+                        px, py, pz, gx, gy, goal[2], gain, last[0], last[1], last[2], last[3], True)
                 
+                # 명령 전송 (읽기 시각을 함께 넘겨 I/O 워커가 지연을 측정)
                 if should_send:
-                    move_robot(cmd_x, cmd_y, cmd_z, speed)
+                    mailbox.post((cmd_x, cmd_y, cmd_z, speed, t_read))
                     self._last_sent_cmd = (cmd_x, cmd_y, cmd_z, speed)
                 
-                # 7. 주기적 디버그 로그
-                elapsed = time.time() - start_time
-                if int(elapsed * 2) % 10 == 0 and elapsed > 0.5:
-                    logging.debug(f"[VisualServo({perception_manager.bridge.current_source_key})] "
-                                  f"P={phase}, Err={total_error:.1f}, "
-                                  f"Z_Err={abs(goal['z']-current_ee['z']):.1f}")
+                # 7. 주기적 디버그 로그 (DEBUG 레벨이 꺼져 있으면 시각 계산/문자열 생성 모두 생략)
+                if logging.root.isEnabledFor(logging.DEBUG):
+                    elapsed = _perf() - start_time
+                    if int(elapsed * 2) % 10 == 0 and elapsed > 0.5:
+                        logging.debug("[VisualServo(%s)] P=%s, Err=%.1f, Z_Err=%.1f",
+                                      perception_manager.bridge.current_source_key, phase,
+                                      total_error, abs(goal[2] - ee[2]))
                 
-                # 8. 루프 주기 유지
-                elapsed_loop = time.time() - loop_start
-                sleep_time = (1.0 / self.LOOP_HZ) - elapsed_loop
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                # 8. 루프 주기 유지 (한 주기 이상 밀렸으면 따라잡기 대신 다음 격자 시각으로 재동기화)
+                lag = _perf() - next_tick
+                if lag > period:
+                    next_tick += math.ceil(lag / period) * period
+                _sleep_until(next_tick)
+                next_tick += period
             
             logging.warning("[VisualServo] 취소됨 (cancel_token)")
             return False
             
         finally:
+            # I/O 워커 종료 및 진행 중인 이동 명령 완료 대기 (이후 단계가 로봇을 직접 제어하므로)
+            mailbox.close()
+            io_future.result()
+            
             # [Cleanup] 반드시 메인 카메라로 복귀해야 함
             logging.info("[VisualServo] 제어 루프 종료 - 메인 카메라 복귀")
             perception_manager.bridge.switch_source('main')
@@ -484,6 +759,7 @@ class VisualServoing:
         """상태 전이 및 로깅, SystemState 동기화"""
         logging.info(f"[VisualServoing] 상태 전환: {self.current_state.name} → {next_state.name}")
         self.current_state = next_state
+        self._state_event.set()
         
         # [SystemState Sync] EmotionBrain이 볼 수 있도록 상태 전파
         status_map = {
@@ -504,59 +780,54 @@ class VisualServoing:
             if next_state in [ServoState.SUCCESS, ServoState.FAIL]:
                  time.sleep(0.6)
 
-    def _execute_auto_focus(self, get_ee_position, move_robot) -> bool:
+    def _execute_auto_focus(self, get_ee_position, move_robot, move_robot_batch) -> bool:
         """
-        [AUTO_FOCUS] Hill Climbing 알고리즘으로 Z축 최적화 (선명도 최대화)
+        [AUTO_FOCUS] 3점 포물선 근사로 Z축 최적화 (선명도 최대화)
+        z0, z0+Δ, z0-Δ 에서 선명도를 측정해 score = a·z² + b·z + c 를 맞추고,
+        꼭짓점(최대 선명도 위치)으로 한 번에 이동합니다. (기존 Hill Climbing 최대 10회 이동 대체)
         """
-        logging.info("[AUTO_FOCUS] 오토 포커스(Hill Climbing) 시작")
+        logging.info("[AUTO_FOCUS] 오토 포커스(Parabolic Fit) 시작")
         
-        step_size = 0.5 # 0.5cm 단위 이동
-        max_range = 5.0 # 최대 5cm 탐색
-        current_z_offset = 0.0
-        
-        # 초기 Score 측정
-        best_score = system_state.focus_score
-        direction = 1 # +Z 방향 (위로) 먼저 시도
+        probe = 1.0           # 탐침 간격 Δ (cm)
+        max_range = 5.0       # 최대 5cm 탐색
+        min_gain = 10.0       # 유의미한 향상 기준 (Threshold 10.0)
         
         # 안전 장치: 시작 위치 저장
         start_pos = get_ee_position()
+        x, y, z0 = start_pos['x'], start_pos['y'], start_pos['z']
+        
+        # 1. 3점 샘플링 (느린 속도로 이동 + EE 안정화 대기, 최대 0.6초)
+        s0 = system_state.focus_score
+        move_robot_batch([(x, y, z0 + probe, 15, 0)])
+        self._wait_ee_settled(get_ee_position, timeout=0.6)
+        if self.cancel_token.is_set(): return False
+        s1 = system_state.focus_score
+        move_robot_batch([(x, y, z0 - probe, 15, 0)])
+        self._wait_ee_settled(get_ee_position, timeout=0.6)
+        if self.cancel_token.is_set(): return False
+        s2 = system_state.focus_score
+        logging.info(f"[AUTO_FOCUS] Z={z0:.2f}/{z0 + probe:.2f}/{z0 - probe:.2f}, "
+                     f"Score={s0:.2f}/{s1:.2f}/{s2:.2f}")
+        
+        # 2. 포물선 계수 (z0 기준 오프셋 좌표)
+        a = (s1 - 2.0 * s0 + s2) / (2.0 * probe * probe)
+        b = (s1 - s2) / (2.0 * probe)
+        
+        if a < 0.0:
+            # 위로 볼록: 꼭짓점이 최대 선명도 위치 (탐색 범위로 제한)
+            offset = min(max(-b / (2.0 * a), -max_range), max_range)
+            best_score = s0 + b * offset + a * offset * offset
+        else:
+            # 볼록하지 않으면 측정한 3점 중 최고점 선택
+            best_score, offset = max((s0, 0.0), (s1, probe), (s2, -probe))
         
-        for i in range(10): # 최대 10회 이동 제한
-            if self.cancel_token.is_set(): return False
-            
-            # 이동
-            target_z = start_pos['z'] + current_z_offset + (step_size * direction)
-            
-            # 범위 체크
-            if abs(target_z - start_pos['z']) > max_range:
-                logging.warning("[AUTO_FOCUS] 최대 탐색 범위 도달")
-                break
-                
-            move_robot(start_pos['x'], start_pos['y'], target_z, 15) # 느린 속도로 이동
-            time.sleep(0.5) # 안정화 대기
-            
-            new_score = system_state.focus_score
-            logging.info(f"[AUTO_FOCUS] Z={target_z:.2f}, Score={new_score:.2f} (Best={best_score:.2f})")
-            
-            if new_score > best_score + 10.0: # 유의미한 향상 (Threshold 10.0)
-                best_score = new_score
-                current_z_offset += (step_size * direction)
-            else:
-                # 점수가 떨어지거나 비슷하면 방향 전환 또는 중단
-                if direction == 1:
-                    logging.info("[AUTO_FOCUS] 방향 전환 (+Z -> -Z)")
-                    direction = -1 # 반대 방향 시도
-                    # 다시 원점으로 (약간의 백트래킹)
-                    current_z_offset = 0.0 
-                    move_robot(start_pos['x'], start_pos['y'], start_pos['z'], 20)
-                    time.sleep(0.5)
-                else:
-                    logging.info("[AUTO_FOCUS] 양방향 탐색 완료. 최적 위치로 복귀.")
-                    # 최적 위치 복귀
-                    final_z = start_pos['z'] + current_z_offset
-                    move_robot(start_pos['x'], start_pos['y'], final_z, 20)
-                    return True
-                    
+        if best_score < s0 + min_gain:
+            offset = 0.0 # 유의미한 향상이 없으면 원위치
+        
+        # 3. 최적 위치로 한 번에 이동
+        final_z = z0 + offset
+        logging.info(f"[AUTO_FOCUS] 최적 위치로 이동: Z={final_z:.2f} (예상 Score={max(best_score, s0):.2f})")
+        move_robot(x, y, final_z, 20)
         return True
 
     def _execute_vlm_check(self) -> str:
@@ -565,7 +836,7 @@ class VisualServoing:
         Returns: "CONFIDENT", "UNCERTAIN", "FAIL"
         """
         logging.info("[VLM_CHECK] VLM 분석 요청 중...")
-        broadcaster.publish("agent_thought", "[Intelligent Eye] 이 위치에서 자세히 보고 있습니다...")
+        broadcaster.publish(TOPIC_AGENT_THOUGHT, "[Intelligent Eye] 이 위치에서 자세히 보고 있습니다...")
         
         # TODO: LogicBrain과의 비동기 연동 포인트. 
         # 실제 구현에서는 'REQUEST_VLM' 이벤트를 날리고, SystemState에 결과가 업데이트되길 기다려야 함.
@@ -587,12 +858,9 @@ class VisualServoing:
         [SCANNING] 그리퍼 회전 및 미세 이동으로 새로운 관측점 확보
         """
         logging.info("[SCANNING] 능동 탐색: 그리퍼 회전/이동 시도")
-        broadcaster.publish("agent_thought", "[Active Perception] 잘 안보여서 각도를 바꿔보는 중입니다...")
+        broadcaster.publish(TOPIC_AGENT_THOUGHT, "[Active Perception] 잘 안보여서 각도를 바꿔보는 중입니다...")
         
         # 현재 회전 상태 관리 (단순화를 위해 toggle 방식)
-        if not hasattr(self, '_scan_step'):
-            self._scan_step = 0
-            
         self._scan_step = (self._scan_step + 1) % 4
         
         # 현재 위치 획득
@@ -612,7 +880,7 @@ class VisualServoing:
         logging.info(f"[SCANNING] 시점 변경 -> ({target_x:.1f}, {target_y:.1f})")
         
         move_robot(target_x, target_y, current_pos['z'], 20)
-        time.sleep(1.0)
+        self._wait_ee_settled(get_ee_position, timeout=1.0)
         return True
 
 # 싱글톤 인스턴스
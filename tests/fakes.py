@@ -0,0 +1,35 @@
+"""테스트용 가짜 로봇 드라이버 / robot_controller 모듈"""
+
+import types
+
+
+class RecordingDriver:
+    """호출된 로봇 명령을 (이름, 인자) 순서대로 기록하는 드라이버"""
+    def __init__(self):
+        self.calls = []
+
+    def move_to_xyz(self, x, y, z, speed=50, wait_arrival=False):
+        self.calls.append(("move_to_xyz", (x, y, z)))
+        return True
+
+    def move_robot_batch(self, points):
+        self.calls.append(("move_robot_batch", tuple(points)))
+        return True
+
+    def set_joints(self, angles, speed=50):
+        self.calls.append(("set_joints", tuple(angles)))
+        return True
+
+    def move_gripper(self, open_percent):
+        self.calls.append(("move_gripper", open_percent))
+        return True
+
+    def get_current_pose(self):
+        return {"x": 25.0, "y": 0.0, "z": 25.0}
+
+
+def fake_robot_controller_module(driver):
+    """embodiment.robot_controller 대체 모듈 (실물/시뮬레이션 연결 없이 driver로 명령 기록)"""
+    module = types.ModuleType("embodiment.robot_controller")
+    module.robot_controller = types.SimpleNamespace(robot_driver=driver, stop=lambda: None)
+    return module
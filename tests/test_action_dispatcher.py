@@ -0,0 +1,45 @@
+import importlib
+import sys
+import time
+import types
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from tests.fakes import RecordingDriver, fake_robot_controller_module
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    driver = RecordingDriver()
+    fake = fake_robot_controller_module(driver)
+    monkeypatch.setitem(sys.modules, "embodiment.robot_controller", fake)
+    module = importlib.import_module("strategy.action_dispatcher")
+    monkeypatch.setattr(module, "robot_controller", fake.robot_controller)
+    monkeypatch.setattr(module, "visual_servoing",
+                        types.SimpleNamespace(execute_approach_and_grasp=lambda target_label: True))
+    monkeypatch.setattr(module.system_state, "perception_data", {"detected_objects": [{"label": "cup"}]})
+    return module.ActionDispatcher(), driver
+
+
+def _wave_calls(driver):
+    return [c for c in driver.calls if c[0] in ("move_to_xyz", "set_joints")]
+
+
+@pytest.mark.parametrize("run_grasp", [
+    lambda d: d._handle_action_intent("grab the cup"),  # 자연어 잡기 의도
+    lambda d: d._run_job(("grasp", "cup")),             # grasp_intent (도구 호출)
+], ids=["action_intent", "grasp_intent"])
+def test_grasp_cancels_pending_greet(dispatcher, run_grasp):
+    d, driver = dispatcher
+    d._handle_action_intent("hello")
+    time.sleep(0.2) # 첫 웨이포인트(t=0)만 실행됨
+    assert len(_wave_calls(driver)) == 1
+
+    run_grasp(d)
+    fired = len(_wave_calls(driver))
+    time.sleep(1.0) # 취소되지 않았다면 t=0.8 웨이포인트가 실행됐을 시점
+
+    assert len(_wave_calls(driver)) == fired
+    assert d._pending_greet_timers == []
@@ -0,0 +1,55 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def grasp_strategy(monkeypatch):
+    # 카메라/VLM 모듈은 실물 장치와 torch를 요구하므로 가짜 모듈로 대체
+    replies = []
+    calls = []
+
+    def invoke(args):
+        calls.append(args["query"])
+        return replies.pop(0)
+
+    monkeypatch.setitem(sys.modules, "sensor.perception",
+                        types.SimpleNamespace(VisionBridge=object))
+    monkeypatch.setitem(sys.modules, "brain.tools.vision_analyze",
+                        types.SimpleNamespace(vision_analyze=types.SimpleNamespace(invoke=invoke)))
+    sys.modules.pop("strategy.grasp_strategy", None)
+    module = importlib.import_module("strategy.grasp_strategy")
+    yield module, replies, calls
+    module.broadcaster.unsubscribe(module._on_scene_update)
+    sys.modules.pop("strategy.grasp_strategy", None)
+
+
+def test_failed_vlm_reply_is_not_cached(grasp_strategy):
+    module, replies, calls = grasp_strategy
+    sig = (("cup", 0, 0),)
+    replies += ["[FAILURE] VLM 서버 오류 (코드: 500)", "[SUCCESS] 시각 분석 결과:\n왼쪽"]
+
+    assert module._cached_vlm_query("q", sig).startswith("[FAILURE]")
+    assert module._cached_vlm_query("q", sig).startswith("[SUCCESS]")
+    assert module._cached_vlm_query("q", sig).startswith("[SUCCESS]")
+    assert len(calls) == 2
+
+
+def test_scene_change_clears_vlm_cache(grasp_strategy):
+    module, replies, calls = grasp_strategy
+    sig = (("cup", 0, 0),)
+    replies += ["[SUCCESS] 왼쪽", "[SUCCESS] 오른쪽"]
+
+    module._on_scene_update({"perception": {"detected_objects": [{"name": "cup"}]}})
+    module._cached_vlm_query("q", sig)
+    # 같은 구성의 새 프레임 -> 캐시 유지
+    module._on_scene_update({"perception": {"detected_objects": [{"name": "cup"}]}})
+    assert module._cached_vlm_query("q", sig) == "[SUCCESS] 왼쪽"
+    # 물체 구성 변경 -> 캐시 초기화
+    module._on_scene_update({"perception": {"detected_objects": [{"name": "cup"}, {"name": "duck"}]}})
+    assert module._cached_vlm_query("q", sig) == "[SUCCESS] 오른쪽"
+    assert len(calls) == 2
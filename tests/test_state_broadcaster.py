@@ -0,0 +1,40 @@
+import threading
+
+from shared.state_broadcaster import StateBroadcaster
+
+
+def _fresh_broadcaster():
+    # 싱글톤을 건드리지 않도록 별도 인스턴스를 만듭니다.
+    b = object.__new__(StateBroadcaster)
+    b._init()
+    return b
+
+
+def test_intents_are_not_coalesced_while_worker_is_busy():
+    b = _fresh_broadcaster()
+    gate = threading.Event()
+    done = threading.Event()
+    received = []
+
+    def slow_sub(snapshot):
+        gate.wait(2.0) # 첫 알림에서 워커를 붙잡아 이후 발행이 대기열에 쌓이도록 함
+        received.append((snapshot.get("action_intent"), snapshot.get("grasp_intent")))
+        if snapshot.get("agent_state") == "DONE":
+            done.set()
+
+    b.subscribe(slow_sub)
+    b.publish("agent_state", "PLANNING")
+    b.publish("action_intent", "wave")
+    b.publish("agent_thought", "thinking")
+    b.publish("action_intent", "grab the cup")
+    b.publish("grasp_intent", {"target_name": "cup"})
+    b.publish("agent_thought", "more thinking")
+    b.publish("agent_state", "DONE")
+    gate.set()
+    assert done.wait(2.0)
+
+    actions = [a for a, _ in received]
+    assert "wave" in actions and "grab the cup" in actions
+    assert any(g is not None for _, g in received)
+    # 명령이 바뀌지 않은 스냅샷은 합쳐짐 (발행 7회보다 적게 전달)
+    assert len(received) < 7
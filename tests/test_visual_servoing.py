@@ -0,0 +1,60 @@
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from strategy import visual_servoing as vs_module
+from strategy.visual_servoing import ServoState, VisualServoing
+from tests.fakes import RecordingDriver, fake_robot_controller_module
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    driver = RecordingDriver()
+    monkeypatch.setitem(sys.modules, "embodiment.robot_controller", fake_robot_controller_module(driver))
+    monkeypatch.setattr(vs_module, "_promote_rt", lambda: None) # 테스트 프로세스 스케줄링은 건드리지 않음
+    monkeypatch.setattr(vs_module.time, "sleep", lambda _s: None)
+    return driver
+
+
+def test_state_machine_runs_detect_to_fail(driver):
+    """IDLE → DETECT → VISUAL_SERVO → FAIL 전이를 실제 핸들러 테이블로 구동"""
+    servo = VisualServoing()
+    servo.find_target_object = lambda label, label_lc=None: {"name": label, "position": {"x": 20.0, "y": 0.0, "z": 2.0}}
+    servo._visual_servo_loop = lambda target_label, get_ee_position, move_robot: False # 접근 실패
+
+    visited = []
+    transition = servo._transition
+    def record(next_state):
+        visited.append(next_state)
+        transition(next_state)
+    servo._transition = record
+
+    assert servo.execute_approach_and_grasp("cup") is False
+    assert visited == [ServoState.DETECT, ServoState.VISUAL_SERVO, ServoState.FAIL]
+    assert servo.current_state is ServoState.FAIL
+    assert driver.calls == [("move_gripper", 100)]
+    assert servo.is_running is False
+
+
+def _stepping_ee(period, step_cm):
+    """period마다 한 번씩만 갱신되는 EE 위치 (시뮬레이터 state 패킷 흉내)"""
+    t0 = vs_module.time.perf_counter()
+    def get_ee_position():
+        n = int((vs_module.time.perf_counter() - t0) / period)
+        return {"x": n * step_cm, "y": 0.0, "z": 10.0}
+    return get_ee_position
+
+
+def test_wait_ee_settled_ignores_stale_packets_while_moving(driver):
+    servo = VisualServoing()
+    assert servo.EE_SETTLE_INTERVAL >= servo.EE_STATE_PERIOD
+    moving = _stepping_ee(servo.EE_STATE_PERIOD, step_cm=1.0) # 20cm/s로 이동 중
+    assert servo._wait_ee_settled(moving, timeout=0.5) is False
+
+
+def test_wait_ee_settled_detects_stopped_arm(driver):
+    servo = VisualServoing()
+    stopped = lambda: {"x": 5.0, "y": 0.0, "z": 10.0}
+    assert servo._wait_ee_settled(stopped, timeout=0.5) is True
@@ -2,38 +2,189 @@ import cv2
 import asyncio
 import websockets
 import json
-import base64
 import numpy as np
-import time
+import math
+import queue
+import threading
+from shared.ui_dto import FrameChannel
+
+# libjpeg-turbo(PyTurboJPEG) 사용 가능 여부 (없으면 cv2.imdecode로 동작)
+TURBOJPEG_AVAILABLE = False
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _tj = TurboJPEG() # 디코더 인스턴스는 재사용 (생성 시 라이브러리 로드 비용)
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    TURBOJPEG_AVAILABLE = False
+
+# GPU(nvJPEG) 디코딩 사용 가능 여부 - torchvision + CUDA 장치가 있을 때만 (없으면 CPU 디코딩)
+NVJPEG_AVAILABLE = False
+try:
+    import torch
+    from torchvision.io import decode_jpeg, ImageReadMode
+    NVJPEG_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    NVJPEG_AVAILABLE = False
+
+# uvloop(libuv 기반 이벤트 루프) 사용 가능 여부 (없으면 기본 asyncio 루프로 동작)
+UVLOOP_AVAILABLE = False
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# numba 사용 가능 여부 (있으면 BBox/십자선을 JIT 커널로 한 번에 그림, 없으면 cv2로 하나씩)
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _hline(img, y, x1, x2, b, g, r):
+        if y < 0 or y >= img.shape[0]:
+            return
+        for x in range(max(x1, 0), min(x2 + 1, img.shape[1])):
+            img[y, x, 0] = b; img[y, x, 1] = g; img[y, x, 2] = r
+
+    @njit(cache=True)
+    def _vline(img, x, y1, y2, b, g, r):
+        if x < 0 or x >= img.shape[1]:
+            return
+        for y in range(max(y1, 0), min(y2 + 1, img.shape[0])):
+            img[y, x, 0] = b; img[y, x, 1] = g; img[y, x, 2] = r
+
+    @njit(cache=True)
+    def _draw_boxes(img, us, vs, ws, hs):
+        """
+        탐지 박스들을 SoA 배열(중심 u, v / 크기 w, h)로 받아 두께 2px로 그림
+        파란색 사각형 + 빨간색 십자선 (cv2.rectangle / cv2.drawMarker(MARKER_CROSS, 10)과 같은 모양)
+        """
+        for i in range(us.shape[0]):
+            u = us[i]; v = vs[i]; w = ws[i]; h = hs[i]
+            x1 = int(u - w / 2); y1 = int(v - h / 2)
+            x2 = int(u + w / 2); y2 = int(v + h / 2)
+            for t in range(-1, 1):
+                _hline(img, y1 + t, x1 - 1, x2, 255, 0, 0)
+                _hline(img, y2 + t, x1 - 1, x2, 255, 0, 0)
+                _vline(img, x1 + t, y1 - 1, y2, 255, 0, 0)
+                _vline(img, x2 + t, y1 - 1, y2, 255, 0, 0)
+            for t in range(-1, 1):
+                _hline(img, v + t, u - 5, u + 5, 0, 0, 255)
+                _vline(img, u + t, v - 5, v + 5, 0, 0, 255)
 
 # WebSocket 서버 주소
 URI = "ws://localhost:8000/ws"
 
-def decode_base64_image(b64_string):
-    """Base64 문자열을 OpenCV 이미지로 디코딩"""
-    if not b64_string:
-        return None
+# 화면 표시 배율 (4분할 각 타일 = 메인 영상 크기 × DISPLAY_SCALE)
+DISPLAY_SCALE = 0.8
+# 메인 외 채널은 libjpeg-turbo IDCT 스케일링으로 표시 배율 이상(1/8 단위 올림)까지만 디코딩 (7/8)
+_TJ_SCALING = (math.ceil(DISPLAY_SCALE * 8), 8)
+
+def decode_frame_message(message):
+    """
+    프레임 바이너리 메시지([FrameChannel 1바이트] + JPEG)를 (채널, OpenCV 이미지)로 디코딩
+    JPEG 바이트는 복사 없이 메시지 버퍼를 그대로 참조합니다.
+    디코더 우선순위: nvJPEG(GPU) → libjpeg-turbo → cv2.imdecode (앞 단계 실패 시 다음 단계로)
+    메인 프레임은 BBox 픽셀 좌표와 맞춰야 하므로 원본 크기로, 나머지는 libjpeg-turbo에서 축소 디코딩합니다.
+    """
     try:
-        img_data = base64.b64decode(b64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
+        nparr = np.frombuffer(message, np.uint8, offset=1)
+        if NVJPEG_AVAILABLE:
+            try:
+                rgb = decode_jpeg(torch.from_numpy(nparr.copy()), mode=ImageReadMode.RGB, device='cuda')
+                # CHW RGB → HWC BGR (채널 뒤집기/전치는 GPU에서 수행 후 한 번만 내려받음)
+                return message[0], rgb.flip(0).permute(1, 2, 0).contiguous().cpu().numpy()
+            except Exception:
+                pass
+        if TURBOJPEG_AVAILABLE:
+            try:
+                if message[0] == FrameChannel.FRAME:
+                    return message[0], _tj.decode(nparr, pixel_format=TJPF_BGR)
+                return message[0], _tj.decode(nparr, pixel_format=TJPF_BGR, scaling_factor=_TJ_SCALING)
+            except Exception:
+                pass # 손상/비표준 JPEG는 OpenCV로 재시도
         img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        return img
+        return message[0], img
     except Exception as e:
         print(f"이미지 디코딩 오류: {e}")
-        return None
+        return None, None
+
+# 오버레이 캐시: 제목별 (원본 이미지, 오버레이 키, 주석이 그려진 스크래치 버퍼)
+_overlay_cache = {}
+
+def _overlay_key(detections):
+    """오버레이 결과를 결정하는 탐지 정보만 모은 비교용 키"""
+    key = []
+    for det in detections:
+        pos = det.get('position', {})
+        key.append((det.get('name'), tuple(det.get('pixel_center') or ()), tuple(det.get('bbox') or ()),
+                    pos.get('x', 0), pos.get('y', 0), pos.get('z', 0)))
+    return tuple(key)
 
 def draw_overlay(image, detections, title=""):
-    """탐지된 객체 정보(BBox, 좌표)를 이미지에 오버레이"""
+    """
+    탐지된 객체 정보(BBox, 좌표)를 이미지에 오버레이
+    매번 image.copy() 하지 않고 제목별 스크래치 버퍼에 복사해 그리며,
+    원본 프레임과 탐지 정보가 지난번과 같으면 이미 그려 둔 결과를 그대로 반환합니다.
+    """
     if image is None: return None
     
-    vis_img = image.copy()
+    key = _overlay_key(detections)
+    cached = _overlay_cache.get(title)
+    if cached is not None and cached[0] is image and cached[1] == key:
+        return cached[2]
+    
+    vis_img = cached[2] if cached is not None and cached[2].shape == image.shape else np.empty_like(image)
+    np.copyto(vis_img, image)
+    _annotate(vis_img, detections, title)
+    _overlay_cache[title] = (image, key, vis_img)
+    return vis_img
+
+# 라벨 스티커 캐시: 텍스트 → (배경 박스 + 글자를 미리 그린 작은 이미지, 글자 높이)
+# 탐지 결과가 유지되는 동안은 글자 래스터화 없이 메모리 복사 한 번으로 표시합니다.
+_sticker_cache = {}
+_STICKER_CACHE_MAX = 256
+
+def _label_sticker(text):
+    cached = _sticker_cache.get(text)
+    if cached is not None:
+        return cached
+    
+    # 텍스트 배경 박스
+    (text_w, text_h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    # 배경 박스 (검정색, 투명도 없음) - 기존 cv2.rectangle(-1)과 같은 크기 (양 끝 포함)
+    sticker = np.zeros((text_h + 11, text_w + 11, 3), dtype=np.uint8)
+    # 글자 (라임색, 가독성 확보)
+    cv2.putText(sticker, text, (5, text_h + 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 128), 1)
+    
+    if len(_sticker_cache) >= _STICKER_CACHE_MAX:
+        _sticker_cache.clear()
+    _sticker_cache[text] = (sticker, text_h)
+    return sticker, text_h
+
+def _blit(dst, src, x0, y0):
+    """src를 dst의 (x0, y0) 위치에 복사 (이미지 밖으로 나가는 부분은 잘라냄)"""
+    sh, sw = src.shape[:2]
+    dh, dw = dst.shape[:2]
+    x1, y1 = max(x0, 0), max(y0, 0)
+    x2, y2 = min(x0 + sw, dw), min(y0 + sh, dh)
+    if x1 < x2 and y1 < y2:
+        dst[y1:y2, x1:x2] = src[y1 - y0:y2 - y0, x1 - x0:x2 - x0]
+
+def _annotate(vis_img, detections, title):
+    """vis_img에 제목/BBox/좌표 텍스트를 직접 그림"""
     h, w = vis_img.shape[:2]
     
     # 제목 표시
     cv2.putText(vis_img, title, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
     
     if not detections:
-        return vis_img
+        return
 
     # [Debug] 수신된 데이터 구조 확인
     if detections and 'pixel_center' not in detections[0]:
@@ -42,6 +193,8 @@ def draw_overlay(image, detections, title=""):
          # 정상적인 경우 너무 많은 로그를 방지하기 위해 100번에 1번만 출력하거나 생각
          pass 
 
+    boxes = [] # numba 커널로 한 번에 그릴 (u, v, w, h)
+    labels = [] # 박스를 모두 그린 뒤 붙일 (텍스트, x, y)
     for det in detections:
         # BBox (YOLO) - 파란색 사각형
         # VisionBridge에서 pixel_center(u, v)와 bbox(w, h)를 모두 제공함
@@ -52,40 +205,51 @@ def draw_overlay(image, detections, title=""):
             u, v = int(center[0]), int(center[1])
             w, h = int(bbox[0]), int(bbox[1])
             
-            x1 = int(u - w / 2)
-            y1 = int(v - h / 2)
-            x2 = int(u + w / 2)
-            y2 = int(v + h / 2)
-            
-            # 파란색 박스 그리기
-            cv2.rectangle(vis_img, (x1, y1), (x2, y2), (255, 0, 0), 2)
-            
-            # 십자선 그리기 (중심)
-            cv2.drawMarker(vis_img, (u, v), (0, 0, 255), markerType=cv2.MARKER_CROSS, markerSize=10, thickness=2)
+            if NUMBA_AVAILABLE:
+                boxes.append((u, v, w, h))
+            else:
+                x1 = int(u - w / 2)
+                y1 = int(v - h / 2)
+                x2 = int(u + w / 2)
+                y2 = int(v + h / 2)
+                
+                # 파란색 박스 그리기
+                cv2.rectangle(vis_img, (x1, y1), (x2, y2), (255, 0, 0), 2)
+                
+                # 십자선 그리기 (중심)
+                cv2.drawMarker(vis_img, (u, v), (0, 0, 255), markerType=cv2.MARKER_CROSS, markerSize=10, thickness=2)
 
-        # 3D 좌표 텍스트 표시
-        pos = det.get('position', {})
-        # x, y, z 좌표를 각각 가져와서 명확하게 포맷팅
-        x, y, z = pos.get('x', 0), pos.get('y', 0), pos.get('z', 0)
-        text = f"{det['name']} : x={x}, y={y}, z={z} (cm)"
-        
-        # 텍스트 배경 박스
-        text_size, _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-        text_w, text_h = text_size
-        
-        # 박스 위에 텍스트 표시
+        # 3D 좌표 텍스트 표시 (박스 위에)
         if center:
+             pos = det.get('position', {})
+             # x, y, z 좌표를 각각 가져와서 명확하게 포맷팅
+             x, y, z = pos.get('x', 0), pos.get('y', 0), pos.get('z', 0)
              tx, ty = u - w//2, v - h//2 - 10
              if ty < 20: ty = v + h//2 + 20 # 위쪽 공간 부족 시 아래로
-             
-             # 배경 박스 (검정색, 투명도 없음)
-             cv2.rectangle(vis_img, (tx, ty - text_h - 5), (tx + text_w + 10, ty + 5), (0, 0, 0), -1)
-             # 글자 (라임색, 가독성 확보)
-             cv2.putText(vis_img, text, (tx + 5, ty), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 128), 1)
+             labels.append((f"{det['name']} : x={x}, y={y}, z={z} (cm)", tx, ty))
+    
+    if boxes:
+        soa = np.array(boxes, dtype=np.int32).T # AoS → SoA (u, v, w, h 각각 연속 배열)
+        _draw_boxes(vis_img, soa[0].copy(), soa[1].copy(), soa[2].copy(), soa[3].copy())
+    
+    for text, tx, ty in labels:
+        sticker, text_h = _label_sticker(text)
+        _blit(vis_img, sticker, tx, ty - text_h - 5)
 
-    return vis_img
+def put_latest(q, item):
+    """큐가 가득 차 있으면 가장 오래된 항목을 버리고 넣습니다. (지연 누적 방지)"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
 
-async def listen_and_show():
+async def listen(recv_q, stop_event):
+    """[Stage 1: 수신 스레드] WebSocket 메시지를 받는 즉시 디코딩 큐로 넘김"""
     print(f"Connecting to {URI} ...")
     
     # WebSocket 연결 옵션: keepalive ping 에러 방지
@@ -95,79 +259,153 @@ async def listen_and_show():
         URI,
         ping_interval=None,  # keepalive ping 비활성화
         ping_timeout=None,   # ping timeout 비활성화
-        close_timeout=10     # 연결 종료 대기 시간
+        close_timeout=10,    # 연결 종료 대기 시간
+        max_size=None,       # 큰 프레임 메시지 크기 제한 해제
+        compression=None,    # JPEG는 이미 압축되어 있으므로 permessage-deflate 비활성화 (압축 해제 CPU 절약)
+        max_queue=2 * (len(FrameChannel) + 1) # 수신 버퍼 상한 (2틱 분량)
     ) as websocket:
         print("Connected! Waiting for stream...")
         
-        while True:
+        while not stop_event.is_set():
             try:
                 message = await websocket.recv()
-                data = json.loads(message)
-                
-                # 데이터 파싱
-                # 1. World Camera
-                frame_metrics = data.get('perception', {})
-                detections = frame_metrics.get('detected_objects', [])
-                
-                img_main = decode_base64_image(data.get('last_frame'))
-                img_depth = decode_base64_image(data.get('last_depth'))
-                
-                # 2. Gripper Camera
-                img_ee = decode_base64_image(data.get('last_ee_frame'))
-                img_ee_depth = decode_base64_image(data.get('last_ee_depth'))
-
-                # 빈 이미지 처리 (검은색 캔버스)
-                dummy = np.zeros((480, 640, 3), dtype=np.uint8)
-                
-                if img_main is None: img_main = dummy.copy()
-                if img_depth is None: img_depth = dummy.copy() # Depth도 컬러맵 적용되어 3채널임
-                if img_ee is None: img_ee = dummy.copy()
-                if img_ee_depth is None: img_ee_depth = dummy.copy()
-                
-                # 오버레이 그리기
-                # pixel 좌표가 없어서 정확한 BBox는 못 그리지만, 정보 표시는 가능
-                # 추후 VisionBridge에서 pixel_center도 같이 보내주도록 수정하면 좋음
-                img_main = draw_overlay(img_main, detections, "World RGB")
-                cv2.putText(img_depth, "World Depth", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-                
-                cv2.putText(img_ee, "Gripper RGB", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-                cv2.putText(img_ee_depth, "Gripper Depth", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-
-                # 4분할 화면 병합 (2x2 Grid)
-                # Resize if needed to match sizes
-                h1, w1 = img_main.shape[:2]
-                img_depth = cv2.resize(img_depth, (w1, h1))
-                img_ee = cv2.resize(img_ee, (w1, h1))
-                img_ee_depth = cv2.resize(img_ee_depth, (w1, h1))
-                
-                top_row = np.hstack((img_main, img_depth))
-                bottom_row = np.hstack((img_ee, img_ee_depth))
-                combined = np.vstack((top_row, bottom_row))
-                
-                # 화면 크기 조정 (너무 크면 줄임)
-                display_img = cv2.resize(combined, (0, 0), fx=0.8, fy=0.8)
-
-                cv2.imshow("MACH-VII Vision Debugger (Quad View)", display_img)
-                
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-                    
+                put_latest(recv_q, message)
             except websockets.exceptions.ConnectionClosed:
                 print("Connection closed. Exiting...")
                 break
-            except json.JSONDecodeError as e:
-                print(f"JSON Decode Error: {e}")
+
+def recv_worker(recv_q, stop_event):
+    loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(listen(recv_q, stop_event))
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        loop.close()
+        stop_event.set()
+
+def decode_worker(recv_q, draw_q, stop_event):
+    """[Stage 2: 디코딩 스레드] JPEG 디코딩 + 스냅샷 파싱 후 새 프레임이 있으면 표시 큐로 넘김"""
+    # 채널별 최신 프레임 (서버는 프레임이 갱신될 때만 바이너리 메시지를 보냄)
+    frames = {channel: None for channel in FrameChannel}
+    frames_updated = False
+    # 채널별 마지막으로 디코딩한 원본 메시지 (서버는 프레임 갱신 시 4채널을 모두 보내므로 일부는 이전과 동일)
+    last_raw = {channel: None for channel in FrameChannel}
+    
+    while not stop_event.is_set():
+        try:
+            message = recv_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        
+        try:
+            # 1. 바이너리 메시지: 해당 채널 프레임만 갱신
+            if isinstance(message, (bytes, bytearray)):
+                # 직전과 같은 JPEG면 디코딩 생략 (bytes 비교는 길이가 다르면 즉시 끝나는 memcmp)
+                if len(message) > 1 and message != last_raw.get(message[0]):
+                    last_raw[message[0]] = message
+                    channel, img = decode_frame_message(message)
+                    if img is not None and channel in frames:
+                        frames[channel] = img
+                        frames_updated = True
                 continue
-            except Exception as e:
-                print(f"Error: {e}")
-                import traceback
-                traceback.print_exc()
-                time.sleep(0.1)
+            
+            # 2. 텍스트 메시지: 시스템 스냅샷 (JSON) - 새 프레임이 있을 때만 표시
+            # 서버는 프레임을 먼저 보내고 같은 틱의 스냅샷을 뒤이어 보내므로, 이 탐지 결과가 방금 받은 프레임과 짝이 됩니다.
+            if not frames_updated:
+                continue
+            frames_updated = False
+            data = json.loads(message)
+            detections = data.get('perception', {}).get('detected_objects', [])
+            
+            put_latest(draw_q, (
+                frames[FrameChannel.FRAME], frames[FrameChannel.DEPTH],
+                frames[FrameChannel.EE_FRAME], frames[FrameChannel.EE_DEPTH],
+                detections,
+            ))
+        except json.JSONDecodeError as e:
+            print(f"JSON Decode Error: {e}")
+        except Exception as e:
+            print(f"Error: {e}")
+            import traceback
+            traceback.print_exc()
 
+def show(draw_q, stop_event):
+    """[Stage 3: 메인 스레드] 오버레이 + 4분할 합성 + imshow (GUI는 메인 스레드에서만 호출)"""
+    # 빈 이미지 처리 (검은색 캔버스)
+    dummy = np.zeros((480, 640, 3), dtype=np.uint8)
+    
+    # 4분할 화면 (2x2 Grid) - 표시 크기(0.8배)의 캔버스를 한 번만 할당하고 각 영상을 사분면에 바로 리사이즈
+    scale = DISPLAY_SCALE
+    canvas = None
+    tile_w = tile_h = 0
+    
+    while not stop_event.is_set():
+        try:
+            img_main, img_depth, img_ee, img_ee_depth, detections = draw_q.get(timeout=0.03)
+        except queue.Empty:
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+            continue
+        
+        if img_main is None: img_main = dummy
+        
+        # 타일 크기는 메인 영상 기준 (크기가 바뀔 때만 캔버스/빈 타일 재할당)
+        h1, w1 = img_main.shape[:2]
+        if canvas is None or tile_w != int(w1 * scale) or tile_h != int(h1 * scale):
+            tile_w, tile_h = int(w1 * scale), int(h1 * scale)
+            canvas = np.empty((tile_h * 2, tile_w * 2, 3), dtype=np.uint8)
+            # 스트림 없는 채널용 빈 타일 (표시 크기로 미리 렌더링 후 읽기 전용으로 재사용)
+            no_feed = np.zeros((tile_h, tile_w, 3), dtype=np.uint8)
+            cv2.putText(no_feed, "No Feed", (8, tile_h // 2), cv2.FONT_HERSHEY_SIMPLEX, scale, (128, 128, 128), 2)
+        quads = (
+            canvas[:tile_h, :tile_w], canvas[:tile_h, tile_w:],
+            canvas[tile_h:, :tile_w], canvas[tile_h:, tile_w:],
+        )
+        
+        # 오버레이 그리기
+        # pixel 좌표가 없어서 정확한 BBox는 못 그리지만, 정보 표시는 가능
+        # 추후 VisionBridge에서 pixel_center도 같이 보내주도록 수정하면 좋음
+        # (BBox는 원본 픽셀 좌표 기준이므로 메인 영상에는 리사이즈 전에 그림)
+        img_main = draw_overlay(img_main, detections, "World RGB")
+        
+        for src, quad in zip((img_main, img_depth, img_ee, img_ee_depth), quads):
+            if src is None:
+                np.copyto(quad, no_feed) # 매 프레임 빈 이미지 할당/리사이즈 없이 복사만
+            else:
+                cv2.resize(src, (tile_w, tile_h), dst=quad, interpolation=cv2.INTER_AREA)
+        
+        # 나머지 제목은 사분면(캔버스 뷰)에 표시 크기로 직접 그림
+        cv2.putText(quads[1], "World Depth", (8, 24), cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 2)
+        cv2.putText(quads[2], "Gripper RGB", (8, 24), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 255, 255), 2)
+        cv2.putText(quads[3], "Gripper Depth", (8, 24), cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 2)
+
+        cv2.imshow("MACH-VII Vision Debugger (Quad View)", canvas)
+        
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    stop_event.set()
     cv2.destroyAllWindows()
 
+def run():
+    """
+    수신 → 디코딩 → 표시 3단계 파이프라인
+    단계 사이는 2틱 분량의 큐로 연결하고, 가득 차면 오래된 항목을 버립니다. (처리량 = 가장 느린 단계 기준, 지연 ≤ 2프레임)
+    """
+    recv_q = queue.Queue(maxsize=2 * (len(FrameChannel) + 1)) # 서버 1틱 = 스냅샷 1 + 채널별 프레임 (2틱 분량)
+    draw_q = queue.Queue(maxsize=2)
+    stop_event = threading.Event()
+    
+    threading.Thread(target=recv_worker, args=(recv_q, stop_event), daemon=True, name="vd-recv").start()
+    threading.Thread(target=decode_worker, args=(recv_q, draw_q, stop_event), daemon=True, name="vd-decode").start()
+    try:
+        show(draw_q, stop_event)
+    finally:
+        stop_event.set()
+
 if __name__ == "__main__":
     try:
-        asyncio.run(listen_and_show())
+        run()
     except KeyboardInterrupt:
         print("Disconnected.")
@@ -1,5 +1,4 @@
 import time
-import math
 import numpy as np
 import os
 
@@ -32,6 +31,10 @@ class DofbotSimple:
         
         self.gripper_angle = None
         
+        #TCP 위치는 필요할 때만 FK로 계산 (관절 직접 설정 시 _fk_dirty만 표시)
+        self._last_pos = None
+        self._fk_dirty = False
+        
         #실제 하드웨어 상태와 IK모델을 동기화
         self._sync_hardware_state()
         print(">>> Standard IK Controller Loaded")
@@ -40,21 +43,17 @@ class DofbotSimple:
     def _sync_hardware_state(self):
 
         #IKpy 체인에 필요한 전체 링크 7개의 배열 생성
-        real_joints = [0.0] * 7
+        real_joints = np.zeros(7)
         
         #실제 서보 모터 수는 6개이므로 7개를 사용하지 않는다 
-        for i in range(1, 6):
-            angle = self.Arm.Arm_serial_servo_read(i)
-
-            #서보모터 관절을 읽지 못하면 중간 각도(90도)로 가정한다
-            if angle is None:
-                angle = 90
+        #서보모터 관절을 읽지 못하면 중간 각도(90도)로 가정한다
+        raw = [self.Arm.Arm_serial_servo_read(i) for i in range(1, 6)]
+        raw = np.array([90 if angle is None else angle for angle in raw], dtype=np.float64)
 
-            ##IKPy는 회전 중심이 0인 라디안 단위를 사용하므로
-            #서보 각도 범위(0~180)를 IK 각도 범위(-90 ~ 90)범위로 변환
-            #IK 계산 시준과 실제 로봇 기준이 다르므로 조정이 필요하다
-            radian = math.radians(angle - 90)
-            real_joints[i] = radian
+        ##IKPy는 회전 중심이 0인 라디안 단위를 사용하므로
+        #서보 각도 범위(0~180)를 IK 각도 범위(-90 ~ 90)범위로 변환 (5축 한 번에)
+        #IK 계산 시준과 실제 로봇 기준이 다르므로 조정이 필요하다
+        real_joints[1:6] = np.deg2rad(raw - 90)
 
         #그리퍼 상태 읽기
         gripper_val = self.Arm.Arm_serial_servo_read(6)
@@ -72,6 +71,20 @@ class DofbotSimple:
         
         print(f"Sync Position (Real): X={self.last_pos[0]:.3f}, Y={self.last_pos[1]:.3f}, Z={self.last_pos[2]:.3f}")
 
+    #마지막 TCP 위치 [x, y, z] - 관절만 바뀐 상태면 읽을 때 FK를 한 번 계산한다
+    @property
+    def last_pos(self):
+        if self._fk_dirty:
+            current_pos = self.chain.forward_kinematics(self.last_joints)[:3, 3]
+            self._last_pos = [current_pos[0], current_pos[1], current_pos[2]]
+            self._fk_dirty = False
+        return self._last_pos
+
+    @last_pos.setter
+    def last_pos(self, pos):
+        self._last_pos = pos
+        self._fk_dirty = False
+
     #def go_home(self):
         #self.Arm.Arm_serial_servo_write6(90, 90, 90, 90, 90, 5, 1000)
         #time.sleep(1.5)
@@ -95,11 +108,17 @@ class DofbotSimple:
     #자동으로 실제 서보모터에 이동명령을 내리기 때문에 각 관절 각도를 직접 계산 할 필요가 없다
     def move_to_xyz(self, x, y, z, duration_ms=1500):
         target_position = [x, y, z]
+
+        #이미 같은 목표로 명령했다면 IK/서보 명령 생략
+        last = self.last_pos
+        if last is not None and abs(x - last[0]) < 1e-4 and abs(y - last[1]) < 1e-4 and abs(z - last[2]) < 1e-4:
+            return
         
+        #직전 관절 각도에서 IK를 시작한다 (warm start - 보통 작은 이동이라 몇 번의 반복으로 수렴)
         ik_angles = self.chain.inverse_kinematics(
             target_position, 
             orientation_mode=None, 
-            # initial_position=self.last_joints
+            initial_position=self.last_joints
         )
 
         self.last_joints = ik_angles
@@ -131,24 +150,20 @@ class DofbotSimple:
             int(duration_ms)
         )
         
-        # FK로 예상 위치 계산 (상태 동기화)
-        ik_joints = [0] + [math.radians(j) for j in joints_deg] + [0]
+        # 관절 상태 동기화 (예상 위치 FK는 last_pos를 읽을 때 계산)
+        ik_joints = np.zeros(7)
+        ik_joints[1:6] = np.deg2rad(joints_deg)
         self.last_joints = ik_joints
-        transformation_matrix = self.chain.forward_kinematics(ik_joints)
-        current_pos = transformation_matrix[:3, 3]
-        self.last_pos = [current_pos[0], current_pos[1], current_pos[2]]
+        self._fk_dirty = True
 
     #IKPy에서 계산한 관절 각도를 서보모터 각도로 변환
     def _send_servos(self, ik_angles, duration_ms):
 
-        #라디안 -> 각도 변환 보정 오프셋
-        s1 = 90 + math.degrees(ik_angles[1])
-        s2 = 90 + math.degrees(ik_angles[2])
-        s3 = 90 + math.degrees(ik_angles[3])
-        s4 = 90 + math.degrees(ik_angles[4])
-        s5 = 90
+        #라디안 -> 각도 변환 보정 오프셋 (s1~s4는 IK 결과, s5는 90 고정)
+        servo = np.full(5, 90.0)
+        servo[:4] += np.rad2deg(ik_angles[1:5])
 
-        safe = [int(max(0, min(180, a))) for a in [s1, s2, s3, s4, s5]]
+        safe = np.clip(servo, 0, 180).astype(np.int32).tolist()
         
         #val = self.Arm.Arm_serial_servo_read(6)
         #s6 = val if val is not None else (self.gripper_angle or 90)
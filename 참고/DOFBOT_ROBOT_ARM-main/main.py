@@ -5,25 +5,59 @@ from flask_socketio import SocketIO
 import shared
 import robot_thread
 
+#orjson 사용 가능 여부 (없으면 Socket.IO 기본 json 모듈로 동작)
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+class OrjsonCompat:
+    """Socket.IO 패킷 직렬화용 json 모듈 대체 (dumps는 str 반환, numpy 스칼라도 직렬화)"""
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'secret!'
 
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+if ORJSON_AVAILABLE:
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading', json=OrjsonCompat)
+else:
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+
+#상태 변화가 없어도 이 주기로는 한 번씩 전송 (새로 접속한 클라이언트 동기화용)
+KEEPALIVE_SEC = 1.0
 
 def broadcast_data():
+    last_seq = -1
+    last_sent = 0.0
     while True:
+        #로봇 스레드가 상태를 바꿀 때까지 대기 (고정 sleep 대신 이벤트)
+        shared.state_event.wait(timeout=0.05)
+        shared.state_event.clear()
+
+        now = time.monotonic()
+        if shared.state_seq == last_seq and now - last_sent < KEEPALIVE_SEC:
+            continue
+
         robot_packet = {}
 
         with shared.state_lock:
+            last_seq = shared.state_seq
             robot_packet['ee'] = shared.robot_state.copy()
             robot_packet['joints'] = shared.joints_degrees[:]
 
         try:
             socketio.emit('robot_state', robot_packet)
+            last_sent = now
         except Exception:
             pass
-        
-        time.sleep(0.05)
 
 @socketio.on('connect')
 def handle_connect():
@@ -34,12 +68,14 @@ def handle_set_gripper(data):
     if 'gripper' in data:
         with shared.cmd_lock:
             shared.command["gripper_cmd"] = data['gripper']
+            shared.cmd_event.set()
 
 @socketio.on('set_pos')
 def handle_set_pos(data):
     if 'pos' in data:
         with shared.cmd_lock:
             shared.command["target_pos"] = data['pos']
+            shared.cmd_event.set()
 
 @socketio.on('set_force')
 def handle_set_force(data):
@@ -47,6 +83,7 @@ def handle_set_force(data):
     if "force" in data:
         with shared.cmd_lock:
             shared.command["force"] = data["force"]
+            shared.cmd_event.set()
             print(f"=== [SERVER] Shared Command Updated: {shared.command['gripper_cmd']} ===")
 
 @socketio.on('set_joints')
@@ -55,6 +92,7 @@ def handle_set_joints(data):
     if 'joints' in data:
         with shared.cmd_lock:
             shared.command["joint_cmd"] = data['joints']
+            shared.cmd_event.set()
         print(f"=== [SERVER] Received Joints Command: {data['joints']} ===")
 
 @socketio.on('set_max_velocity')
@@ -62,6 +100,7 @@ def handle_set_max_velocity(data):
     if 'max_velocity' in data:
         with shared.cmd_lock:
             shared.command["max_velocity"] = data['max_velocity']
+            shared.cmd_event.set()
 
 if __name__ == "__main__":
     print(">>> System Starting...")
@@ -1,6 +1,5 @@
 import threading
-import time
-import math
+import numpy as np
 import shared
 from dofbot_simple import DofbotSimple
 
@@ -17,8 +16,7 @@ def run_robot_loop():
             shared.robot_state["z"] = bot.last_pos[2]
             
             if hasattr(bot, 'last_joints'):
-                degrees = [math.degrees(rad) for rad in bot.last_joints]
-                shared.joints_degrees = degrees[1:6]
+                shared.joints_degrees = np.rad2deg(bot.last_joints[1:6]).tolist()
         
     except Exception as e:
         print(f"!!! Robot Init Failed: {e}")
@@ -83,13 +81,21 @@ def run_robot_loop():
             except Exception as e:
                 print(f"Move Error: {e}")
 
+        pos = bot.last_pos
+        joints = np.rad2deg(bot.last_joints[1:6]).tolist() if hasattr(bot, 'last_joints') else None
         with shared.state_lock:
-            shared.robot_state["x"] = bot.last_pos[0]
-            shared.robot_state["y"] = bot.last_pos[1]
-            shared.robot_state["z"] = bot.last_pos[2]
-            
-            if hasattr(bot, 'last_joints'):
-                degrees = [math.degrees(rad) for rad in bot.last_joints]
-                shared.joints_degrees = degrees[1:6]
+            #값이 바뀐 경우에만 갱신 후 브로드캐스트 스레드를 깨운다
+            state = shared.robot_state
+            if (state["x"] != pos[0] or state["y"] != pos[1] or state["z"] != pos[2]
+                    or (joints is not None and joints != shared.joints_degrees)):
+                state["x"] = pos[0]
+                state["y"] = pos[1]
+                state["z"] = pos[2]
+                if joints is not None:
+                    shared.joints_degrees = joints
+                shared.state_seq += 1
+                shared.state_event.set()
 
-        time.sleep(0.05)
+        #새 명령이 들어올 때까지 대기 (명령이 없어도 0.1초마다 상태 갱신)
+        shared.cmd_event.wait(timeout=0.1)
+        shared.cmd_event.clear()
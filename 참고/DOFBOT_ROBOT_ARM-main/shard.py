@@ -10,6 +10,13 @@ latest_frame_depth = None
 robot_state = {"x": 0.0, "y": 0.0, "z": 0.0}
 joints_degrees = [0, 0, 0, 0, 0]
 
+#로봇 상태가 실제로 바뀔 때마다 state_seq 증가 + state_event 알림 (브로드캐스트 스레드가 대기)
+state_seq = 0
+state_event = threading.Event()
+
+#SocketIO 핸들러가 command에 새 명령을 넣으면 set (로봇 스레드가 고정 주기 대신 이 이벤트로 깨어남)
+cmd_event = threading.Event()
+
 object_info = {
     "exists": False,
     "x": 0.0, "y": 0.0, "z": 0.0,
@@ -1,11 +1,12 @@
 # app.py
 import streamlit as st
+import streamlit.components.v1 as components
 import socketio
-import time
-import queue
 
 
 API_URL = "http://localhost:5000"
+STATE_REFRESH_SEC = 0.05 # 상태 표시 영역(fragment)만 갱신하는 주기
+JOINT_LIMITS = ((-90.0, 90.0), (-55.0, 55.0), (-65.0, 65.0), (-90.0, 90.0), (-90.0, 90.0)) # 조인트 슬라이더 범위 (deg)
 
 # ====================================
 # 페이지 설정
@@ -18,6 +19,26 @@ st.set_page_config(
 
 
 
+# ====================================
+# 최신 값 1칸 보관함
+# ====================================
+class LatestSlot:
+    """
+    소켓 스레드가 put, UI 스크립트가 get 하는 최신 값 보관함 (항상 마지막 값만 유지)
+    참조 하나를 바꿔 끼우는 대입은 GIL 하에서 원자적이므로 락/큐가 필요 없습니다.
+    """
+    __slots__ = ('_v',)
+
+    def __init__(self):
+        self._v = None
+
+    def put(self, v):
+        self._v = v
+
+    def get(self):
+        return self._v
+
+
 # ====================================
 # 소켓 관리자 (캐싱하여 재실행 방지)
 # ====================================
@@ -25,24 +46,16 @@ st.set_page_config(
 def get_socket_manager():
     sio = socketio.Client(reconnection=True)
 
-    robot_q  = queue.Queue()
-    object_q = queue.Queue()
-
-    @sio.on('robot_state')
-    def on_robot(data):
-        if robot_q.qsize() > 2:
-            robot_q.get_nowait()
-        robot_q.put(data)
+    state_slot = LatestSlot()
 
-    @sio.on('object_state')
-    def on_object(data):
-        if object_q.qsize() > 2:
-            object_q.get_nowait()
-        object_q.put(data)
+    # 로봇 + 오브젝트 상태 통합 이벤트
+    @sio.on('state')
+    def on_state(data):
+        state_slot.put(data)
 
-    return sio, robot_q, object_q
+    return sio, state_slot
 
-sio, robot_q, object_q = get_socket_manager()
+sio, state_slot = get_socket_manager()
 
 
 
@@ -70,29 +83,27 @@ if "object_fix" not in st.session_state: st.session_state.object_fix = False
 # ====================================
 # 연결 관리 및 데이터 동기화
 # ====================================
-# 소켓이 끊겨있으면 연결 시도
-if not sio.connected:
-    try:
-        sio.connect(API_URL, transports=['websocket', 'polling'], wait_timeout=3)
-        print(">>> Socket Connected")
-    except Exception as e:
-        pass
-
-
-# 큐에 쌓인 최신 데이터 하나만 가져와서 세션에 반영
-# Robot
-if not robot_q.empty():
-    while not robot_q.empty():
-        latest = robot_q.get_nowait()
-    st.session_state.server_data['ee'] = latest['ee']
-    st.session_state.server_data['joints'] = latest['joints']
-    st.session_state.server_data['gripper'] = latest['gripper']
-
-# Object
-if not object_q.empty():
-    while not object_q.empty():
-        latest = object_q.get_nowait()
-    st.session_state.server_data['object'] = latest['object']
+def sync_server_data():
+    """소켓 연결 확인 + 최신 서버 데이터를 세션에 반영 (전체 실행 / 상태 fragment 갱신 시마다 호출)"""
+    # 소켓이 끊겨있으면 연결 시도
+    if not sio.connected:
+        try:
+            sio.connect(API_URL, transports=['websocket', 'polling'], wait_timeout=3)
+            print(">>> Socket Connected")
+        except Exception as e:
+            pass
+
+    # 최신 데이터를 세션에 반영
+    latest = state_slot.get()
+    if latest is not None:
+        # Robot
+        st.session_state.server_data['ee'] = latest['ee']
+        st.session_state.server_data['joints'] = latest['joints']
+        st.session_state.server_data['gripper'] = latest['gripper']
+        # Object
+        st.session_state.server_data['object'] = latest['object']
+
+sync_server_data()
 
 
 
@@ -148,10 +159,37 @@ def send_object_pos_command():
 # ====================================
 # 데이터 단축 참조
 srv = st.session_state.server_data
-ee = srv['ee']
 joints_fb = srv['joints']
-gripper_state = srv["gripper"]
-obj = srv['object']
+
+
+# ============ 실시간 상태 표시 (fragment) ============
+# 스크립트 전체를 20Hz로 재실행하지 않고, 서버 데이터를 보여주는 영역만 주기적으로 다시 그림
+@st.fragment(run_every=STATE_REFRESH_SEC)
+def robot_state_panel():
+    sync_server_data()
+    srv = st.session_state.server_data
+    ee = srv['ee']
+
+    # End-Effector
+    st.info(f"End-Effector: ({ee['x']}, {ee['y']}, {ee['z']})")
+    
+    # Joints
+    with st.expander("Joint Angles"):
+        st.write(f"Angles: {srv['joints']}")
+
+    st.info(f"gripper: {srv['gripper']}")
+
+
+@st.fragment(run_every=STATE_REFRESH_SEC)
+def object_state_panel():
+    obj = st.session_state.server_data['object'] # 데이터 동기화는 robot_state_panel에서 수행
+
+    if obj['exists']:
+        st.success("Object Detected")
+        st.write(f"Pos: ({obj['x']}, {obj['y']}, {obj['z']})")
+        st.write(f"Dist: {obj['distance']}")
+    else:
+        st.warning("No Object")
 
 
 # 사이드바에 연결 상태 표시
@@ -171,17 +209,17 @@ col_1, col_2, col_3 = st.columns([2, 1, 1])
 with col_1:
     # Camera
     st.subheader("Live Feed")
-    st.markdown(f'<img src="{API_URL}/" width="100%" style="border-radius: 10px;">', unsafe_allow_html=True)
+    # iframe은 src가 같으면 전체 재실행에도 다시 마운트되지 않아 MJPEG 연결이 유지됨 (600*480 스트림 + 여백)
+    components.iframe(f"{API_URL}/", height=500, scrolling=False)
     
     # Joint Control
     st.divider()
     st.subheader("Joint Control")
-    joint_limits = [[-90.0,90.0], [-55.0,55.0], [-65.0,65.0], [-90.0,90.0], [-90.0,90.0]]
     # Joint Slider
-    for i in range(5):
+    for i, (lower, upper) in enumerate(JOINT_LIMITS):
         st.slider(
             f"Joint {i+1}", 
-            joint_limits[i][0], joint_limits[i][1], 
+            lower, upper, 
             joints_fb[i],
             step=0.1,
             key=f"joint_{i}", 
@@ -208,13 +246,7 @@ with col_2:
     # End-Effector
     st.divider()
     st.subheader("Robot State")
-    st.info(f"End-Effector: ({ee['x']}, {ee['y']}, {ee['z']})")
-    
-    # Joints
-    with st.expander("Joint Angles"):
-        st.write(f"Angles: {joints_fb}")
-
-    st.info(f"gripper: {gripper_state}")
+    robot_state_panel()
 
 
 # ============ Column 3: Object Control ============
@@ -241,17 +273,4 @@ with col_3:
     st.number_input("Obj Z", value=0.0, step=0.01, key="input_obj_z")
     st.button("오브젝트 이동", on_click=send_object_pos_command, use_container_width=True)
 
-    if obj['exists']:
-        st.success("Object Detected")
-        st.write(f"Pos: ({obj['x']}, {obj['y']}, {obj['z']})")
-        st.write(f"Dist: {obj['distance']}")
-    else:
-        st.warning("No Object")
-
-
-
-# ====================================
-# 자동 갱신 루프
-# ====================================
-time.sleep(0.05)
-st.rerun()
\ No newline at end of file
+    object_state_panel()
\ No newline at end of file
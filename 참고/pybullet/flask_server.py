@@ -4,47 +4,72 @@ from flask_socketio import SocketIO, emit
 import cv2
 import json
 import time
-import threading 
+import struct
+import threading
 import shared_data as shared
 import numpy as np
+from jpeg_codec import encode_jpeg
+
+# numexpr 사용 가능 여부 (없으면 NumPy 제자리 연산으로 동작)
+NUMEXPR_AVAILABLE = False
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+# zstandard 사용 가능 여부 (없으면 Depth를 압축 없이 전송)
+ZSTD_AVAILABLE = False
+try:
+    import zstandard
+    _zstd = zstandard.ZstdCompressor(level=1) # 속도 우선 (Depth는 인접 픽셀이 비슷해 level 1로도 충분히 줄어듦)
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# flask-sock + msgpack 사용 가능 여부 (없으면 상태는 Socket.IO 'state' 이벤트로만 송출)
+STATE_WS_AVAILABLE = False
+try:
+    from flask_sock import Sock
+    import msgpack
+    STATE_WS_AVAILABLE = True
+except ImportError:
+    STATE_WS_AVAILABLE = False
 
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'secret!'
 
 # async_mode='threading'을 명시하여 표준 스레드 사용
+# (eventlet/gevent는 monkey patch로 PyBullet 루프까지 같은 허브에 올라가 렌더링 중 모든 클라이언트가 멈추므로 사용하지 않음)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+sock = Sock(app) if STATE_WS_AVAILABLE else None
 
 
 # ====================================
 # [HTTP] Video Stream
 # ====================================
-def gen():
+# JPEG 인코딩은 시뮬레이션 루프에서 카메라 틱당 1회만 수행하고, 스트림은 캐시된 bytes를 그대로 송출
+def _gen_cached(attr):
+    last_sent = None
     while True:
+        shared.frame_event.wait(timeout=1.0) # 새 카메라 프레임까지 대기
         with shared.frame_lock:
-            if shared.latest_frame is None:
-                time.sleep(0.01)
-                continue
-            frame_to_send = shared.latest_frame.copy()
+            jpeg_bytes = getattr(shared, attr)
         
-        _, jpeg = cv2.imencode('.jpg', frame_to_send, [int(cv2.IMWRITE_JPEG_QUALITY), 50])
+        if jpeg_bytes is None or jpeg_bytes is last_sent: # 아직 프레임 없음 / 이미 보낸 프레임
+            continue
+        last_sent = jpeg_bytes
         yield (b"--frame\r\n"
-               b"Content-Type: image/jpeg\r\n\r\n" + jpeg.tobytes() + b"\r\n")
-        time.sleep(0.05)
+               b"Content-Type: image/jpeg\r\n\r\n" + jpeg_bytes + b"\r\n")
+
+
+def gen():
+    return _gen_cached("latest_frame_jpeg")
 
 
 def gen_ee():
-    while True:
-        with shared.frame_lock:
-            if shared.latest_ee_frame is None:
-                time.sleep(0.01)
-                continue
-            frame_to_send = shared.latest_ee_frame.copy()
-        
-        _, jpeg = cv2.imencode('.jpg', frame_to_send, [int(cv2.IMWRITE_JPEG_QUALITY), 50])
-        yield (b"--frame\r\n"
-               b"Content-Type: image/jpeg\r\n\r\n" + jpeg.tobytes() + b"\r\n")
-        time.sleep(0.05)
+    return _gen_cached("latest_ee_frame_jpeg")
 
 # ============ GET Video ============
 @app.route("/")
@@ -58,19 +83,67 @@ def snapshot():
     with shared.frame_lock:
         if shared.latest_frame is None:
             return "No frame yet", 503
-        frame = shared.latest_frame.copy()
+        frame = shared.latest_frame # 시뮬레이션이 매 틱 새 배열로 교체하므로 참조만 가져옴 (복사 불필요)
         
-    _, jpeg = cv2.imencode(".jpg", frame)
-    return Response(jpeg.tobytes(), mimetype="image/jpeg")
+    return Response(encode_jpeg(frame), mimetype="image/jpeg")
 
 
 # ============ GET Depth ============
+def latest_depth_m(raw_attr, cache_attr):
+    """
+    원본 Depth 버퍼 → 실제 거리(m) 지연 변환
+    요청이 없는 동안은 변환하지 않고, 같은 프레임은 한 번만 변환해 캐시합니다.
+    """
+    with shared.frame_lock:
+        raw = getattr(shared, raw_attr)
+        cached = getattr(shared, cache_attr)
+        near, far = shared.depth_range
+    if raw is None:
+        return None
+    if cached is not None and cached[0] is raw: # 이미 변환된 프레임
+        return cached[1]
+
+    # 실제 거리로 변환: far*near / (far - (far-near)*raw)
+    # 결과 배열 1개만 할당하고 중간 임시 배열 없이 한 번에 계산 (캐시로 여러 요청이 공유하므로 재사용 버퍼는 쓰지 않음)
+    fn, k = far * near, far - near
+    depth_m = np.empty_like(raw)
+    if NUMEXPR_AVAILABLE:
+        ne.evaluate("fn / (far - k * raw)", local_dict={"fn": fn, "far": far, "k": k, "raw": raw}, out=depth_m)
+    else:
+        np.multiply(raw, -k, out=depth_m)
+        depth_m += far
+        np.divide(fn, depth_m, out=depth_m)
+    with shared.frame_lock:
+        setattr(shared, cache_attr, (raw, depth_m))
+    return depth_m
+
+
+def depth_response(depth):
+    """
+    Depth 배열 응답: 기본은 원시 바이너리 (C-order, little-endian), 형상/타입은 헤더로 전달
+    - ?dtype=float16 : 용량 절반 (정밀도 손실 - 원거리에서 mm 단위 오차)
+    - ?format=json   : 기존 2차원 리스트 JSON (하위 호환)
+    클라이언트가 Accept-Encoding에 zstd를 포함하면 zstd로 압축해 보냅니다. (requests/urllib3는 zstandard 설치 시 자동 요청·해제)
+    """
+    if request.args.get("format") == "json":
+        return jsonify(depth.tolist())
+
+    dtype = "float16" if request.args.get("dtype") == "float16" else "float32"
+    body = depth.astype("<f2" if dtype == "float16" else "<f4", copy=False).tobytes()
+    headers = {"X-Shape": f"{depth.shape[0]},{depth.shape[1]}", "X-Dtype": dtype}
+    if ZSTD_AVAILABLE and "zstd" in request.headers.get("Accept-Encoding", ""):
+        body = _zstd.compress(body)
+        headers["Content-Encoding"] = "zstd"
+    return Response(body, mimetype="application/octet-stream", headers=headers)
+
+
 @app.route("/depth")
 def get_depth():
-    with shared.frame_lock:
-        depth = shared.latest_frame_depth
+    depth = latest_depth_m("latest_frame_depth_raw", "latest_frame_depth")
+    if depth is None:
+        return "No frame yet", 503
 
-    return jsonify(depth.tolist())
+    return depth_response(depth)
 
 
 
@@ -86,47 +159,91 @@ def ee_snapshot():
     with shared.frame_lock:
         if shared.latest_ee_frame is None:
             return "No frame yet", 503
-        frame = shared.latest_ee_frame.copy()
+        frame = shared.latest_ee_frame # 시뮬레이션이 매 틱 새 배열로 교체하므로 참조만 가져옴 (복사 불필요)
         
-    _, jpeg = cv2.imencode(".jpg", frame)
-    return Response(jpeg.tobytes(), mimetype="image/jpeg")
+    return Response(encode_jpeg(frame), mimetype="image/jpeg")
 
 
 # ============ GET EE-Depth ============
 @app.route("/ee-depth")
 def get_ee_depth():
-    with shared.frame_lock:
-        depth = shared.latest_ee_frame_depth
+    depth = latest_depth_m("latest_ee_frame_depth_raw", "latest_ee_frame_depth")
+    if depth is None:
+        return "No frame yet", 503
 
-    return jsonify(depth.tolist())
+    return depth_response(depth)
 
 
 
 # ====================================
 # [WebSocket] 데이터 송출 (Server -> Client)
 # ====================================
+KEEPALIVE_SEC = 1.0 # 상태가 그대로여도 이 주기로는 재전송 (신규/재접속 클라이언트 동기화)
+
 def broadcast_data():
+    last_packet = None
+    last_sent = 0.0
     while True:
-        robot_packet = {}
-        object_packet = {}
+        packet = {}
 
         # ============ 로봇 상태 (ee, joints) ============
         with shared.state_lock:
-            robot_packet['ee'] = shared.robot_state.copy()
-            robot_packet['joints'] = shared.joints_degrees[:]
-            robot_packet['gripper'] = shared.gripper_state
+            packet['ee'] = shared.robot_state.copy()
+            packet['joints'] = shared.joints_degrees[:]
+            packet['gripper'] = shared.gripper_state
             
             # 오브젝트 상태 (좌표, 직선거리)
-            object_packet['object'] = shared.object_info.copy()
+            packet['object'] = shared.object_info.copy()
 
         # ============ 데이터 전송 ============
-        try:
-            socketio.emit('robot_state', robot_packet)
-            socketio.emit('object_state', object_packet)
-        except Exception:
-            pass 
+        # 정지 상태에서 같은 패킷이 느린 클라이언트의 송신 버퍼에 쌓이지 않도록 변경 시에만 전송
+        now = time.monotonic()
+        if packet != last_packet or now - last_sent >= KEEPALIVE_SEC:
+            # 로봇/오브젝트 상태를 하나의 이벤트로 묶어 틱당 WebSocket 메시지 1개만 전송
+            try:
+                socketio.emit('state', packet)
+                last_packet = packet
+                last_sent = now
+            except Exception:
+                pass 
+            publish_state_ws(packet)
         
-        time.sleep(0.05) 
+        socketio.sleep(0.05) # async_mode에 맞는 sleep (threading: time.sleep / eventlet·gevent: 협력적 양보)
+
+
+
+# ====================================
+# [WebSocket] 상태 전용 raw WebSocket + msgpack 채널 (선택)
+# ====================================
+# Socket.IO 'state'와 같은 패킷을 msgpack으로 한 번만 직렬화해 모든 /ws/state 클라이언트에 전송
+_state_cond = threading.Condition()
+_state_seq = 0
+_state_bytes = None
+
+def publish_state_ws(packet):
+    global _state_seq, _state_bytes
+    if not STATE_WS_AVAILABLE:
+        return
+    data = msgpack.packb(packet)
+    with _state_cond:
+        _state_seq += 1
+        _state_bytes = data
+        _state_cond.notify_all()
+
+
+if STATE_WS_AVAILABLE:
+    @sock.route('/ws/state')
+    def state_ws(ws):
+        """클라이언트별 송신 루프: 새 패킷이 발행될 때만 깨어나 최신 패킷만 전송 (밀린 패킷은 쌓지 않음)"""
+        sent_seq = -1
+        while True:
+            with _state_cond:
+                _state_cond.wait_for(lambda: _state_seq != sent_seq, timeout=KEEPALIVE_SEC * 2)
+                seq, data = _state_seq, _state_bytes
+            if data is None or seq == sent_seq:
+                continue
+            ws.send(data) # 연결이 끊기면 예외로 루프 종료
+            sent_seq = seq
 
 
 
@@ -142,54 +259,56 @@ def handle_connect():
 @socketio.on('set_joints')
 def handle_set_joints(data):
     if 'joints' in data:
-        with shared.cmd_lock:
-            shared.command["joint_cmd"] = data['joints']
+        shared.cmd_queue.put(("joint_cmd", data['joints']))
 
 # ============ Gripper ============
 @socketio.on('set_gripper')
 def handle_set_gripper(data):
     if 'gripper' in data:
-        with shared.cmd_lock:
-            shared.command["gripper_cmd"] = data['gripper']
+        shared.cmd_queue.put(("gripper_cmd", data['gripper']))
 
 
 # ============ 목표 좌표 ============
 @socketio.on('set_pos')
 def handle_set_pos(data):
     if 'pos' in data:
-        with shared.cmd_lock:
-            shared.command["target_pos"] = data['pos']
+        shared.cmd_queue.put(("target_pos", data['pos']))
+
+
+# set_pos 바이너리 버전: little-endian float32 (x, y, z) 12바이트
+SET_POS_FRAME = struct.Struct('<fff')
+
+@socketio.on('set_pos_bin')
+def handle_set_pos_bin(data):
+    if len(data) == SET_POS_FRAME.size:
+        shared.cmd_queue.put(("target_pos", list(SET_POS_FRAME.unpack(data))))
 
 
 # ============ POST 로봇 힘 ============
 @socketio.on('set_force')
 def handle_set_force(data):
     if "force" in data:
-        with shared.cmd_lock:
-            shared.command["force"] = data["force"]
+        shared.cmd_queue.put(("force", data["force"]))
 
 
 # ============ 최대 속도 ============
 @socketio.on('set_max_velocity')
 def handle_set_max_velocity(data):
     if 'max_velocity' in data:
-        with shared.cmd_lock:
-            shared.command["max_velocity"] = data['max_velocity']
+        shared.cmd_queue.put(("max_velocity", data['max_velocity']))
 
 
 # ============ 오브젝트 생성/제거  ============
 @socketio.on('set_object')
 def handle_set_object(data):
-    with shared.cmd_lock:
-        shared.command["object_cmd"] = data
+    shared.cmd_queue.put(("object_cmd", data))
 
 
 # ============ 오브젝트 위치 제어 ============
 @socketio.on('set_object_pos')
 def handle_set_object_pos(data):
     if 'pos' in data:
-        with shared.cmd_lock:
-            shared.command["object_pos_cmd"] = data['pos']
+        shared.cmd_queue.put(("object_pos_cmd", data['pos']))
 
 
 
@@ -199,9 +318,8 @@ def handle_set_object_pos(data):
 def run_flask():
     print(">>> Flask SocketIO Server Started on port 5000 (Threading Mode)")
     
-    # 데이터 전송 백그라운드 스레드 시작
-    t = threading.Thread(target=broadcast_data, daemon=True)
-    t.start()
+    # 데이터 전송 백그라운드 작업 시작 (async_mode에 맞는 스레드/그린렛으로 생성)
+    socketio.start_background_task(broadcast_data)
     
     # allow_unsafe_werkzeug=True 옵션 추가
     socketio.run(app, host="0.0.0.0", port=5000, debug=False, use_reloader=False, allow_unsafe_werkzeug=True)
\ No newline at end of file
@@ -0,0 +1,22 @@
+# jpeg_codec.py
+import cv2
+
+# libjpeg-turbo(PyTurboJPEG) 사용 가능 여부 (없으면 cv2.imencode로 동작)
+TURBOJPEG_AVAILABLE = False
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _tj = TurboJPEG() # 인코더 인스턴스는 재사용 (생성 시 라이브러리 로드 비용)
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, OSError, RuntimeError):
+    TURBOJPEG_AVAILABLE = False
+
+
+def encode_jpeg(frame, quality=95):
+    """BGR 프레임 → JPEG bytes (libjpeg-turbo SIMD 인코더 우선, 실패 시 cv2)"""
+    if TURBOJPEG_AVAILABLE:
+        try:
+            return _tj.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)
+        except Exception:
+            pass
+    _, jpeg = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return jpeg.tobytes()
@@ -5,6 +5,7 @@ import numpy as np
 import cv2
 import math
 import shared_data as shared
+from jpeg_codec import encode_jpeg
 
 def run_simulation():
     # ====================================
@@ -20,9 +21,12 @@ def run_simulation():
     SIM_DT = 1.0 / SIM_HZ
     CAM_HZ = 30.0    
     CAM_DT = 1.0 / CAM_HZ
+    STATE_HZ = 60.0   # 로봇/오브젝트 상태 발행 주기
+    STATE_DT = 1.0 / STATE_HZ
     
     last_time = time.time()
     last_cam_time = time.time()
+    last_state_time = 0.0
     
     # ============ Object 변수 ============
     urdf_dict = {
@@ -37,6 +41,10 @@ def run_simulation():
     # 투명 발판
     plate_id = None
     no_contact_steps = 0
+    
+    # ============ 명령 상태 ============
+    # Flask가 큐에 넣은 명령을 시뮬레이션 스레드가 소유하는 로컬 상태로 옮겨 사용 (락 없음)
+    command = dict(shared.command_defaults)
 
     
     # ====================================
@@ -59,6 +67,7 @@ def run_simulation():
     for i in range(num_joints):
         info = p.getJointInfo(robot_id, i)
         joint_limits.append((info[8], info[9]))
+    arm_limits = [joint_limits[j] for j in arm_joints] # IK 해 클램프용 (arm_joints 순서)
     
     # End-Effector Index 설정
     for i in range(num_joints):
@@ -84,6 +93,7 @@ def run_simulation():
     # 카메라 렌즈 설정
     near = 0.01 # (최소) 렌더링 거리
     far = 10.0 # (최대) 렌더링 거리
+    shared.depth_range = (near, far) # Depth 거리 변환은 요청 시 Flask 쪽에서 수행
     
     projection_matrix = p.computeProjectionMatrixFOV(
         60, # 시야각
@@ -108,6 +118,8 @@ def run_simulation():
     # 시뮬레이션 Loop
     # ====================================
     print(">>> PyBullet Simulation Started")
+    if not p.isNumpyEnabled():
+        print(">>> [Warn] PyBullet numpy 지원 없이 빌드됨 - 카메라 이미지가 튜플로 반환되어 변환 비용이 큽니다.")
 
     while True:
         current_time = time.time()
@@ -115,189 +127,201 @@ def run_simulation():
 
         
 
-        with shared.cmd_lock:
-            # ====================================
-            # 오브젝트 제어
-            # ====================================
+        # ====================================
+        # 명령 수신 (큐 비우기)
+        # ====================================
+        # 종류별로 마지막 명령만 남김 (처리 조건이 안 맞는 명령은 다음 틱까지 유지)
+        while not shared.cmd_queue.empty():
+            kind, payload = shared.cmd_queue.get_nowait()
+            command[kind] = payload
+
+        # ====================================
+        # 오브젝트 제어
+        # ====================================
+        
+        # ============ 오브젝트 생성/제거 ============
+        if command["object_cmd"]:
+            cmd = command["object_cmd"]
             
-            # ============ 오브젝트 생성/제거 ============
-            if shared.command["object_cmd"]:
-                cmd = shared.command["object_cmd"]
+            # 생성
+            if cmd["op"] == "create" and object_id is None:
+                urdf_name = urdf_dict.get(cmd["object"], "duck_vhacd")
                 
-                # 생성
-                if cmd["op"] == "create" and object_id is None:
-                    urdf_name = urdf_dict.get(cmd["object"], "duck_vhacd")
-                    
-                    # 사이즈 설정
-                    size = 0.75
-                    if urdf_name == "soccerball":
-                        size = 0.05
-                    elif urdf_name == "mug":
-                        size = 0.45
-                        
-                    # 회전 설정
-                    if urdf_name == "mug":
-                        object_quaternion = [0,0,0,1]
-                    else: object_quaternion = p.getQuaternionFromEuler([math.pi/2, 0, math.pi/2])
-                    
-                    # 위치 설정
-                    base_pos = [0.15,0,0.02]
-                    if urdf_name == "teddy_vhacd": 
-                        base_pos[1] -= 0.07
-                        base_pos[2] -= 0.02
-                        
-                    # 오브젝트 생성
-                    object_id = p.loadURDF(f"{urdf_name}.urdf", basePosition=base_pos, baseOrientation=object_quaternion, globalScaling=size, useFixedBase=False)
+                # 사이즈 설정
+                size = 0.75
+                if urdf_name == "soccerball":
+                    size = 0.05
+                elif urdf_name == "mug":
+                    size = 0.45
                     
-                    p.changeDynamics(object_id, -1, lateralFriction=1.2) # 마찰력 설정
-                    
-                    # 투명 발판 설정
-                    if cmd["fix"] == True:
-                        plate_id = p.createMultiBody(
-                            baseMass=0,
-                            baseCollisionShapeIndex=plate_col,
-                            baseVisualShapeIndex=plate_vis,
-                            basePosition=[0.15, 0, 0.01]
-                        )
-                    
-                    
-                # 삭제
-                elif cmd["op"] == "delete" and object_id is not None:
-                    p.removeBody(object_id)
-                    object_id = None
-                    if plate_id is not None:
-                        p.removeBody(plate_id)  
-                        plate_id = None
-                    
-                shared.command["object_cmd"] = None
-
-
-            # ============ 오브젝트 위치 제어 ============
-            if shared.command["object_pos_cmd"] and object_id is not None:
-                object_pos = shared.command["object_pos_cmd"]
+                # 회전 설정
+                if urdf_name == "mug":
+                    object_quaternion = [0,0,0,1]
+                else: object_quaternion = p.getQuaternionFromEuler([math.pi/2, 0, math.pi/2])
+                
+                # 위치 설정
+                base_pos = [0.15,0,0.02]
+                if urdf_name == "teddy_vhacd": 
+                    base_pos[1] -= 0.07
+                    base_pos[2] -= 0.02
                     
-                p.resetBasePositionAndOrientation(object_id, object_pos, object_quaternion)
-                # 투명 발판 위치 조정
-                if plate_id is not None:
-                    object_pos[2] -= 0.03
-                    p.resetBasePositionAndOrientation(plate_id, shared.command["object_pos_cmd"], [0,0,0,1])
-                elif cmd["fix"]:
+                # 오브젝트 생성
+                object_id = p.loadURDF(f"{urdf_name}.urdf", basePosition=base_pos, baseOrientation=object_quaternion, globalScaling=size, useFixedBase=False)
+                
+                p.changeDynamics(object_id, -1, lateralFriction=1.2) # 마찰력 설정
+                
+                # 투명 발판 설정
+                if cmd["fix"] == True:
                     plate_id = p.createMultiBody(
                         baseMass=0,
                         baseCollisionShapeIndex=plate_col,
                         baseVisualShapeIndex=plate_vis,
-                        basePosition=object_pos
+                        basePosition=[0.15, 0, 0.01]
                     )
-                shared.command["object_pos_cmd"] = None
-            
-            
-            # ============ 투명 발판 제거 ============
-            if plate_id is not None:
-                contacts = p.getContactPoints(
-                    bodyA=object_id,
-                    bodyB=plate_id
-                )
                 
-                # 60 프레임 이상 오브젝트와 떨어졌을 경우 제거
-                no_contact_steps += 1 if len(contacts) == 0 else 0
-                if no_contact_steps > 60:
+                
+            # 삭제
+            elif cmd["op"] == "delete" and object_id is not None:
+                p.removeBody(object_id)
+                object_id = None
+                if plate_id is not None:
                     p.removeBody(plate_id)  
                     plate_id = None
-                    no_contact_steps = 0
+                
+            command["object_cmd"] = None
+
+
+        # ============ 오브젝트 위치 제어 ============
+        if command["object_pos_cmd"] and object_id is not None:
+            object_pos = command["object_pos_cmd"]
+                
+            p.resetBasePositionAndOrientation(object_id, object_pos, object_quaternion)
+            # 투명 발판 위치 조정
+            if plate_id is not None:
+                object_pos[2] -= 0.03
+                p.resetBasePositionAndOrientation(plate_id, command["object_pos_cmd"], [0,0,0,1])
+            elif cmd["fix"]:
+                plate_id = p.createMultiBody(
+                    baseMass=0,
+                    baseCollisionShapeIndex=plate_col,
+                    baseVisualShapeIndex=plate_vis,
+                    basePosition=object_pos
+                )
+            command["object_pos_cmd"] = None
+        
+        
+        # ============ 투명 발판 제거 ============
+        if plate_id is not None:
+            contacts = p.getContactPoints(
+                bodyA=object_id,
+                bodyB=plate_id
+            )
+            
+            # 60 프레임 이상 오브젝트와 떨어졌을 경우 제거
+            no_contact_steps += 1 if len(contacts) == 0 else 0
+            if no_contact_steps > 60:
+                p.removeBody(plate_id)  
+                plate_id = None
+                no_contact_steps = 0
+        
+        
+        # ====================================
+        # 로봇 동작 수행
+        # ====================================
+
+        # ============ 로봇 제어 변수 설정 ============
+        target_pos = command["target_pos"] # 목표 좌표
+        force = command["force"] # 힘
+        max_vel = command["max_velocity"] # 최대 속도
+        
+        
+        # ============ IK 제어 ============
+        if target_pos is not None:
+            ik_solution = p.calculateInverseKinematics(
+                robot_id, end_effector_index, target_pos,
+                maxNumIterations=200, residualThreshold=1e-4
+            )
+            for joint_idx, angle, (lower, upper) in zip(arm_joints, ik_solution, arm_limits):
+                angle = max(min(angle, upper), lower)
+                p.setJointMotorControl2(robot_id, joint_idx, p.POSITION_CONTROL, angle, force=force, maxVelocity=max_vel)
+            command["target_pos"] = None
+            
+
+        # ============ Joints 직접 제어 ============
+        if command["joint_cmd"]:
+            joints_angles = command["joint_cmd"]
             
+            # 로봇 제어
+            for idx, angle in enumerate(joints_angles):
+                rad_angle = math.radians(angle) # degree -> radian
+                
+                p.setJointMotorControl2(
+                    robot_id, 
+                    arm_joints[idx], 
+                    p.POSITION_CONTROL, 
+                    rad_angle, 
+                    force=force, 
+                    maxVelocity=max_vel
+                )
             
-            # ====================================
-            # 로봇 동작 수행
-            # ====================================
-
-            # ============ 로봇 제어 변수 설정 ============
-            target_pos = shared.command["target_pos"] # 목표 좌표
-            force = shared.command["force"] # 힘
-            max_vel = shared.command["max_velocity"] # 최대 속도
+            command["joint_cmd"] = None
             
             
-            # ============ IK 제어 ============
-            if target_pos is not None:
-                ik_solution = p.calculateInverseKinematics(
-                    robot_id, end_effector_index, target_pos,
-                    maxNumIterations=200, residualThreshold=1e-4
+        # ============ Gripper 제어 ============
+        if command["gripper_cmd"] is not None:
+            gripper_value = math.floor((command["gripper_cmd"]/2) * 1000) / 1000 # 0.8 -> 0.3, 0.3로 각 손가락에 전달
+            for finger in gripper_joints:
+                p.setJointMotorControl2(
+                    robot_id, 
+                    finger, 
+                    p.POSITION_CONTROL, 
+                    gripper_value, 
+                    force=force, 
+                    maxVelocity=max_vel * 0.08 # Gripper 속도 보정
                 )
-                for idx, joint_idx in enumerate(arm_joints):
-                    lower, upper = joint_limits[joint_idx]
-                    angle = max(min(ik_solution[idx], upper), lower)
-                    p.setJointMotorControl2(robot_id, joint_idx, p.POSITION_CONTROL, angle, force=force, maxVelocity=max_vel)
-                shared.command["target_pos"] = None
-                
-        
-            # ============ Joints 직접 제어 ============
-            if shared.command["joint_cmd"]:
-                joints_angles = shared.command["joint_cmd"]
-                
-                # 로봇 제어
-                for idx, angle in enumerate(joints_angles):
-                    rad_angle = math.radians(angle) # degree -> radian
-                    
-                    p.setJointMotorControl2(
-                        robot_id, 
-                        arm_joints[idx], 
-                        p.POSITION_CONTROL, 
-                        rad_angle, 
-                        force=force, 
-                        maxVelocity=max_vel
-                    )
-                
-                shared.command["joint_cmd"] = None
-                
-                
-            # ============ Gripper 제어 ============
-            if shared.command["gripper_cmd"] is not None:
-                gripper_value = math.floor((shared.command["gripper_cmd"]/2) * 1000) / 1000 # 0.8 -> 0.3, 0.3로 각 손가락에 전달
-                for finger in gripper_joints:
-                    p.setJointMotorControl2(
-                        robot_id, 
-                        finger, 
-                        p.POSITION_CONTROL, 
-                        gripper_value, 
-                        force=force, 
-                        maxVelocity=max_vel * 0.08 # Gripper 속도 보정
-                    )
-                
-                shared.command["gripper_cmd"] = None
-        
-        
+            
+            command["gripper_cmd"] = None
+
+
 
         # ====================================
         # 데이터 업데이트
         # ====================================
         
-        # ============ End-Effector ============
-        ee_pos = p.getLinkState(robot_id, end_effector_index)[0]
-        
-        # ============ Joints ============
-        joints = [round(np.degrees(p.getJointState(robot_id, j)[0]), 2) for j in arm_joints]
-
-        # ============ gripper ============
-        gripper_state = [p.getJointState(robot_id, j)[0] for j in gripper_joints]
-
-        # ============ Object Info ============
-        obj_data = {"exists": False, "x": 0, "y": 0, "z": 0, "distance": 0}
-        if object_id:
-            pos = p.getBasePositionAndOrientation(object_id)[0]
-            dist = math.sqrt(pos[0]**2 + pos[1]**2 + pos[2]**2)
-            obj_data = {
-                "exists": True,
-                "x": round(pos[0], 4), "y": round(pos[1], 4), "z": round(pos[2], 4),
-                "distance": round(dist, 4)
-            }
-
-        # ============ 공유 데이터 업데이트 ============
-        with shared.state_lock:
-            shared.robot_state["x"] = round(ee_pos[0], 4)
-            shared.robot_state["y"] = round(ee_pos[1], 4)
-            shared.robot_state["z"] = round(ee_pos[2], 4)
-            shared.joints_degrees = joints
-            shared.gripper_state = round(sum(gripper_state),4)
-            shared.object_info = obj_data
+        # 상태 발행은 시뮬레이션 주기(240Hz)가 아닌 STATE_HZ로만 수행 (브로드캐스트는 20Hz)
+        if current_time - last_state_time >= STATE_DT:
+            last_state_time = current_time
+            
+            # ============ End-Effector ============
+            ee_pos = p.getLinkState(robot_id, end_effector_index)[0]
+
+            # ============ Joints ============
+            # 조인트 상태는 일괄 API로 한 번에 조회 (관절별 getJointState 호출 대신)
+            arm_states = p.getJointStates(robot_id, arm_joints)
+            joints = [round(math.degrees(s[0]), 2) for s in arm_states] # 스칼라는 math (np 함수 호출 오버헤드 없음)
+
+            # ============ gripper ============
+            gripper_state = [s[0] for s in p.getJointStates(robot_id, gripper_joints)]
+
+            # ============ Object Info ============
+            obj_data = {"exists": False, "x": 0, "y": 0, "z": 0, "distance": 0}
+            if object_id:
+                pos = p.getBasePositionAndOrientation(object_id)[0]
+                dist = math.hypot(pos[0], pos[1], pos[2])
+                obj_data = {
+                    "exists": True,
+                    "x": round(pos[0], 4), "y": round(pos[1], 4), "z": round(pos[2], 4),
+                    "distance": round(dist, 4)
+                }
+
+            # ============ 공유 데이터 업데이트 ============
+            with shared.state_lock:
+                shared.robot_state["x"] = round(ee_pos[0], 4)
+                shared.robot_state["y"] = round(ee_pos[1], 4)
+                shared.robot_state["z"] = round(ee_pos[2], 4)
+                shared.joints_degrees = joints
+                shared.gripper_state = round(sum(gripper_state),4)
+                shared.object_info = obj_data
 
 
 
@@ -306,15 +330,16 @@ def run_simulation():
         # ====================================
         # ============ 카메라 업데이트 ============
         if current_time - last_cam_time >= CAM_DT:
-            img = p.getCameraImage(WIDTH, HEIGHT, view_matrix, projection_matrix, renderer=p.ER_BULLET_HARDWARE_OPENGL)
-            w, h, rgb, depth, seg = img
+            # 세그멘테이션 마스크는 사용하지 않으므로 생성 생략
+            img = p.getCameraImage(WIDTH, HEIGHT, view_matrix, projection_matrix, renderer=p.ER_BULLET_HARDWARE_OPENGL,
+                                   flags=p.ER_NO_SEGMENTATION_MASK, shadow=0)
+            w, h, rgb, depth, _ = img
             
-            # RGB 이미지
-            rgb = np.reshape(rgb, (h, w, 4))[:, :, :3].astype(np.uint8)
+            # RGBA 이미지 (uint8 버퍼를 그대로 보는 뷰 - 채널 제거는 cvtColor가 한 번에 처리)
+            rgba = np.asarray(rgb, dtype=np.uint8).reshape(h, w, 4)
             
             # Depth RAW 데이터
-            depth_buffer = np.reshape(depth, (h, w))
-            depth_m = far * near / (far - (far - near) * depth_buffer) # 실제 거리로 변환
+            depth_buffer = np.asarray(depth, dtype=np.float32).reshape(h, w) # 실제 거리 변환은 /depth 요청 시에만
 
 
             # ============ 엔드 이펙터 View ============
@@ -323,36 +348,49 @@ def run_simulation():
             cam_pos = link_state[0]      # position
             cam_ori = link_state[1]      # quaternion
 
-            rot = p.getMatrixFromQuaternion(cam_ori)
-            rot = np.array(rot).reshape(3, 3)
-
-            forward = rot @ np.array([0, 0, 1])   # z축 기준
-            up = rot @ np.array([-1, 0, 0])
+            # 회전 행렬(row-major 9개 값)에서 필요한 열만 바로 꺼냄 (ndarray 변환/행렬곱 없이)
+            r = p.getMatrixFromQuaternion(cam_ori)
+            forward = (r[2], r[5], r[8])      # rot @ [0, 0, 1] = 3열 (z축 기준)
+            up = (-r[0], -r[3], -r[6])        # rot @ [-1, 0, 0] = -1열
 
             ee_view_matrix = p.computeViewMatrix(
                 cam_pos,
-                cam_pos + 0.2 * forward,
+                [cam_pos[i] + 0.2 * forward[i] for i in range(3)],
                 up
             )
-            ee_img = p.getCameraImage(WIDTH, HEIGHT, ee_view_matrix, projection_matrix, renderer=p.ER_BULLET_HARDWARE_OPENGL)
-            ee_w, ee_h, ee_rgb, ee_depth, seg = ee_img
+            ee_img = p.getCameraImage(WIDTH, HEIGHT, ee_view_matrix, projection_matrix, renderer=p.ER_BULLET_HARDWARE_OPENGL,
+                                      flags=p.ER_NO_SEGMENTATION_MASK, shadow=0)
+            ee_w, ee_h, ee_rgb, ee_depth, _ = ee_img
             
-            # RGB 이미지
-            ee_rgb = np.reshape(ee_rgb, (ee_h, ee_w, 4))[:, :, :3].astype(np.uint8)
+            # RGBA 이미지
+            ee_rgba = np.asarray(ee_rgb, dtype=np.uint8).reshape(ee_h, ee_w, 4)
             
             # Depth RAW 데이터
-            ee_depth_buffer = np.reshape(ee_depth, (ee_h, ee_w))
-            ee_depth_m = far * near / (far - (far - near) * ee_depth_buffer) # 실제 거리로 변환
+            ee_depth_buffer = np.asarray(ee_depth, dtype=np.float32).reshape(ee_h, ee_w)
 
             
-            # 이미지 업데이트
+            # 이미지 업데이트 (스트림용 JPEG는 접속 클라이언트 수와 무관하게 여기서 1회만 인코딩)
+            # 공유 프레임은 매 틱 새로 만든 배열로 교체만 하고 제자리 수정하지 않음 (읽는 쪽은 복사 없이 참조)
+            frame = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
+            ee_frame = cv2.cvtColor(ee_rgba, cv2.COLOR_RGBA2BGR)
+            frame_jpeg = encode_jpeg(frame, quality=50)
+            ee_frame_jpeg = encode_jpeg(ee_frame, quality=50)
+            
             with shared.frame_lock:
-                shared.latest_frame = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
-                shared.latest_frame_depth = depth_m
-                shared.latest_ee_frame = cv2.cvtColor(ee_rgb, cv2.COLOR_RGB2BGR)
-                shared.latest_ee_frame_depth = ee_depth_m
+                shared.latest_frame = frame
+                shared.latest_frame_depth_raw = depth_buffer
+                shared.latest_ee_frame = ee_frame
+                shared.latest_ee_frame_depth_raw = ee_depth_buffer
+                shared.latest_frame_jpeg = frame_jpeg
+                shared.latest_ee_frame_jpeg = ee_frame_jpeg
+            shared.frame_event.set()
+            shared.frame_event.clear()
             
-            last_cam_time = current_time
+            # 고정 위상으로 다음 촬영 시각 예약 (주기 드리프트 방지)
+            # 한 주기 이상 밀렸으면 밀린 촬영을 몰아서 하지 않고 현재 시각부터 다시 시작 (최신 프레임만 유지)
+            last_cam_time += CAM_DT
+            if current_time - last_cam_time > CAM_DT:
+                last_cam_time = current_time
             
             
             
@@ -1,11 +1,13 @@
 import threading
+import queue
 
 # ====================================
 # 동기화 Locks
 # ====================================
 frame_lock = threading.Lock()
+frame_event = threading.Event() # 카메라 프레임 갱신 알림 (set 직후 clear - 대기 중인 스트림을 깨움)
 state_lock = threading.Lock()
-cmd_lock = threading.Lock() # 명령 전달용 락
+cmd_queue = queue.SimpleQueue() # 명령 전달용 큐 (Flask -> Sim) : (명령 종류, 값)
 
 
 
@@ -13,9 +15,14 @@ cmd_lock = threading.Lock() # 명령 전달용 락
 # 공유 데이터
 # ====================================
 latest_frame = None
-latest_frame_depth = None
+latest_frame_depth = None       # (원본 버퍼, 실제 거리 m) - /depth 요청 시 지연 변환 (프레임당 1회)
 latest_ee_frame = None
 latest_ee_frame_depth = None
+latest_frame_depth_raw = None   # getCameraImage 원본 Depth 버퍼 (0~1 비선형)
+latest_ee_frame_depth_raw = None
+depth_range = (0.01, 10.0)      # 카메라 (near, far) - 원본 버퍼 → 거리 변환용
+latest_frame_jpeg = None    # MJPEG 스트림용 인코딩 결과 (카메라 틱당 1회 인코딩)
+latest_ee_frame_jpeg = None
 
 
 # ============ 로봇 정보 (Sim -> Flask) ============
@@ -33,7 +40,8 @@ object_info = {
 
 
 # ============ 제어 명령 (Flask -> Sim) ============
-command = {
+# cmd_queue로 전달되는 명령 종류와 시뮬레이션 시작 시 기본값
+command_defaults = {
     "target_pos": None,     # IK 목표 좌표 {"pos": [x, y, z]}
     "joint_cmd": None,      # Joint 각도 {"joints": [deg1, deg2, deg3, deg4, deg5]}
     "gripper_cmd": None,    # Gripper 제어 {"gripper": 0.0 ~ 0.06}